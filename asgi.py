@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from hypercorn.typing import ASGIReceiveCallable, ASGISendCallable, Scope
+from quart import Quart
+from werkzeug.exceptions import HTTPException
+
+from app import FlaskMicroservice, create_app
+from blueprints.aio import AsyncBlueprintClient, AsyncBlueprintEmployee
+from containers import Container
+
+
+class QuartMicroservice(Quart):
+    container: Container
+
+
+# Serves the endpoints that have asyncio views from the Quart app, and every other one from the Flask app in
+# a pool of threads, like the threaded WSGI server does. Requests are routed with the Flask URL map, which
+# knows all the endpoints and their precedence.
+class ASGIMicroservice:
+    def __init__(self, app: QuartMicroservice, wsgi_app: FlaskMicroservice) -> None:
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.wsgi = AsyncioWSGIMiddleware(wsgi_app)
+        self.routes = wsgi_app.url_map.bind('')
+
+    def is_async(self, path: str, method: str) -> bool:
+        try:
+            endpoint, _ = self.routes.match(path, method)
+        except HTTPException:
+            return False
+
+        return endpoint in self.app.view_functions
+
+    async def __call__(self, scope: Scope, receive: ASGIReceiveCallable, send: ASGISendCallable) -> None:
+        if scope['type'] == 'http' and not self.is_async(scope['path'], scope['method']):
+            await self.wsgi(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+# Entry point of the ASGI server, e.g. hypercorn 'asgi:create_asgi_app()'. Both apps share the container, so
+# they use the same configuration, caches and in memory repositories.
+def create_asgi_app() -> ASGIMicroservice:
+    wsgi_app = create_app()
+
+    app = QuartMicroservice(__name__)
+    app.container = wsgi_app.container
+    app.container.wire(packages=['blueprints.aio'])
+    app.register_blueprint(AsyncBlueprintClient)
+    app.register_blueprint(AsyncBlueprintEmployee)
+
+    @app.before_serving
+    async def start_sync_threads() -> None:
+        # Requests to the Flask app run in the default executor of the event loop
+        threads = app.container.config.asgi.sync_threads()
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(threads, thread_name_prefix='wsgi'))
+
+    return ASGIMicroservice(app, wsgi_app)
@@ -0,0 +1,64 @@
+# ruff: noqa: INP001, T201
+# Usage: python -m benchmarks.converters [documents]
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+import dacite
+
+from models import Client, Employee
+from repositories.firestore.client import CLIENT_CONVERTER
+from repositories.firestore.employee import EMPLOYEE_CONVERTER
+
+
+def employee_docs(n: int) -> list[dict[str, Any]]:
+    # Documents as Firestore returns them, with enums stored as plain strings
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'client_id': str(uuid.uuid4()),
+            'name': f'Employee {i}',
+            'email': f'employee{i}@example.com',
+            'password': 'hash',
+            'role': 'agent',
+            'invitation_status': 'accepted',
+            'invitation_date': datetime.now(UTC),
+        }
+        for i in range(n)
+    ]
+
+
+def client_docs(n: int) -> list[dict[str, Any]]:
+    return [
+        {'id': str(uuid.uuid4()), 'name': f'Client {i}', 'plan': 'empresario', 'email_incidents': f'client{i}@example.com'}
+        for i in range(n)
+    ]
+
+
+def rate(convert: Callable[[dict[str, Any]], object], docs: list[dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for doc in docs:
+        convert(doc)
+
+    return len(docs) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f'{"model":>10} {"dacite":>14} {"compiled":>14} {"speedup":>8}')
+    for model, docs, converter in (
+        (Employee, employee_docs(n), EMPLOYEE_CONVERTER),
+        (Client, client_docs(n), CLIENT_CONVERTER),
+    ):
+        baseline = rate(lambda doc, model=model: dacite.from_dict(model, doc, dacite.Config(cast=[Enum])), docs)  # type: ignore[misc]
+        compiled = rate(converter.from_dict, docs)
+        print(f'{model.__name__:>10} {baseline:>10.0f}/s {compiled:>10.0f}/s {compiled / baseline:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# ruff: noqa: INP001, T201
+# Usage: FIRESTORE_EMULATOR_HOST=127.0.0.1:5005 python -m benchmarks.invite [iterations]
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+
+from models import Employee, InvitationStatus, Role
+from repositories.firestore import FirestoreEmployeeRepository
+
+FIRESTORE_DATABASE = '(default)'
+
+
+def gen_employee() -> Employee:
+    employee_id = str(uuid.uuid4())
+    return Employee(
+        id=employee_id,
+        client_id=None,
+        name='Employee',
+        email=f'{employee_id}@example.com',
+        password='hash',  # noqa: S106
+        role=Role.AGENT,
+        invitation_status=InvitationStatus.UNINVITED,
+        invitation_date=datetime.now(UTC).replace(microsecond=0),
+    )
+
+
+def invite_delete_create(repo: FirestoreEmployeeRepository, employee: Employee) -> None:
+    repo.delete(employee.id, None)
+    repo.create(employee)
+
+
+def invite_move(repo: FirestoreEmployeeRepository, employee: Employee) -> None:
+    repo.move(employee, None)
+
+
+def measure(
+    repo: FirestoreEmployeeRepository, invite: Callable[[FirestoreEmployeeRepository, Employee], None], n: int
+) -> list[float]:
+    client_id = str(uuid.uuid4())
+    timings: list[float] = []
+    for _ in range(n):
+        employee = gen_employee()
+        repo.create(employee)
+
+        # Same steps as EmployeeInvite.post once the employee was found and validated
+        employee.client_id = client_id
+        employee.invitation_status = InvitationStatus.PENDING
+        start = time.perf_counter()
+        invite(repo, employee)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def main() -> None:
+    if 'FIRESTORE_EMULATOR_HOST' not in os.environ:
+        sys.exit('This benchmark writes documents, run it against the Firestore emulator.')
+
+    logging.basicConfig(level=logging.WARNING)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    repo = FirestoreEmployeeRepository(FirestoreClient(database=FIRESTORE_DATABASE), bulk_ops_per_second=10000)
+    repo.delete_all()
+
+    print(f'{"invite":>15} {"p50":>9} {"p95":>9} {"mean":>9}')
+    for name, invite in (('delete+create', invite_delete_create), ('move', invite_move)):
+        timings = sorted(measure(repo, invite, n))
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        mean = statistics.fmean(timings) * 1000
+        print(f'{name:>15} {p50:>7.1f}ms {p95:>7.1f}ms {mean:>7.1f}ms')
+
+    repo.delete_all()
+
+
+if __name__ == '__main__':
+    main()
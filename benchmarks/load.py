@@ -0,0 +1,119 @@
+# ruff: noqa: INP001, T201, S603, S607
+# Usage: FIRESTORE_EMULATOR_HOST=127.0.0.1:5005 python -m benchmarks.load [concurrency] [seconds]
+import asyncio
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+
+import aiohttp
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+
+from models import Employee, InvitationStatus, Role
+from repositories.firestore import FirestoreEmployeeRepository
+
+FIRESTORE_DATABASE = '(default)'
+EMPLOYEES = 200
+
+# Both serve the same app in a single worker, gunicorn takes it from gunicorn.conf.py
+SERVERS = {
+    'wsgi threads': ['gunicorn', '--bind', '127.0.0.1:8081', '--workers', '1', '--threads', '8'],
+    'asgi': ['hypercorn', '--bind', '127.0.0.1:8082', '--workers', '1', 'asgi:create_asgi_app()'],
+}
+PORTS = {'wsgi threads': 8081, 'asgi': 8082}
+
+
+def seed(repo: FirestoreEmployeeRepository) -> list[Employee]:
+    client_id = str(uuid.uuid4())
+    employees = [
+        Employee(
+            id=str(uuid.uuid4()),
+            client_id=client_id,
+            name='Employee',
+            email=f'{uuid.uuid4()}@example.com',
+            password='hash',  # noqa: S106
+            role=Role.AGENT,
+            invitation_status=InvitationStatus.ACCEPTED,
+            invitation_date=datetime.now(UTC).replace(microsecond=0),
+        )
+        for _ in range(EMPLOYEES)
+    ]
+    repo.create_many(employees)
+
+    return employees
+
+
+async def wait_ready(session: aiohttp.ClientSession, base_url: str) -> None:
+    for _ in range(100):
+        try:
+            async with session.get(f'{base_url}/api/v1/health/client') as resp:
+                if resp.status == 200:  # noqa: PLR2004
+                    return
+        except aiohttp.ClientConnectionError:
+            pass
+
+        await asyncio.sleep(0.1)
+
+    sys.exit(f'Server at {base_url} did not start')
+
+
+# Retrieving an employee is never cached, so every request waits on a Firestore read
+async def load(base_url: str, employees: list[Employee], concurrency: int, seconds: float) -> list[float]:
+    timings: list[float] = []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_ready(session, base_url)
+        deadline = time.perf_counter() + seconds
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                employee = random.choice(employees)  # noqa: S311
+                start = time.perf_counter()
+                async with session.get(f'{base_url}/api/v1/employees/{employee.client_id}/{employee.id}') as resp:
+                    await resp.read()
+                    if resp.status != 200:  # noqa: PLR2004
+                        sys.exit(f'Unexpected status {resp.status}')
+
+                timings.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return timings
+
+
+def main() -> None:
+    if 'FIRESTORE_EMULATOR_HOST' not in os.environ:
+        sys.exit('This benchmark writes documents, run it against the Firestore emulator.')
+
+    logging.basicConfig(level=logging.WARNING)
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10  # noqa: PLR2004
+
+    repo = FirestoreEmployeeRepository(FirestoreClient(database=FIRESTORE_DATABASE), bulk_ops_per_second=10000)
+    repo.delete_all()
+    employees = seed(repo)
+
+    print(f'{"server":>13} {"req/s":>8} {"p50":>9} {"p95":>9} {"p99":>9}')
+    for name, command in SERVERS.items():
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            timings = sorted(asyncio.run(load(f'http://127.0.0.1:{PORTS[name]}', employees, concurrency, seconds)))
+        finally:
+            server.terminate()
+            server.wait()
+
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+        print(f'{name:>13} {len(timings) / seconds:>8.0f} {p50:>7.1f}ms {p95:>7.1f}ms {p99:>7.1f}ms')
+
+    repo.delete_all()
+
+
+if __name__ == '__main__':
+    main()
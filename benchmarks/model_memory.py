@@ -0,0 +1,64 @@
+# ruff: noqa: INP001, T201
+# Usage: python -m benchmarks.model_memory [instances]
+import dataclasses
+import gc
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+from models import Employee, InvitationStatus, Role
+
+# The same model as a plain dataclass, with a __dict__ per instance
+DictEmployee: Any = dataclasses.make_dataclass(
+    'DictEmployee', [(field.name, field.type) for field in dataclasses.fields(Employee)]
+)
+
+
+def employee_args(n: int) -> list[dict[str, Any]]:
+    now = datetime.now(UTC)
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'client_id': None,
+            'name': f'Employee {i}',
+            'email': f'employee{i}@example.com',
+            'password': 'hash',
+            'role': Role.AGENT,
+            'invitation_status': InvitationStatus.ACCEPTED,
+            'invitation_date': now,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(cls: Any, args: list[dict[str, Any]]) -> tuple[float, float]:  # noqa: ANN401
+    gc.collect()
+    tracemalloc.start()
+    instances = [cls(**kwargs) for kwargs in args]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+
+    start = time.perf_counter()
+    for kwargs in args:
+        cls(**kwargs)
+    rate = len(args) / (time.perf_counter() - start)
+
+    return memory, rate
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    args = employee_args(n)
+
+    print(f'{"employee":>10} {"memory per 100k":>16} {"construction":>14}')
+    for name, cls in (('dict', DictEmployee), ('slots', Employee)):
+        memory, rate = measure(cls, args)
+        print(f'{name:>10} {memory / n * 100_000 / 2**20:>13.1f}MiB {rate:>12.0f}/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# ruff: noqa: INP001, T201
+# Usage: FIRESTORE_EMULATOR_HOST=127.0.0.1:5005 python -m benchmarks.reset [sizes...]
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import cast
+
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+from google.cloud.firestore_v1 import CollectionReference, DocumentReference
+
+from repositories.firestore import FirestoreEmployeeRepository
+
+FIRESTORE_DATABASE = '(default)'
+EMPLOYEES_PER_CLIENT = 50
+
+
+def seed(db: FirestoreClient, n: int) -> None:
+    batch = db.batch()
+    for i in range(n):
+        if i % EMPLOYEES_PER_CLIENT == 0:
+            client_ref = db.collection('clients').document(str(uuid.uuid4()))
+
+        employees_ref = cast(CollectionReference, client_ref.collection('employees'))
+        batch.set(employees_ref.document(str(uuid.uuid4())), {'name': f'Employee {i}', 'email': f'employee{i}@example.com'})
+
+        if len(batch) == 500:  # noqa: PLR2004
+            batch.commit()
+            batch = db.batch()
+
+    batch.commit()
+
+
+def delete_sequential(db: FirestoreClient) -> None:
+    for doc in db.collection_group('employees').stream():
+        cast(DocumentReference, doc.reference).delete()
+
+
+def main() -> None:
+    if 'FIRESTORE_EMULATOR_HOST' not in os.environ:
+        sys.exit('This benchmark writes and deletes documents, run it against the Firestore emulator.')
+
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+
+    db = FirestoreClient(database=FIRESTORE_DATABASE)
+    repo = FirestoreEmployeeRepository(db, bulk_ops_per_second=10000)
+
+    print(f'{"documents":>10} {"sequential":>12} {"bulk":>10}')
+    for n in sizes:
+        seed(db, n)
+        start = time.perf_counter()
+        delete_sequential(db)
+        sequential = time.perf_counter() - start
+
+        seed(db, n)
+        start = time.perf_counter()
+        repo.delete_all()
+        bulk = time.perf_counter() - start
+
+        print(f'{n:>10} {sequential:>11.2f}s {bulk:>9.2f}s')
+
+
+if __name__ == '__main__':
+    main()
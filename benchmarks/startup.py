@@ -0,0 +1,87 @@
+# ruff: noqa: INP001, T201, S603, S607
+# Usage: python -m benchmarks.startup [runs]
+# Fails when the median startup of the app exceeds STARTUP_IMPORT_BUDGET_MS or STARTUP_FIRST_RESPONSE_BUDGET_MS
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+
+IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '1500'))
+FIRST_RESPONSE_BUDGET_MS = float(os.getenv('STARTUP_FIRST_RESPONSE_BUDGET_MS', '3000'))
+TOP_PACKAGES = 15
+
+PORT = 8083
+SERVER = ['gunicorn', '--bind', f'127.0.0.1:{PORT}', '--workers', '1', '--threads', '8']
+CREATE_APP = 'import time; import app; start = time.perf_counter(); app.create_app(); print(time.perf_counter() - start)'
+
+
+def server_env() -> dict[str, str]:
+    # The health endpoint does not read the database, so nothing waits on Firestore
+    return {**os.environ, 'REPOSITORY_BACKEND': 'memory', 'ENABLE_WARMUP': '0'}
+
+
+# Time spent importing each top level package and in create_app, from the report of python -X importtime
+def import_times() -> tuple[dict[str, float], float, float]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CREATE_APP], capture_output=True, check=True, text=True, env=server_env()
+    )
+
+    packages: dict[str, float] = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix('import time:').split('|')
+        packages[name.strip().split('.')[0]] += int(self_us) / 1000
+        if name.strip() == 'app':
+            total = int(cumulative_us) / 1000
+
+    return packages, total, float(result.stdout.strip()) * 1000
+
+
+def first_response() -> float:
+    start = time.perf_counter()
+    server = subprocess.Popen(SERVER, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=server_env())
+    try:
+        while time.perf_counter() - start < 30:  # noqa: PLR2004
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{PORT}/api/v1/health/client', timeout=1):
+                    return (time.perf_counter() - start) * 1000
+            # Gunicorn accepts connections before the worker has loaded the app, they time out until then
+            except OSError:
+                time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+    sys.exit('The server did not start')
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    samples = [import_times() for _ in range(runs)]
+    packages, _, _ = samples[0]
+    import_ms = statistics.median(total for _, total, _ in samples)
+    create_app_ms = statistics.median(create for _, _, create in samples)
+    first_response_ms = statistics.median(first_response() for _ in range(runs))
+
+    print(f'{"package":>30} {"import":>9}')
+    for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]:
+        print(f'{name:>30} {ms:>7.1f}ms')
+
+    print()
+    print(f'{"import app":>30} {import_ms:>7.1f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)')
+    print(f'{"create_app()":>30} {create_app_ms:>7.1f}ms')
+    print(f'{"first response":>30} {first_response_ms:>7.1f}ms (budget {FIRST_RESPONSE_BUDGET_MS:.0f}ms)')
+
+    if import_ms > IMPORT_BUDGET_MS or first_response_ms > FIRST_RESPONSE_BUDGET_MS:
+        sys.exit('Startup is over budget')
+
+
+if __name__ == '__main__':
+    main()
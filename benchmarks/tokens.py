@@ -0,0 +1,53 @@
+# ruff: noqa: INP001, T201
+# Usage: python -m benchmarks.tokens
+import time
+from collections.abc import Callable
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from security import TokenSigner
+
+ITERATIONS = 5000
+
+PAYLOAD = {
+    'iss': 'https://example.com',
+    'sub': '099416a5-e094-4274-9901-cc07f686e50a',
+    'cid': 'acfa53b4-58f3-46e8-809b-19ef52b437ed',
+    'email': 'bernardo.abreu@universo.br',
+    'role': 'admin',
+    'aud': 'admin',
+    'iat': 1728583015,
+    'exp': 1728586615,
+}
+
+
+def tokens_per_second(sign: Callable[[], str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        sign()
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    private_pem = (
+        Ed25519PrivateKey.generate()
+        .private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        .decode()
+    )
+    signer = TokenSigner(private_pem)
+
+    before = tokens_per_second(lambda: jwt.encode(PAYLOAD, private_pem, algorithm='EdDSA'))
+    after = tokens_per_second(lambda: signer.sign(PAYLOAD))
+
+    print(f'jwt.encode with PEM key: {before:,.0f} tokens/s')
+    print(f'TokenSigner:             {after:,.0f} tokens/s ({after / before:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# ruff: noqa: INP001, T201, S603, S607
+# Usage: python -m benchmarks.workers [concurrency] [seconds]
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import aiohttp
+
+PORT = 8084
+BASE_URL = f'http://127.0.0.1:{PORT}'
+BATCH = {'ids': [str(uuid.uuid4()) for _ in range(100)]}
+
+# Workers, threads per worker and preload, all served through gunicorn.conf.py. The first one is what the
+# Dockerfile used to run.
+SERVERS = {
+    '1 x 8 threads': {'WEB_CONCURRENCY': '1', 'WORKER_THREADS': '8', 'PRELOAD_APP': '0'},
+    '2 x 4 threads': {'WEB_CONCURRENCY': '2', 'WORKER_THREADS': '4', 'PRELOAD_APP': '0'},
+    '2 x 4 preload': {'WEB_CONCURRENCY': '2', 'WORKER_THREADS': '4', 'PRELOAD_APP': '1'},
+    '4 x 2 preload': {'WEB_CONCURRENCY': '4', 'WORKER_THREADS': '2', 'PRELOAD_APP': '1'},
+}
+
+
+# Memory of the master and its workers, with the pages they share split between them
+def pss_mb(pid: int) -> float:
+    pids = [pid, *(int(child) for child in Path(f'/proc/{pid}/task/{pid}/children').read_text().split())]
+    total_kb = 0
+    for p in pids:
+        for line in Path(f'/proc/{p}/smaps_rollup').read_text().splitlines():
+            if line.startswith('Pss:'):
+                total_kb += int(line.split()[1])
+
+    return total_kb / 1024
+
+
+async def wait_ready(session: aiohttp.ClientSession, workers: int) -> None:
+    # Every worker answers 200 once its warm-up is done, requests are spread over the workers by the kernel
+    ready = 0
+    for _ in range(300):
+        try:
+            async with session.get(f'{BASE_URL}/api/v1/health/ready') as resp:
+                ready = ready + 1 if resp.status == 200 else 0  # noqa: PLR2004
+        except aiohttp.ClientConnectionError:
+            ready = 0
+
+        if ready >= workers * 4:
+            return
+
+        await asyncio.sleep(0.05)
+
+    sys.exit('The server did not start')
+
+
+# The clients are not found, so every request is request parsing, validation and cache lookups in Python
+async def load(workers: int, concurrency: int, seconds: float) -> list[float]:
+    timings: list[float] = []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_ready(session, workers)
+        deadline = time.perf_counter() + seconds
+
+        async def user() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                async with session.post(f'{BASE_URL}/api/v1/clients/batch', json=BATCH) as resp:
+                    await resp.read()
+                    if resp.status != 200:  # noqa: PLR2004
+                        sys.exit(f'Unexpected status {resp.status}')
+
+                timings.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return timings
+
+
+def main() -> None:
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10  # noqa: PLR2004
+
+    print(f'{os.cpu_count()} CPUs')
+    print(f'{"server":>13} {"req/s":>8} {"p50":>9} {"p99":>9} {"memory":>9}')
+    for name, settings in SERVERS.items():
+        env = {
+            **os.environ,
+            **settings,
+            'PORT': str(PORT),
+            'REPOSITORY_BACKEND': 'memory',
+            'HASHING_WORKERS': '0',
+            'ENABLE_WARMUP': '1',
+        }
+        server = subprocess.Popen(['gunicorn'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+        try:
+            timings = sorted(asyncio.run(load(int(settings['WEB_CONCURRENCY']), concurrency, seconds)))
+            memory = pss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+        p50 = statistics.median(timings) * 1000
+        p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+        print(f'{name:>13} {len(timings) / seconds:>8.0f} {p50:>7.1f}ms {p99:>7.1f}ms {memory:>7.0f}MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+# ruff: noqa: N812
+
+from .client import blp as AsyncBlueprintClient
+from .employee import blp as AsyncBlueprintEmployee
+
+__all__ = ['AsyncBlueprintClient', 'AsyncBlueprintEmployee']
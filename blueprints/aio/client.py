@@ -0,0 +1,92 @@
+from dependency_injector.wiring import Provide
+from marshmallow import ValidationError
+from quart import Blueprint, Response, request
+from quart.views import MethodView
+
+from blueprints.client import (
+    BatchClientsBody,
+    FindByEmailBody,
+    batch_clients_error,
+    batch_clients_lookup,
+    batch_clients_to_dict,
+    client_to_dict,
+)
+from blueprints.util import body_schema, is_valid_uuid4
+from containers import Container
+from repositories import AsyncClientRepository
+
+from .util import class_route, error_response, json_response, validation_error_response
+
+# Same names as the blueprint and views of the WSGI app, so both apps have the same endpoints
+blp = Blueprint('Clients', __name__)
+
+
+# Internal only
+@class_route(blp, '/api/v1/clients/detail')
+class FindClient(MethodView):
+    init_every_request = False
+
+    async def post(self, client_repo: AsyncClientRepository = Provide[Container.async_client_repo]) -> Response:
+        find_schema = body_schema(FindByEmailBody)
+        req_json = await request.get_json(silent=True)
+        if req_json is None:
+            return error_response('The request body could not be parsed as valid JSON.', 400)
+
+        try:
+            data: FindByEmailBody = find_schema.load(req_json)
+        except ValidationError as err:
+            return validation_error_response(err)
+
+        client = await client_repo.find_by_email(data.email.lower())
+
+        if client is None:
+            return error_response('Client not found.', 404)
+
+        return json_response(client_to_dict(client, include_plan=True), 200)
+
+
+# Internal only
+@class_route(blp, '/api/v1/clients/batch')
+class BatchRetrieveClients(MethodView):
+    init_every_request = False
+
+    async def post(self, client_repo: AsyncClientRepository = Provide[Container.async_client_repo]) -> Response:
+        batch_schema = body_schema(BatchClientsBody)
+        req_json = await request.get_json(silent=True)
+        if req_json is None:
+            return error_response('The request body could not be parsed as valid JSON.', 400)
+
+        try:
+            data: BatchClientsBody = batch_schema.load(req_json)
+        except ValidationError as err:
+            return validation_error_response(err)
+
+        ids, emails = batch_clients_lookup(data)
+        error = batch_clients_error(ids, emails)
+        if error is not None:
+            return error_response(error, 400)
+
+        include_plan = request.args.get('include_plan', 'false').lower() == 'true'
+
+        by_id = await client_repo.get_many(ids) if ids else {}
+        by_email = await client_repo.find_many_by_email(emails) if emails else {}
+
+        return json_response(batch_clients_to_dict(ids, emails, by_id, by_email, include_plan=include_plan), 200)
+
+
+@class_route(blp, '/api/v1/clients/<client_id>')
+class RetrieveClient(MethodView):
+    init_every_request = False
+
+    async def get(self, client_id: str, client_repo: AsyncClientRepository = Provide[Container.async_client_repo]) -> Response:
+        if is_valid_uuid4(client_id) is False:
+            return error_response('Invalid client ID.', 400)
+
+        client = await client_repo.get(client_id)
+
+        include_plan = request.args.get('include_plan', 'false').lower() == 'true'
+
+        if client is None:
+            return error_response('Client not found.', 404)
+
+        return json_response(client_to_dict(client, include_plan=include_plan), 200)
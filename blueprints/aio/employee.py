@@ -0,0 +1,97 @@
+from dependency_injector.wiring import Provide
+from marshmallow import ValidationError
+from quart import Blueprint, Response, request
+from quart.views import MethodView
+
+from blueprints.employee import (
+    EMPLOYEE_NOT_FOUND_ERROR,
+    JSON_VALIDATION_ERROR,
+    BatchEmployeesBody,
+    batch_employees_error,
+    batch_employees_lookup,
+    batch_employees_to_dict,
+    employee_to_dict,
+)
+from blueprints.util import body_schema, is_valid_uuid4
+from containers import Container
+from repositories import AsyncEmployeeRepository
+from repositories.firestore.constants import UUID_UNASSIGNED
+
+from .util import class_route, error_response, json_response, validation_error_response
+
+# Same names as the blueprint and views of the WSGI app, so both apps have the same endpoints
+blp = Blueprint('Employees', __name__)
+
+
+# Internal only
+@class_route(blp, '/api/v1/employees/<client_id>/<employee_id>')
+class RetrieveEmployee(MethodView):
+    init_every_request = False
+
+    async def get(
+        self,
+        client_id: str,
+        employee_id: str,
+        employee_repo: AsyncEmployeeRepository = Provide[Container.async_employee_repo],
+    ) -> Response:
+        if not is_valid_uuid4(client_id):
+            return error_response('Invalid client ID.', 400)
+
+        if not is_valid_uuid4(employee_id):
+            return error_response('Invalid employee ID.', 400)
+
+        cid = None if client_id == UUID_UNASSIGNED else client_id
+        employee = await employee_repo.get(employee_id=employee_id, client_id=cid)
+
+        if employee is None:
+            return error_response(EMPLOYEE_NOT_FOUND_ERROR, 404)
+
+        return json_response(employee_to_dict(employee), 200)
+
+
+# Internal only
+@class_route(blp, '/api/v1/employees/batch')
+class BatchRetrieveEmployees(MethodView):
+    init_every_request = False
+
+    async def post(self, employee_repo: AsyncEmployeeRepository = Provide[Container.async_employee_repo]) -> Response:
+        batch_schema = body_schema(BatchEmployeesBody)
+        req_json = await request.get_json(silent=True)
+
+        if req_json is None:
+            return error_response(JSON_VALIDATION_ERROR, 400)
+
+        try:
+            data: BatchEmployeesBody = batch_schema.load(req_json)
+        except ValidationError as err:
+            return validation_error_response(err)
+
+        error = batch_employees_error(data)
+        if error is not None:
+            return error_response(error, 400)
+
+        requested, keys = batch_employees_lookup(data)
+        employees = await employee_repo.get_many(keys)
+
+        return json_response(batch_employees_to_dict(requested, keys, employees), 200)
+
+
+# Internal only
+@class_route(blp, '/api/v1/random/<client_id>/agent')
+class GetRandomAgent(MethodView):
+    init_every_request = False
+
+    async def get(
+        self,
+        client_id: str,
+        employee_repo: AsyncEmployeeRepository = Provide[Container.async_employee_repo],
+    ) -> Response:
+        if not is_valid_uuid4(client_id):
+            return error_response('Invalid client ID.', 400)
+
+        agent = await employee_repo.get_random_agent(client_id)
+
+        if agent is None:
+            return error_response('No agents found', 404)
+
+        return json_response(employee_to_dict(agent), 200)
@@ -0,0 +1,29 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+from marshmallow import ValidationError
+from quart import Blueprint, Response
+from quart.views import MethodView
+
+from blueprints.util import validation_error_message
+
+
+def class_route(blueprint: Blueprint, rule: str, **options: Any) -> Callable[[type[MethodView]], type[MethodView]]:  # noqa: ANN401
+    def decorator(cls: type[MethodView]) -> type[MethodView]:
+        blueprint.add_url_rule(rule, view_func=cls.as_view(cls.__name__), **options)
+        return cls
+
+    return decorator
+
+
+def json_response(data: dict[str, Any] | list[dict[str, Any]], status: int) -> Response:
+    return Response(json.dumps(data), status=status, mimetype='application/json')
+
+
+def error_response(msg: str, code: int) -> Response:
+    return json_response({'message': msg, 'code': code}, code)
+
+
+def validation_error_response(err: ValidationError) -> Response:
+    return error_response(validation_error_message(err), 400)
@@ -2,19 +2,25 @@ import datetime
 import typing
 from dataclasses import dataclass
 
-import jwt
-import marshmallow_dataclass
 from dependency_injector.wiring import Provide, inject
 from flask import Blueprint, Response, request
 from flask.views import MethodView
 from marshmallow import ValidationError
-from passlib.hash import pbkdf2_sha256
 
 from containers import Container
 from models import Employee, InvitationStatus
 from repositories import EmployeeRepository
-
-from .util import class_route, error_response, json_response, requires_token, validation_error_response
+from security import HashingUnavailableError, PasswordHasher, TokenSigner
+
+from .util import (
+    body_schema,
+    class_route,
+    error_response,
+    json_response,
+    requires_token,
+    unavailable_response,
+    validation_error_response,
+)
 
 blp = Blueprint('Authentication', __name__)
 
@@ -41,7 +47,7 @@ def issue_token(
     employee: Employee,
     aud: str | None = None,
     jwt_issuer: str = Provide[Container.config.jwt.issuer.required()],
-    jwt_private_key: str = Provide[Container.config.jwt.private_key.required()],
+    token_signer: TokenSigner = Provide[Container.token_signer],
 ) -> str:
     time_issued = datetime.datetime.now(datetime.UTC)
     time_expiry = time_issued + datetime.timedelta(minutes=60)
@@ -59,7 +65,7 @@ def issue_token(
         'exp': int(time_expiry.timestamp()),
     }
 
-    return jwt.encode(typing.cast(dict[str, typing.Any], payload), jwt_private_key, algorithm='EdDSA')
+    return token_signer.sign(payload)
 
 
 @class_route(blp, '/api/v1/auth/employee')
@@ -70,8 +76,9 @@ class AuthEmployee(MethodView):
     def post(
         self,
         employee_repo: EmployeeRepository = Provide[Container.employee_repo],
+        password_hasher: PasswordHasher = Provide[Container.password_hasher],
     ) -> Response:
-        auth_schema = marshmallow_dataclass.class_schema(AuthBody)()
+        auth_schema = body_schema(AuthBody)
         req_json = request.get_json(silent=True)
         if req_json is None:
             return error_response('The request body could not be parsed as valid JSON.', 400)
@@ -83,8 +90,11 @@ class AuthEmployee(MethodView):
 
         employee = employee_repo.find_by_email(data.username)
 
-        if employee is None or not pbkdf2_sha256.verify(data.password, employee.password):
-            return error_response('Invalid username or password.', 401)
+        try:
+            if employee is None or not password_hasher.verify(data.password, employee.password):
+                return error_response('Invalid username or password.', 401)
+        except HashingUnavailableError as err:
+            return unavailable_response(err.retry_after)
 
         resp = {
             'token': issue_token(employee),
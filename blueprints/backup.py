@@ -1,6 +1,5 @@
 from datetime import UTC, datetime
 
-import requests
 from dependency_injector.wiring import Provide
 from flask import Blueprint, Response, current_app
 from flask.views import MethodView
@@ -22,6 +21,9 @@ class Backup(MethodView):
         database: str = Provide[Container.config.firestore.database],
         access_token: str = Provide[Container.access_token],
     ) -> Response:
+        # Called once a day by Cloud Scheduler, so the HTTP client is loaded with the first backup
+        import requests
+
         timestamp = datetime.now(UTC).replace(hour=7, minute=0, second=0, microsecond=0).isoformat().replace('+00:00', 'Z')
 
         res = requests.post(
@@ -3,7 +3,6 @@ from dataclasses import dataclass, field
 from typing import Any
 
 import marshmallow.validate
-import marshmallow_dataclass
 from dependency_injector.wiring import Provide
 from flask import Blueprint, Response, request
 from flask.views import MethodView
@@ -14,10 +13,21 @@ from models import Client, InvitationStatus, Plan, Role
 from repositories import ClientRepository, EmployeeRepository
 from repositories.errors import DuplicateEmailError
 
-from .util import class_route, error_response, is_valid_uuid4, json_response, requires_token, validation_error_response
+from .util import (
+    body_schema,
+    class_route,
+    error_response,
+    is_valid_email,
+    is_valid_uuid4,
+    json_response,
+    requires_token,
+    validation_error_response,
+)
 
 blp = Blueprint('Clients', __name__)
 
+MAX_BATCH_CLIENTS = 300
+
 
 def client_to_dict(client: Client, *, include_plan: bool = False) -> dict[str, Any]:
     res: dict[str, Any] = {
@@ -67,7 +77,7 @@ class CreateClient(MethodView):
         employee_repo: EmployeeRepository = Provide[Container.employee_repo],
         domain: str = Provide[Container.config.domain.required()],
     ) -> Response:
-        client_schema = marshmallow_dataclass.class_schema(RegisterClientBody)()
+        client_schema = body_schema(RegisterClientBody)
         req_json = request.get_json(silent=True)
 
         if req_json is None:
@@ -96,10 +106,12 @@ class CreateClient(MethodView):
         except DuplicateEmailError:
             return error_response('Email already registered.', 409)
 
-        employee_repo.delete(employee_id=token['sub'], client_id=token['cid'])
         employee.client_id = client.id
         employee.invitation_status = InvitationStatus.ACCEPTED
-        employee_repo.create(employee)
+        # The employee was removed since it was read, the client would be left without anyone to manage it
+        if not employee_repo.move(employee, from_client_id=token['cid']):
+            client_repo.delete(client.id)
+            return error_response('Employee not found', 404)
 
         return json_response(client_to_dict(client, include_plan=True), 201)
 
@@ -159,7 +171,7 @@ class FindClient(MethodView):
 
     def post(self, client_repo: ClientRepository = Provide[Container.client_repo]) -> Response:
         # Parse request body
-        find_schema = marshmallow_dataclass.class_schema(FindByEmailBody)()
+        find_schema = body_schema(FindByEmailBody)
         req_json = request.get_json(silent=True)
         if req_json is None:
             return error_response('The request body could not be parsed as valid JSON.', 400)
@@ -177,6 +189,78 @@ class FindClient(MethodView):
         return json_response(client_to_dict(client, include_plan=True), 200)
 
 
+@dataclass
+class BatchClientsBody:
+    ids: list[str] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+
+
+# Duplicates are answered once, in the order they were first requested
+def batch_clients_lookup(data: BatchClientsBody) -> tuple[list[str], list[str]]:
+    return list(dict.fromkeys(data.ids)), list(dict.fromkeys(email.lower() for email in data.emails))
+
+
+def batch_clients_error(ids: list[str], emails: list[str]) -> str | None:
+    if not ids and not emails:
+        return 'At least one id or email is required.'
+
+    if len(ids) + len(emails) > MAX_BATCH_CLIENTS:
+        return f'At most {MAX_BATCH_CLIENTS} ids and emails can be requested at once.'
+
+    if not all(is_valid_uuid4(client_id) for client_id in ids):
+        return 'Invalid client ID.'
+
+    if not all(is_valid_email(email) for email in emails):
+        return 'Invalid email.'
+
+    return None
+
+
+def batch_clients_to_dict(
+    ids: list[str], emails: list[str], by_id: dict[str, Client], by_email: dict[str, Client], *, include_plan: bool
+) -> dict[str, Any]:
+    clients: dict[str, Client] = {}
+    for client in [*(by_id[client_id] for client_id in ids if client_id in by_id), *by_email.values()]:
+        clients.setdefault(client.id, client)
+
+    return {
+        'clients': [client_to_dict(client, include_plan=include_plan) for client in clients.values()],
+        'missing': {
+            'ids': [client_id for client_id in ids if client_id not in by_id],
+            'emails': [email for email in emails if email not in by_email],
+        },
+    }
+
+
+# Internal only
+@class_route(blp, '/api/v1/clients/batch')
+class BatchRetrieveClients(MethodView):
+    init_every_request = False
+
+    def post(self, client_repo: ClientRepository = Provide[Container.client_repo]) -> Response:
+        batch_schema = body_schema(BatchClientsBody)
+        req_json = request.get_json(silent=True)
+        if req_json is None:
+            return error_response('The request body could not be parsed as valid JSON.', 400)
+
+        try:
+            data: BatchClientsBody = batch_schema.load(req_json)
+        except ValidationError as err:
+            return validation_error_response(err)
+
+        ids, emails = batch_clients_lookup(data)
+        error = batch_clients_error(ids, emails)
+        if error is not None:
+            return error_response(error, 400)
+
+        include_plan = request.args.get('include_plan', 'false').lower() == 'true'
+
+        by_id = client_repo.get_many(ids) if ids else {}
+        by_email = client_repo.find_many_by_email(emails) if emails else {}
+
+        return json_response(batch_clients_to_dict(ids, emails, by_id, by_email, include_plan=include_plan), 200)
+
+
 @class_route(blp, '/api/v1/clients/<client_id>')
 class RetrieveClient(MethodView):
     init_every_request = False
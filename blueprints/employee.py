@@ -1,30 +1,44 @@
+import base64
+import binascii
+import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
 import marshmallow.validate
-import marshmallow_dataclass
 from dependency_injector.wiring import Provide
 from flask import Blueprint, Response, request
 from flask.views import MethodView
 from marshmallow import ValidationError
-from passlib.handlers.pbkdf2 import pbkdf2_sha256
 
 from containers import Container
-from models import Employee, InvitationResponse, InvitationStatus, Role
-from repositories import EmployeeRepository
+from models import Employee, EmployeeSummary, InvitationResponse, InvitationStatus, Role
+from repositories import EmployeeCursor, EmployeeRepository
 from repositories.errors import DuplicateEmailError
-
-from .util import class_route, error_response, is_valid_uuid4, json_response, requires_token, validation_error_response
+from repositories.firestore.constants import UUID_UNASSIGNED
+from security import HashingUnavailableError, PasswordHasher
+
+from .util import (
+    body_schema,
+    class_route,
+    error_response,
+    is_valid_uuid4,
+    json_response,
+    requires_token,
+    unavailable_response,
+    validation_error_response,
+)
 
 blp = Blueprint('Employees', __name__)
 
 JSON_VALIDATION_ERROR = 'Request body must be a JSON object.'
 EMPLOYEE_NOT_FOUND_ERROR = 'Employee not found.'
+MAX_CURSOR_PAGE_SIZE = 100
+MAX_BATCH_EMPLOYEES = 300
 
 
-def employee_to_dict(employee: Employee) -> dict[str, Any]:
+def employee_to_dict(employee: EmployeeSummary) -> dict[str, Any]:
     return {
         'id': employee.id,
         'clientId': employee.client_id,
@@ -36,6 +50,22 @@ def employee_to_dict(employee: Employee) -> dict[str, Any]:
     }
 
 
+def encode_page_token(employee: EmployeeSummary) -> str:
+    cursor = [employee.invitation_date.isoformat(), employee.id]
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+def decode_page_token(page_token: str) -> EmployeeCursor | None:
+    try:
+        invitation_date, employee_id = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+        cursor = datetime.fromisoformat(invitation_date), str(employee_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        return None
+
+    # Stored invitation dates are timezone aware and can't be compared with naive ones
+    return cursor if cursor[0].tzinfo is not None else None
+
+
 # Employee validation class
 @dataclass
 class RegisterEmployeeBody:
@@ -90,7 +120,7 @@ class RetrieveEmployee(MethodView):
         if not is_valid_uuid4(employee_id):
             return error_response('Invalid employee ID.', 400)
 
-        cid = None if client_id == '00000000-0000-0000-0000-000000000000' else client_id
+        cid = None if client_id == UUID_UNASSIGNED else client_id
         employee = employee_repo.get(employee_id=employee_id, client_id=cid)
 
         if employee is None:
@@ -99,13 +129,90 @@ class RetrieveEmployee(MethodView):
         return json_response(employee_to_dict(employee), 200)
 
 
+@dataclass
+class EmployeeKeyBody:
+    clientId: str  # noqa: N815
+    employeeId: str  # noqa: N815
+
+
+@dataclass
+class BatchEmployeesBody:
+    employees: list[EmployeeKeyBody] = field(
+        metadata={'validate': marshmallow.validate.Length(min=1, max=MAX_BATCH_EMPLOYEES)}
+    )
+
+
+def batch_employees_error(data: BatchEmployeesBody) -> str | None:
+    if not all(is_valid_uuid4(key.clientId) for key in data.employees):
+        return 'Invalid client ID.'
+
+    if not all(is_valid_uuid4(key.employeeId) for key in data.employees):
+        return 'Invalid employee ID.'
+
+    return None
+
+
+# Returns the requested (clientId, employeeId) pairs and their repository keys. Duplicates are answered once,
+# in the order they were first requested.
+def batch_employees_lookup(data: BatchEmployeesBody) -> tuple[list[tuple[str, str]], list[tuple[str | None, str]]]:
+    requested = list(dict.fromkeys((key.clientId, key.employeeId) for key in data.employees))
+    keys = [(None if client_id == UUID_UNASSIGNED else client_id, employee_id) for client_id, employee_id in requested]
+    return requested, keys
+
+
+def batch_employees_to_dict(
+    requested: list[tuple[str, str]],
+    keys: list[tuple[str | None, str]],
+    employees: dict[tuple[str | None, str], Employee],
+) -> dict[str, Any]:
+    return {
+        'employees': [employee_to_dict(employees[key]) for key in keys if key in employees],
+        'missing': [
+            {'clientId': client_id, 'employeeId': employee_id}
+            for (client_id, employee_id), key in zip(requested, keys, strict=True)
+            if key not in employees
+        ],
+    }
+
+
+# Internal only
+@class_route(blp, '/api/v1/employees/batch')
+class BatchRetrieveEmployees(MethodView):
+    init_every_request = False
+
+    def post(self, employee_repo: EmployeeRepository = Provide[Container.employee_repo]) -> Response:
+        batch_schema = body_schema(BatchEmployeesBody)
+        req_json = request.get_json(silent=True)
+
+        if req_json is None:
+            return error_response(JSON_VALIDATION_ERROR, 400)
+
+        try:
+            data: BatchEmployeesBody = batch_schema.load(req_json)
+        except ValidationError as err:
+            return validation_error_response(err)
+
+        error = batch_employees_error(data)
+        if error is not None:
+            return error_response(error, 400)
+
+        requested, keys = batch_employees_lookup(data)
+        employees = employee_repo.get_many(keys)
+
+        return json_response(batch_employees_to_dict(requested, keys, employees), 200)
+
+
 @class_route(blp, '/api/v1/employees')
 class EmployeeRegister(MethodView):
     init_every_request = False
 
-    def post(self, employee_repo: EmployeeRepository = Provide[Container.employee_repo]) -> Response:
+    def post(
+        self,
+        employee_repo: EmployeeRepository = Provide[Container.employee_repo],
+        password_hasher: PasswordHasher = Provide[Container.password_hasher],
+    ) -> Response:
         # Validate request body
-        auth_schema = marshmallow_dataclass.class_schema(RegisterEmployeeBody)()
+        auth_schema = body_schema(RegisterEmployeeBody)
         req_json = request.get_json(silent=True)
 
         if req_json is None:
@@ -117,13 +224,18 @@ class EmployeeRegister(MethodView):
         except ValidationError as err:
             return validation_error_response(err)
 
+        try:
+            password_hash = password_hasher.hash(data.password)
+        except HashingUnavailableError as err:
+            return unavailable_response(err.retry_after)
+
         # Create employee
         employee = Employee(
             id=str(uuid.uuid4()),
             client_id=None,
             name=data.name,
             email=data.email,
-            password=pbkdf2_sha256.hash(data.password),
+            password=password_hash,
             role=Role(data.role),
             invitation_status=InvitationStatus.UNINVITED,
             invitation_date=datetime.now(UTC).replace(microsecond=0),
@@ -153,6 +265,11 @@ class EmployeeList(MethodView):
         # Optional pagination parameters
         page_size = request.args.get('page_size', default=5, type=int)
         page_number = request.args.get('page_number', default=1, type=int)
+        page_token = request.args.get('page_token', default=None, type=str)
+
+        # Cursor pagination, an empty page_token requests the first page
+        if page_token is not None:
+            return self.get_page(employee_repo, client_id, page_size, page_token)
 
         # Validate the value of page_size
         allowed_page_sizes = [5, 10, 20]
@@ -183,13 +300,38 @@ class EmployeeList(MethodView):
 
         return json_response(response_data, 200)
 
+    def get_page(self, employee_repo: EmployeeRepository, client_id: str, page_size: int, page_token: str) -> Response:
+        if not 1 <= page_size <= MAX_CURSOR_PAGE_SIZE:
+            return error_response(f'Invalid page_size. Page size must be between 1 and {MAX_CURSOR_PAGE_SIZE}.', 400)
+
+        start_after = None
+        if page_token != '':
+            start_after = decode_page_token(page_token)
+            if start_after is None:
+                return error_response('Invalid page_token.', 400)
+
+        total_employees = employee_repo.count(client_id)
+        employees = list(employee_repo.get_all(client_id, offset=None, limit=page_size, start_after=start_after))
+
+        # A full page may be followed by more employees
+        next_page_token = encode_page_token(employees[-1]) if len(employees) == page_size else None
+
+        response_data = {
+            'employees': [employee_to_dict(employee) for employee in employees],
+            'nextPageToken': next_page_token,
+            'totalPages': (total_employees + page_size - 1) // page_size,
+            'totalEmployees': total_employees,
+        }
+
+        return json_response(response_data, 200)
+
 
 @class_route(blp, '/api/v1/employees/invite')
 class EmployeeInvite(MethodView):
     init_every_request = False
 
     @requires_token
-    def post(
+    def post(  # noqa: PLR0911
         self,
         token: dict[str, Any],
         employee_repo: EmployeeRepository = Provide[Container.employee_repo],
@@ -199,7 +341,7 @@ class EmployeeInvite(MethodView):
             return error_response('Forbidden: You do not have access to this resource or must be linked to a company.', 403)
 
         # Parse request body
-        invite_schema = marshmallow_dataclass.class_schema(InviteEmployeeBody)()
+        invite_schema = body_schema(InviteEmployeeBody)
         req_json = request.get_json(silent=True)
 
         if req_json is None:
@@ -234,8 +376,8 @@ class EmployeeInvite(MethodView):
         employee.invitation_date = datetime.now(UTC).replace(microsecond=0)
 
         # Save updated employee
-        employee_repo.delete(employee_id=employee.id, client_id=None)
-        employee_repo.create(employee)
+        if not employee_repo.move(employee, from_client_id=None):
+            return error_response(EMPLOYEE_NOT_FOUND_ERROR, 404)
 
         return json_response(
             {
@@ -249,12 +391,12 @@ class EmployeeInvite(MethodView):
 @class_route(blp, '/api/v1/employees/invitation')
 class EmployeeInvitationResponse(MethodView):
     @requires_token
-    def post(
+    def post(  # noqa: PLR0911
         self,
         token: dict[str, Any],
         employee_repo: EmployeeRepository = Provide[Container.employee_repo],
     ) -> Response:
-        respond_schema = marshmallow_dataclass.class_schema(ResponseInvitationBody)()
+        respond_schema = body_schema(ResponseInvitationBody)
         req_json = request.get_json(silent=True)
 
         if req_json is None:
@@ -297,8 +439,8 @@ class EmployeeInvitationResponse(MethodView):
             return error_response('Invalid response', 400)
 
         # Save the updated employee
-        employee_repo.delete(employee_id=employee.id, client_id=token['cid'])
-        employee_repo.create(employee)
+        if not employee_repo.move(employee, from_client_id=token['cid']):
+            return error_response(EMPLOYEE_NOT_FOUND_ERROR, 404)
 
         return json_response(
             {
@@ -324,7 +466,7 @@ class EmployeeDetail(MethodView):
             return error_response('Forbidden: You do not have access to this resource.', 403)
 
         # Parse request body
-        invite_schema = marshmallow_dataclass.class_schema(InviteEmployeeBody)()
+        invite_schema = body_schema(InviteEmployeeBody)
         req_json = request.get_json(silent=True)
 
         if req_json is None:
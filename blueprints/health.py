@@ -1,6 +1,14 @@
+from collections.abc import Callable
+
+from dependency_injector.wiring import Provide
 from flask import Blueprint, Response
 from flask.views import MethodView
 
+from containers import Container
+from repositories.firestore import FirestoreEmployeeRepository, PooledFirestoreClient
+from security import PasswordHasher
+from warmup import WarmUp
+
 from .util import class_route, json_response
 
 blp = Blueprint('Health Check', __name__)
@@ -12,3 +20,67 @@ class HealthCheck(MethodView):
 
     def get(self) -> Response:
         return json_response({'status': 'Ok'}, 200)
+
+
+# Unready until the warm-up of the instance is done, for the startup probe
+@class_route(blp, '/api/v1/health/ready')
+class Readiness(MethodView):
+    init_every_request = False
+
+    def get(self, warmup: WarmUp = Provide[Container.warmup]) -> Response:
+        return json_response(warmup.report(), 200 if warmup.is_ready() else 503)
+
+
+# Internal only, calls in flight on each channel to Firestore, to size the channel pool
+@class_route(blp, '/api/v1/health/firestore')
+class FirestoreChannels(MethodView):
+    init_every_request = False
+
+    def get(
+        self,
+        backend: str = Provide[Container.config.repository.backend],
+        firestore_client: PooledFirestoreClient = Provide[Container.firestore_client.provider],
+    ) -> Response:
+        if backend != 'firestore':
+            return json_response({'channels': []}, 200)
+
+        channels = [
+            {'inFlight': stats.in_flight, 'peakInFlight': stats.peak_in_flight, 'calls': stats.calls}
+            for stats in firestore_client().channel_pool.snapshot()
+        ]
+        return json_response({'channels': channels}, 200)
+
+
+# Internal only, hashes done and rejected by this worker and the time they waited for a hashing process
+@class_route(blp, '/api/v1/health/hashing')
+class Hashing(MethodView):
+    init_every_request = False
+
+    def get(self, password_hasher: PasswordHasher = Provide[Container.password_hasher]) -> Response:
+        metrics = password_hasher.get_metrics()
+        resp = {
+            'completed': metrics.completed,
+            'rejected': metrics.rejected,
+            'queueWaitTotal': metrics.queue_wait_total,
+            'queueWaitMax': metrics.queue_wait_max,
+            'hashTimeTotal': metrics.hash_time_total,
+            'hashTimeMax': metrics.hash_time_max,
+            'workerRestarts': metrics.worker_restarts,
+        }
+        return json_response(resp, 200)
+
+
+# Internal only, writes of the parent document of unassigned employees by this worker, at most one is expected
+@class_route(blp, '/api/v1/health/placeholder')
+class Placeholder(MethodView):
+    init_every_request = False
+
+    def get(
+        self,
+        backend: str = Provide[Container.config.repository.backend],
+        employee_repo: Callable[[], FirestoreEmployeeRepository] = Provide[Container.firestore_employee_repo.provider],
+    ) -> Response:
+        if backend != 'firestore':
+            return json_response({'placeholderWrites': 0}, 200)
+
+        return json_response({'placeholderWrites': employee_repo().placeholder_writes}, 200)
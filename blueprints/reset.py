@@ -4,7 +4,6 @@ from dependency_injector.wiring import Provide, inject
 from flask import Blueprint, Response, request
 from flask.views import MethodView
 
-import demo
 from containers import Container
 from repositories import ClientRepository, EmployeeRepository
 
@@ -28,12 +27,16 @@ class ResetDB(MethodView):
         client_repo.delete_all()
 
         if request.args.get('demo', 'false') == 'true':
+            # Only used by development and test environments, so it is not loaded with the app
+            import demo
+
+            clients = []
             for client in demo.clients:
                 c = copy.copy(client)
                 c.email_incidents = f'{c.email_incidents}@{domain}'
-                client_repo.create(c)
+                clients.append(c)
 
-            for employee in demo.employees:
-                employee_repo.create(employee)
+            client_repo.create_many(clients)
+            employee_repo.create_many(demo.employees)
 
         return json_response({'status': 'Ok'}, 200)
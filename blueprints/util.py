@@ -1,13 +1,21 @@
+import dataclasses
 import json
+import threading
 from collections.abc import Callable
+from types import ModuleType
 from typing import Any, cast
 from uuid import UUID
 
+import marshmallow.validate
+import marshmallow_dataclass
 from flask import Blueprint, Request, Response, request
 from flask.views import MethodView
-from marshmallow import ValidationError
+from marshmallow import Schema, ValidationError
 from tightwrap import wraps
 
+# Same check as the email fields of the request bodies, for e-mails validated one by one
+EMAIL_VALIDATOR = marshmallow.validate.Email()
+
 
 class APIGatewayRequest(Request):
     user_token: dict[str, Any]
@@ -21,6 +29,37 @@ def class_route(blueprint: Blueprint, rule: str, **options: Any) -> Callable[[ty
     return decorator
 
 
+_body_schemas: dict[type, Schema] = {}
+_body_schemas_lock = threading.Lock()
+
+
+# Request body schemas are built once and then shared by every request thread, loading does not mutate them
+def body_schema(cls: type) -> Schema:
+    schema = _body_schemas.get(cls)
+    if schema is None:
+        with _body_schemas_lock:
+            schema = _body_schemas.get(cls)
+            if schema is None:
+                schema = marshmallow_dataclass.class_schema(cls)()
+                _body_schemas[cls] = schema
+
+    return schema
+
+
+# Builds the schemas of the request bodies declared in the given modules, before the first request needs them
+def preload_body_schemas(*modules: ModuleType) -> int:
+    classes = [
+        obj
+        for module in modules
+        for name, obj in vars(module).items()
+        if name.endswith('Body') and dataclasses.is_dataclass(obj) and isinstance(obj, type)
+    ]
+    for cls in classes:
+        body_schema(cls)
+
+    return len(classes)
+
+
 def is_valid_uuid4(uuid: str) -> bool:
     try:
         UUID(uuid, version=4)
@@ -30,6 +69,15 @@ def is_valid_uuid4(uuid: str) -> bool:
     return True
 
 
+def is_valid_email(email: str) -> bool:
+    try:
+        EMAIL_VALIDATOR(email)
+    except ValidationError:
+        return False
+
+    return True
+
+
 def json_response(data: dict[str, Any] | list[dict[str, Any]], status: int) -> Response:
     return Response(json.dumps(data), status=status, mimetype='application/json')
 
@@ -38,14 +86,23 @@ def error_response(msg: str, code: int) -> Response:
     return json_response({'message': msg, 'code': code}, code)
 
 
-def validation_error_response(err: ValidationError) -> Response:
+def unavailable_response(retry_after: int) -> Response:
+    resp = error_response('Service is busy, please try again later.', 503)
+    resp.headers['Retry-After'] = str(retry_after)
+    return resp
+
+
+def validation_error_message(err: ValidationError) -> str:
     if isinstance(err.messages, dict):
-        msg = ' '.join([f'Invalid value for {k}: {" ".join(v)}' for k, v in err.messages.items()])
-        return error_response(msg, 400)
+        return ' '.join([f'Invalid value for {k}: {" ".join(v)}' for k, v in err.messages.items()])
 
     raise NotImplementedError('Validation error response for non-dict messages not implemented.')  # pragma: no cover
 
 
+def validation_error_response(err: ValidationError) -> Response:
+    return error_response(validation_error_message(err), 400)
+
+
 def requires_token(f: Callable[..., Response]) -> Callable[..., Response]:
     @wraps(f)
     def decorated_function(*args, **kwargs) -> Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
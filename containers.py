@@ -1,15 +1,147 @@
+from collections.abc import Callable, Iterator
+from typing import Any
+
 from dependency_injector import providers
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
 from gcp_microservice_utils import access_token_provider
+from google.cloud.firestore import AsyncClient  # type: ignore[import-untyped]
+
+from repositories.cached import AsyncCachedClientRepository, CachedClientRepository
+from repositories.firestore import (
+    AsyncFirestoreClientRepository,
+    AsyncFirestoreEmployeeRepository,
+    FirestoreClientRepository,
+    FirestoreEmployeeRepository,
+    PooledFirestoreClient,
+)
+from repositories.memory import (
+    AsyncMemoryClientRepository,
+    AsyncMemoryEmployeeRepository,
+    MemoryClientRepository,
+    MemoryEmployeeRepository,
+)
+from security import PasswordHasher, TokenSigner
+from warmup import WarmUp
+
 
-from repositories.firestore import FirestoreClientRepository, FirestoreEmployeeRepository
+# gRPC channels and the hashing worker processes do not survive a fork, so servers that load the app before
+# forking create them in each worker with init_resources, and close them with shutdown_resources
+def manage_worker_resources(
+    backend: str,
+    firestore_client: Callable[[], PooledFirestoreClient],
+    password_hasher: Callable[[], PasswordHasher],
+) -> Iterator[None]:
+    db = firestore_client() if backend == 'firestore' else None
+    hasher = password_hasher()
+
+    yield
+
+    hasher.shutdown()
+    if db is not None:
+        db.close()
 
 
 class Container(DeclarativeContainer):
-    wiring_config = WiringConfiguration(packages=['blueprints'])
+    # The asyncio views are wired by the ASGI app, so the WSGI app does not import Quart
+    wiring_config = WiringConfiguration(
+        modules=[
+            'blueprints.auth',
+            'blueprints.backup',
+            'blueprints.client',
+            'blueprints.employee',
+            'blueprints.health',
+            'blueprints.reset',
+        ]
+    )
     config = providers.Configuration()
 
     access_token = providers.Callable(access_token_provider)
 
-    client_repo = providers.ThreadSafeSingleton(FirestoreClientRepository, database=config.firestore.database)
-    employee_repo = providers.ThreadSafeSingleton(FirestoreEmployeeRepository, database=config.firestore.database)
+    # Shared by all the Firestore repositories of the process
+    firestore_client = providers.ThreadSafeSingleton(
+        PooledFirestoreClient,
+        database=config.firestore.database,
+        channels=config.firestore.channels,
+        keepalive_time_ms=config.firestore.keepalive_time_ms,
+        keepalive_timeout_ms=config.firestore.keepalive_timeout_ms,
+    )
+    # Bound to the event loop it is first used on, there is one per process of the ASGI server
+    async_firestore_client: providers.ThreadSafeSingleton[Any] = providers.ThreadSafeSingleton(
+        AsyncClient, database=config.firestore.database
+    )
+
+    memory_client_repo = providers.ThreadSafeSingleton(MemoryClientRepository)
+    memory_employee_repo = providers.ThreadSafeSingleton(MemoryEmployeeRepository)
+    firestore_employee_repo = providers.ThreadSafeSingleton(
+        FirestoreEmployeeRepository,
+        db=firestore_client,
+        agent_pool_max_size=config.cache.agents.max_size,
+        agent_pool_ttl=config.cache.agents.ttl,
+        counter_shards=config.firestore.counter_shards,
+        bulk_ops_per_second=config.firestore.bulk_ops_per_second,
+        bulk_max_ops_per_second=config.firestore.bulk_max_ops_per_second,
+        email_index_fallback=config.firestore.email_index_fallback,
+    )
+
+    client_repo = providers.ThreadSafeSingleton(
+        CachedClientRepository,
+        repo=providers.Selector(
+            config.repository.backend,
+            firestore=providers.ThreadSafeSingleton(
+                FirestoreClientRepository,
+                db=firestore_client,
+                bulk_ops_per_second=config.firestore.bulk_ops_per_second,
+                bulk_max_ops_per_second=config.firestore.bulk_max_ops_per_second,
+                email_index_fallback=config.firestore.email_index_fallback,
+            ),
+            memory=memory_client_repo,
+        ),
+        max_size=config.cache.clients.max_size,
+        ttl=config.cache.clients.ttl,
+        negative_max_size=config.cache.clients.negative_max_size,
+        negative_ttl=config.cache.clients.negative_ttl,
+    )
+    employee_repo = providers.Selector(
+        config.repository.backend,
+        firestore=firestore_employee_repo,
+        memory=memory_employee_repo,
+    )
+
+    # Used by the asyncio views of the ASGI app, they share their caches and in memory data with the ones above
+    async_client_repo = providers.ThreadSafeSingleton(
+        AsyncCachedClientRepository,
+        repo=providers.Selector(
+            config.repository.backend,
+            firestore=providers.ThreadSafeSingleton(
+                AsyncFirestoreClientRepository,
+                db=async_firestore_client,
+                email_index_fallback=config.firestore.email_index_fallback,
+            ),
+            memory=providers.ThreadSafeSingleton(AsyncMemoryClientRepository, repo=memory_client_repo),
+        ),
+        cache=client_repo,
+    )
+    async_employee_repo = providers.Selector(
+        config.repository.backend,
+        firestore=providers.ThreadSafeSingleton(
+            AsyncFirestoreEmployeeRepository,
+            db=async_firestore_client,
+            agent_pools=firestore_employee_repo.provided.agent_pools,
+            email_index_fallback=config.firestore.email_index_fallback,
+        ),
+        memory=providers.ThreadSafeSingleton(AsyncMemoryEmployeeRepository, repo=memory_employee_repo),
+    )
+
+    password_hasher = providers.ThreadSafeSingleton(
+        PasswordHasher, workers=config.hashing.workers, max_queue=config.hashing.max_queue
+    )
+    token_signer = providers.ThreadSafeSingleton(TokenSigner, private_key=config.jwt.private_key.required())
+
+    warmup = providers.ThreadSafeSingleton(WarmUp)
+
+    worker_resources = providers.Resource(
+        manage_worker_resources,
+        backend=config.repository.backend,
+        firestore_client=firestore_client.provider,
+        password_hasher=password_hasher.provider,
+    )
@@ -0,0 +1,27 @@
+# ruff: noqa: INP001
+# Read by gunicorn from the working directory, the Dockerfile runs it with no arguments
+import os
+from typing import Any
+
+bind = f'0.0.0.0:{os.getenv("PORT", "8080")}'
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+# Also read by the app, which sizes the Firestore channels of each worker to it
+threads = int(os.getenv('WORKER_THREADS', '8'))
+
+# The master imports and creates the app once, and the workers share its memory until they write to it
+preload_app = os.getenv('PRELOAD_APP', '1') == '1'
+wsgi_app = 'app:create_app(preload=True)'
+
+
+# Runs in the worker once it has the app, whether the master preloaded it or the worker created it
+def post_worker_init(worker: Any) -> None:  # noqa: ANN401
+    from app import init_worker
+
+    init_worker(worker.wsgi)
+
+
+def worker_exit(server: Any, worker: Any) -> None:  # noqa: ANN401, ARG001
+    # Not set when the worker failed to load the app, nor in the master when it stops a worker that failed to boot
+    wsgi = getattr(worker, 'wsgi', None)
+    if wsgi is not None:
+        wsgi.container.shutdown_resources()
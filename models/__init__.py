@@ -1,8 +1,8 @@
 from .client import Client
-from .employee import Employee
+from .employee import Employee, EmployeeSummary
 from .invitation_response import InvitationResponse
 from .invitation_status import InvitationStatus
 from .plan import Plan
 from .role import Role
 
-__all__ = ['Client', 'Employee', 'InvitationStatus', 'Plan', 'Role', 'InvitationResponse']
+__all__ = ['Client', 'Employee', 'EmployeeSummary', 'InvitationStatus', 'Plan', 'Role', 'InvitationResponse']
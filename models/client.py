@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from .plan import Plan
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     id: str
     name: str
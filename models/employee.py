@@ -1,3 +1,4 @@
+import dataclasses
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -5,13 +6,21 @@ from .invitation_status import InvitationStatus
 from .role import Role
 
 
-@dataclass
-class Employee:
+# Read model for listings, without the password hash
+@dataclass(slots=True)
+class EmployeeSummary:
     id: str
     client_id: str | None
     name: str
     email: str
-    password: str
     role: Role
     invitation_status: InvitationStatus
     invitation_date: datetime
+
+
+@dataclass(slots=True)
+class Employee(EmployeeSummary):
+    password: str
+
+    def to_summary(self) -> EmployeeSummary:
+        return EmployeeSummary(**{field.name: getattr(self, field.name) for field in dataclasses.fields(EmployeeSummary)})
@@ -1,5 +1,12 @@
-from .client import ClientRepository
-from .employee import EmployeeRepository
+from .client import AsyncClientRepository, ClientRepository
+from .employee import AsyncEmployeeRepository, EmployeeCursor, EmployeeRepository
 from .errors import DuplicateEmailError
 
-__all__ = ['ClientRepository', 'EmployeeRepository', 'DuplicateEmailError']
+__all__ = [
+    'AsyncClientRepository',
+    'AsyncEmployeeRepository',
+    'ClientRepository',
+    'EmployeeCursor',
+    'EmployeeRepository',
+    'DuplicateEmailError',
+]
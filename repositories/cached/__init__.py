@@ -0,0 +1,5 @@
+from .async_client import AsyncCachedClientRepository
+from .client import CachedClientRepository
+from .ttl_cache import TTLCache
+
+__all__ = ['AsyncCachedClientRepository', 'CachedClientRepository', 'TTLCache']
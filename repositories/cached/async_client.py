@@ -0,0 +1,72 @@
+import copy
+
+from models import Client
+from repositories import AsyncClientRepository
+
+from .client import CachedClientRepository
+
+
+# Reads through the caches of the synchronous repository, so both see the same entries and the writes made
+# through it, like updates, invalidate the clients read here too. Only the calls to the backend are its own.
+class AsyncCachedClientRepository(AsyncClientRepository):
+    def __init__(self, repo: AsyncClientRepository, cache: CachedClientRepository) -> None:
+        self.repo = repo
+        self.cache = cache
+
+    async def get(self, client_id: str) -> Client | None:
+        client = self.cache.cached(client_id)
+        if client is not None:
+            return client
+
+        generation = self.cache.clients.generation
+        client = await self.repo.get(client_id)
+        if client is not None:
+            self.cache.put_many([client], generation)
+
+        return client
+
+    async def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        found, missing = self.cache.cached_many(client_ids)
+
+        if missing:
+            generation = self.cache.clients.generation
+            clients = await self.repo.get_many(missing)
+            self.cache.put_many(clients.values(), generation)
+            found.update(clients)
+
+        return found
+
+    async def find_by_email(self, email: str) -> Client | None:
+        lookup, indexed = self.cache.indexed([email])
+        if not lookup:
+            return None
+
+        if email in indexed:
+            client = self.cache.check_indexed(email, await self.get(indexed[email]))
+            if client is not None:
+                return client
+
+        generations = self.cache.email_generations()
+        client = await self.repo.find_by_email(email)
+        self.cache.put_by_email([email], {} if client is None else {email: client}, generations)
+
+        return client
+
+    async def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        lookup, indexed = self.cache.indexed(emails)
+
+        clients = await self.get_many(list(indexed.values()))
+        found: dict[str, Client] = {}
+        for email, client_id in indexed.items():
+            client = self.cache.check_indexed(email, clients.get(client_id))
+            if client is not None:
+                found[email] = copy.copy(client)
+
+        missing = [email for email in lookup if email not in found]
+        if missing:
+            generations = self.cache.email_generations()
+            clients = await self.repo.find_many_by_email(missing)
+            self.cache.put_by_email(missing, clients, generations)
+            found.update(clients)
+
+        return found
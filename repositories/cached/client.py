@@ -0,0 +1,182 @@
+import copy
+import itertools
+from collections.abc import Generator, Iterable
+
+from models import Client
+from repositories import ClientRepository
+
+from .ttl_cache import TTLCache
+
+
+class CachedClientRepository(ClientRepository):
+    def __init__(
+        self,
+        repo: ClientRepository,
+        max_size: int,
+        ttl: float,
+        negative_max_size: int,
+        negative_ttl: float,
+    ) -> None:
+        self.repo = repo
+        self.clients: TTLCache[str, Client] = TTLCache(max_size, ttl)
+        self.by_email: TTLCache[str, str] = TTLCache(max_size, ttl)
+        # Incident emails known not to belong to any client, e.g. spam to unknown addresses
+        self.missing_emails: TTLCache[str, bool] = TTLCache(negative_max_size, negative_ttl)
+
+    def create(self, client: Client) -> None:
+        self.repo.create(client)
+        self.missing_emails.pop(client.email_incidents)
+        self.clients.put(client.id, copy.copy(client))
+        self.by_email.put(client.email_incidents, client.id)
+
+    def create_many(self, clients: list[Client]) -> None:
+        self.repo.create_many(clients)
+        for client in clients:
+            self.missing_emails.pop(client.email_incidents)
+            self.clients.put(client.id, copy.copy(client))
+            self.by_email.put(client.email_incidents, client.id)
+
+    # Cache bookkeeping shared with AsyncCachedClientRepository, which only differs in awaiting the backend
+
+    def cached(self, client_id: str) -> Client | None:
+        # Callers mutate the clients they get, so the cached instances are never handed out
+        client = self.clients.get(client_id)
+        return None if client is None else copy.copy(client)
+
+    def cached_many(self, client_ids: list[str]) -> tuple[dict[str, Client], list[str]]:
+        found: dict[str, Client] = {}
+        missing: list[str] = []
+        for client_id in client_ids:
+            client = self.cached(client_id)
+            if client is None:
+                missing.append(client_id)
+            else:
+                found[client_id] = client
+
+        return found, missing
+
+    def put_many(self, clients: Iterable[Client], generation: int) -> None:
+        for client in clients:
+            self.clients.put(client.id, copy.copy(client), generation)
+
+    # Emails not known to be missing, and the ids of the clients of those already indexed
+    def indexed(self, emails: list[str]) -> tuple[list[str], dict[str, str]]:
+        lookup = [email for email in emails if not self.missing_emails.get(email)]
+        return lookup, {email: client_id for email in lookup if (client_id := self.by_email.get(email)) is not None}
+
+    def check_indexed(self, email: str, client: Client | None) -> Client | None:
+        if client is not None and client.email_incidents == email:
+            return client
+
+        # The client was updated or removed since it was indexed
+        self.by_email.pop(email)
+        return None
+
+    def email_generations(self) -> tuple[int, int, int]:
+        return self.clients.generation, self.by_email.generation, self.missing_emails.generation
+
+    def put_by_email(self, emails: list[str], clients: dict[str, Client], generations: tuple[int, int, int]) -> None:
+        generation_clients, generation_by_email, generation_missing = generations
+        for email in emails:
+            client = clients.get(email)
+            if client is None:
+                self.missing_emails.put(email, True, generation_missing)  # noqa: FBT003
+            else:
+                self.clients.put(client.id, copy.copy(client), generation_clients)
+                self.by_email.put(email, client.id, generation_by_email)
+
+    def get(self, client_id: str) -> Client | None:
+        client = self.cached(client_id)
+        if client is not None:
+            return client
+
+        generation = self.clients.generation
+        client = self.repo.get(client_id)
+        if client is not None:
+            self.put_many([client], generation)
+
+        return client
+
+    def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        found, missing = self.cached_many(client_ids)
+
+        if missing:
+            generation = self.clients.generation
+            clients = self.repo.get_many(missing)
+            self.put_many(clients.values(), generation)
+            found.update(clients)
+
+        return found
+
+    def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        lookup, indexed = self.indexed(emails)
+
+        # Emails already indexed only need their clients, which are likely cached too
+        clients = self.get_many(list(indexed.values()))
+        found: dict[str, Client] = {}
+        for email, client_id in indexed.items():
+            client = self.check_indexed(email, clients.get(client_id))
+            if client is not None:
+                found[email] = copy.copy(client)
+
+        missing = [email for email in lookup if email not in found]
+        if missing:
+            generations = self.email_generations()
+            clients = self.repo.find_many_by_email(missing)
+            self.put_by_email(missing, clients, generations)
+            found.update(clients)
+
+        return found
+
+    def get_all(self) -> Generator[Client, None, None]:
+        return self.repo.get_all()
+
+    def find_by_email(self, email: str) -> Client | None:
+        lookup, indexed = self.indexed([email])
+        if not lookup:
+            return None
+
+        if email in indexed:
+            client = self.check_indexed(email, self.get(indexed[email]))
+            if client is not None:
+                return client
+
+        generations = self.email_generations()
+        client = self.repo.find_by_email(email)
+        self.put_by_email([email], {} if client is None else {email: client}, generations)
+
+        return client
+
+    def delete_all(self) -> None:
+        self.invalidate_all()
+        self.repo.delete_all()
+        self.invalidate_all()
+
+    def update(self, client: Client) -> None:
+        self.clients.pop(client.id)
+        self.repo.update(client)
+        self.clients.pop(client.id)
+        self.missing_emails.pop(client.email_incidents)
+
+    # The e-mail index entry is dropped when it is next read, as its client is gone
+    def delete(self, client_id: str) -> None:
+        self.clients.pop(client_id)
+        self.repo.delete(client_id)
+        self.clients.pop(client_id)
+
+    # Loads up to max_size clients, e.g. at startup, so the first requests for them don't wait on the backend
+    def prime(self) -> int:
+        generation_clients = self.clients.generation
+        generation_by_email = self.by_email.generation
+        clients = list(itertools.islice(self.repo.get_all(), self.clients.max_size))
+
+        for client in clients:
+            self.clients.put(client.id, copy.copy(client), generation_clients)
+            self.by_email.put(client.email_incidents, client.id, generation_by_email)
+
+        return len(clients)
+
+    def invalidate_all(self) -> None:
+        self.clients.clear()
+        self.by_email.clear()
+        self.missing_emails.clear()
@@ -7,9 +7,19 @@ class ClientRepository:
     def create(self, client: Client) -> None:
         raise NotImplementedError  # pragma: no cover
 
+    def create_many(self, clients: list[Client]) -> None:
+        raise NotImplementedError  # pragma: no cover
+
     def get(self, client_id: str) -> Client | None:
         raise NotImplementedError  # pragma: no cover
 
+    # Both return the clients found, keyed by the id or e-mail they were looked up with
+    def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        raise NotImplementedError  # pragma: no cover
+
+    def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        raise NotImplementedError  # pragma: no cover
+
     def get_all(self) -> Generator[Client, None, None]:
         raise NotImplementedError  # pragma: no cover
 
@@ -21,3 +31,21 @@ class ClientRepository:
 
     def update(self, client: Client) -> None:
         raise NotImplementedError  # pragma: no cover
+
+    def delete(self, client_id: str) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+# Read operations of ClientRepository for asyncio views, which can wait on many of them at once
+class AsyncClientRepository:
+    async def get(self, client_id: str) -> Client | None:
+        raise NotImplementedError  # pragma: no cover
+
+    async def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        raise NotImplementedError  # pragma: no cover
+
+    async def find_by_email(self, email: str) -> Client | None:
+        raise NotImplementedError  # pragma: no cover
+
+    async def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        raise NotImplementedError  # pragma: no cover
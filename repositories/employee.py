@@ -1,13 +1,23 @@
 from collections.abc import Generator
+from datetime import datetime
 
-from models import Employee
+from models import Employee, EmployeeSummary
+
+# Position of an employee in the (invitation_date, id) descending order used to list employees
+EmployeeCursor = tuple[datetime, str]
 
 
 class EmployeeRepository:
     def get(self, employee_id: str, client_id: str | None) -> Employee | None:
         raise NotImplementedError  # pragma: no cover
 
-    def get_all(self, client_id: str, offset: int | None, limit: int | None) -> Generator[Employee, None, None]:
+    # Returns the employees found, keyed by the (client_id, employee_id) pair they were looked up with
+    def get_many(self, keys: list[tuple[str | None, str]]) -> dict[tuple[str | None, str], Employee]:
+        raise NotImplementedError  # pragma: no cover
+
+    def get_all(
+        self, client_id: str, offset: int | None, limit: int | None, start_after: EmployeeCursor | None = None
+    ) -> Generator[EmployeeSummary, None, None]:
         raise NotImplementedError  # pragma: no cover
 
     def find_by_email(self, email: str) -> Employee | None:
@@ -16,6 +26,14 @@ class EmployeeRepository:
     def create(self, employee: Employee) -> None:
         raise NotImplementedError  # pragma: no cover
 
+    def create_many(self, employees: list[Employee]) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    # Moves an employee, stored under from_client_id, to employee.client_id and saves its other fields.
+    # Returns False, without writing anything, if the employee is no longer stored under from_client_id.
+    def move(self, employee: Employee, from_client_id: str | None) -> bool:
+        raise NotImplementedError  # pragma: no cover
+
     def delete(self, employee_id: str, client_id: str | None) -> None:
         raise NotImplementedError  # pragma: no cover
 
@@ -25,8 +43,20 @@ class EmployeeRepository:
     def count(self, client_id: str) -> int:
         raise NotImplementedError  # pragma: no cover
 
-    def get_agents_by_client(self, client_id: str) -> list[Employee]:
+    def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
+        raise NotImplementedError  # pragma: no cover
+
+
+# Read operations of EmployeeRepository for asyncio views, which can wait on many of them at once
+class AsyncEmployeeRepository:
+    async def get(self, employee_id: str, client_id: str | None) -> Employee | None:
+        raise NotImplementedError  # pragma: no cover
+
+    async def get_many(self, keys: list[tuple[str | None, str]]) -> dict[tuple[str | None, str], Employee]:
+        raise NotImplementedError  # pragma: no cover
+
+    async def find_by_email(self, email: str) -> Employee | None:
         raise NotImplementedError  # pragma: no cover
 
-    def get_random_agent(self, client_id: str) -> Employee | None:
+    async def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
         raise NotImplementedError  # pragma: no cover
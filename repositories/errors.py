@@ -2,3 +2,13 @@ class DuplicateEmailError(Exception):
     def __init__(self, email: str) -> None:
         self.email = email
         super().__init__(f"A user with the email '{email}' already exists.")
+
+
+def first_duplicate(values: list[str]) -> str | None:
+    seen: set[str] = set()
+    for value in values:
+        if value in seen:
+            return value
+        seen.add(value)
+
+    return None
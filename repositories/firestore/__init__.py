@@ -1,5 +1,17 @@
+from .async_client import AsyncFirestoreClientRepository
+from .async_employee import AsyncFirestoreEmployeeRepository
+from .channels import ChannelStats, PooledFirestoreClient, channels_for
 from .client import FirestoreClientRepository
 from .constants import UUID_UNASSIGNED
 from .employee import FirestoreEmployeeRepository
 
-__all__ = ['FirestoreClientRepository', 'FirestoreEmployeeRepository', 'UUID_UNASSIGNED']
+__all__ = [
+    'AsyncFirestoreClientRepository',
+    'AsyncFirestoreEmployeeRepository',
+    'ChannelStats',
+    'PooledFirestoreClient',
+    'channels_for',
+    'FirestoreClientRepository',
+    'FirestoreEmployeeRepository',
+    'UUID_UNASSIGNED',
+]
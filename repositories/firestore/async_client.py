@@ -0,0 +1,100 @@
+import contextlib
+import logging
+from collections.abc import Collection
+from typing import Any, cast
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore import AsyncClient  # type: ignore[import-untyped]
+from google.cloud.firestore_v1 import AsyncDocumentReference, DocumentSnapshot
+
+from models import Client
+from repositories import AsyncClientRepository
+
+from .bulk import MAX_IN_VALUES, chunked
+from .client import CLIENT_CONVERTER, email_filter, unique_by_email
+from .constants import UUID_UNASSIGNED
+from .keys import key_id
+
+
+class AsyncFirestoreClientRepository(AsyncClientRepository):
+    def __init__(self, db: AsyncClient, *, email_index_fallback: bool = True) -> None:
+        self.db = db
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.email_index_fallback = email_index_fallback
+
+    def doc_to_client(self, doc: DocumentSnapshot) -> Client:
+        return CLIENT_CONVERTER.from_dict({**cast(dict[str, Any], doc.to_dict()), 'id': doc.id})
+
+    def _email_ref(self, email: str) -> AsyncDocumentReference:
+        return cast(AsyncDocumentReference, self.db.collection('client_emails').document(key_id(email)))
+
+    async def get(self, client_id: str) -> Client | None:
+        if client_id == UUID_UNASSIGNED:
+            return None
+
+        client_doc = await self.db.collection('clients').document(client_id).get()
+
+        if not client_doc.exists:
+            return None
+
+        return self.doc_to_client(client_doc)
+
+    async def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        refs = [
+            self.db.collection('clients').document(client_id) for client_id in set(client_ids) if client_id != UUID_UNASSIGNED
+        ]
+        if not refs:
+            return {}
+
+        return {doc.id: self.doc_to_client(doc) async for doc in self.db.get_all(refs) if doc.exists}
+
+    # Same fallback as the synchronous repository, for clients written by instances that predate the index
+    async def _find_unindexed_by_email(self, emails: Collection[str]) -> dict[str, Client]:
+        if not self.email_index_fallback or not emails:
+            return {}
+
+        docs: list[DocumentSnapshot] = []
+        for chunk in chunked(sorted(emails), MAX_IN_VALUES):
+            query = self.db.collection('clients').where(filter=email_filter(chunk))
+            docs.extend([doc async for doc in query.stream()])
+
+        found: dict[str, Client] = {}
+        for email, doc in unique_by_email(docs, self.logger).items():
+            with contextlib.suppress(AlreadyExists):
+                await self._email_ref(email).create({'id': doc.id})
+
+            found[email] = self.doc_to_client(doc)
+
+        return found
+
+    async def find_by_email(self, email: str) -> Client | None:
+        key_doc = await self._email_ref(email).get()
+        if not key_doc.exists:
+            return (await self._find_unindexed_by_email([email])).get(email)
+
+        doc = await self.db.collection('clients').document(key_doc.get('id')).get()
+        if not doc.exists or doc.get('email_incidents') != email:
+            self.logger.error('Stale e-mail index entry for %s', email)
+            return None
+
+        return self.doc_to_client(doc)
+
+    async def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        key_refs = {self._email_ref(email).path: email for email in set(emails)}
+        if not key_refs:
+            return {}
+
+        key_docs = self.db.get_all([self.db.document(path) for path in key_refs])
+        ids = {key_refs[key_doc.reference.path]: key_doc.get('id') async for key_doc in key_docs if key_doc.exists}
+        clients = await self.get_many(list(ids.values()))
+
+        found = await self._find_unindexed_by_email(set(key_refs.values()) - ids.keys())
+        for email, client_id in ids.items():
+            client = clients.get(client_id)
+            if client is None or client.email_incidents != email:
+                self.logger.error('Stale e-mail index entry for %s', email)
+                continue
+
+            found[email] = client
+
+        return found
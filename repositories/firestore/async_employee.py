@@ -0,0 +1,129 @@
+import contextlib
+import logging
+import secrets
+from typing import cast
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore import AsyncClient  # type: ignore[import-untyped]
+from google.cloud.firestore_v1 import AsyncCollectionReference, AsyncDocumentReference, DocumentSnapshot
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from models import Employee, EmployeeSummary, InvitationStatus, Role
+from repositories import AsyncEmployeeRepository
+from repositories.cached import TTLCache
+
+from .constants import UUID_UNASSIGNED
+from .employee import EMPLOYEE_CONVERTER, SUMMARY_CONVERTER, SUMMARY_FIELDS, doc_data
+from .keys import key_id
+
+
+class AsyncFirestoreEmployeeRepository(AsyncEmployeeRepository):
+    def __init__(
+        self, db: AsyncClient, agent_pools: TTLCache[str, tuple[str, ...]], *, email_index_fallback: bool = True
+    ) -> None:
+        self.db = db
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.email_index_fallback = email_index_fallback
+        # Shared with the synchronous repository, which drops the pools of the clients whose agents it changes
+        self.agent_pools = agent_pools
+
+    def doc_to_employee(self, doc: DocumentSnapshot) -> Employee:
+        return EMPLOYEE_CONVERTER.from_dict(doc_data(doc))
+
+    def _email_ref(self, email: str) -> AsyncDocumentReference:
+        return cast(AsyncDocumentReference, self.db.collection('employee_emails').document(key_id(email)))
+
+    def _employee_ref(self, employee_id: str, client_id: str | None) -> AsyncDocumentReference:
+        client_ref = self.db.collection('clients').document(UUID_UNASSIGNED if client_id is None else client_id)
+        return cast(AsyncCollectionReference, client_ref.collection('employees')).document(employee_id)
+
+    async def get(self, employee_id: str, client_id: str | None) -> Employee | None:
+        doc = await self._employee_ref(employee_id, client_id).get()
+
+        if not doc.exists:
+            return None
+
+        return self.doc_to_employee(doc)
+
+    async def get_many(self, keys: list[tuple[str | None, str]]) -> dict[tuple[str | None, str], Employee]:
+        refs = [self._employee_ref(employee_id, client_id) for client_id, employee_id in set(keys)]
+        if not refs:
+            return {}
+
+        employees = [self.doc_to_employee(doc) async for doc in self.db.get_all(refs) if doc.exists]
+        return {(employee.client_id, employee.id): employee for employee in employees}
+
+    # Same fallback as the synchronous repository, for employees written by instances that predate the index
+    async def _find_unindexed_by_email(self, email: str) -> Employee | None:
+        if not self.email_index_fallback:
+            return None
+
+        query = self.db.collection_group('employees').where(filter=FieldFilter('email', '==', email))  # type: ignore[no-untyped-call]
+        docs = await query.get()
+
+        if len(docs) == 0:
+            return None
+
+        if len(docs) > 1:
+            self.logger.error('Multiple employees found with email %s', email)
+            return None
+
+        doc = cast(DocumentSnapshot, docs[0])
+        with contextlib.suppress(AlreadyExists):
+            await self._email_ref(email).create({'path': doc.reference.path})
+
+        return self.doc_to_employee(doc)
+
+    async def find_by_email(self, email: str) -> Employee | None:
+        key_doc = await self._email_ref(email).get()
+        if not key_doc.exists:
+            return await self._find_unindexed_by_email(email)
+
+        doc = await cast(AsyncDocumentReference, self.db.document(key_doc.get('path'))).get()
+        if not doc.exists or doc.get('email') != email:
+            self.logger.error('Stale e-mail index entry for %s', email)
+            return None
+
+        return self.doc_to_employee(doc)
+
+    async def get_agent_ids(self, client_id: str) -> tuple[str, ...]:
+        agent_ids = self.agent_pools.get(client_id)
+
+        if agent_ids is None:
+            generation = self.agent_pools.generation
+            employees_ref = cast(
+                AsyncCollectionReference, self.db.collection('clients').document(client_id).collection('employees')
+            )
+            query = employees_ref.where(filter=FieldFilter('role', '==', 'agent')).where(  # type: ignore[no-untyped-call]
+                filter=FieldFilter('invitation_status', '==', 'accepted')  # type: ignore[no-untyped-call]
+            )
+            docs = query.select([FieldPath.document_id()]).stream()  # type: ignore[no-untyped-call]
+            agent_ids = tuple([doc.id async for doc in docs])
+            self.agent_pools.put(client_id, agent_ids, generation)
+
+        return agent_ids
+
+    async def _get_summary(self, employee_id: str, client_id: str) -> EmployeeSummary | None:
+        doc = await self._employee_ref(employee_id, client_id).get(field_paths=SUMMARY_FIELDS)
+
+        if not doc.exists:
+            return None
+
+        return SUMMARY_CONVERTER.from_dict(doc_data(doc))
+
+    async def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
+        agent_ids = await self.get_agent_ids(client_id)
+
+        if not agent_ids:
+            return None
+
+        agent = await self._get_summary(secrets.choice(agent_ids), client_id)
+        if agent is not None and agent.role == Role.AGENT and agent.invitation_status == InvitationStatus.ACCEPTED:
+            return agent
+
+        # The pool was changed by another instance, rebuild it
+        self.agent_pools.pop(client_id)
+        agent_ids = await self.get_agent_ids(client_id)
+
+        return await self._get_summary(secrets.choice(agent_ids), client_id) if agent_ids else None
@@ -0,0 +1,95 @@
+import logging
+import time
+from collections.abc import Collection, Generator, Iterable, Sequence
+from typing import TypeVar
+
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+from google.cloud.firestore_v1 import DocumentReference, Query, WriteBatch
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+from google.cloud.firestore_v1.field_path import FieldPath
+
+PROGRESS_INTERVAL = 1000
+# Firestore limits
+MAX_BATCH_WRITES = 500
+MAX_IN_VALUES = 30
+
+T = TypeVar('T')
+
+
+def chunked(items: Sequence[T], size: int) -> Generator[Sequence[T], None, None]:
+    for idx in range(0, len(items), size):
+        yield items[idx : idx + size]
+
+
+def find_existing(query: Query, field: str, values: Sequence[str]) -> set[str]:
+    existing: set[str] = set()
+    for chunk in chunked(values, MAX_IN_VALUES):
+        docs = query.where(filter=FieldFilter(field, 'in', list(chunk))).select([field]).stream()  # type: ignore[no-untyped-call]
+        existing.update(doc.get(field) for doc in docs)
+
+    return existing
+
+
+def find_existing_docs(db: FirestoreClient, refs: Sequence[DocumentReference]) -> set[str]:
+    existing: set[str] = set()
+    for chunk in chunked(refs, MAX_BATCH_WRITES):
+        existing.update(doc.reference.path for doc in db.get_all(list(chunk)) if doc.exists)
+
+    return existing
+
+
+class BatchWriter:
+    # Spreads writes over as few batches as possible, committing each one when it is full
+    def __init__(self, db: FirestoreClient) -> None:
+        self.db = db
+        self.batch: WriteBatch = db.batch()
+        self.commits = 0
+
+    def next(self) -> WriteBatch:
+        if len(self.batch) >= MAX_BATCH_WRITES:
+            self.commit()
+
+        return self.batch
+
+    def commit(self) -> None:
+        if len(self.batch) > 0:
+            self.batch.commit()
+            self.commits += 1
+            self.batch = self.db.batch()
+
+
+# Starts at ops_per_second and ramps up by 50% every 5 minutes while the writes keep up, to at most
+# max_ops_per_second. BulkWriterOptions defaults the maximum to 500 as well, which leaves no room to ramp up.
+def bulk_writer_options(ops_per_second: int, max_ops_per_second: int) -> BulkWriterOptions:
+    return BulkWriterOptions(initial_ops_per_second=ops_per_second, max_ops_per_second=max(ops_per_second, max_ops_per_second))
+
+
+def bulk_delete(
+    db: FirestoreClient,
+    queries: Iterable[Query],
+    options: BulkWriterOptions,
+    logger: logging.Logger,
+    keep: Collection[str] = (),
+) -> int:
+    # The bulk writer groups the deletes in batches and keeps several of them in flight at once
+    writer = db.bulk_writer(options)
+    start = time.monotonic()
+    deleted = 0
+
+    for query in queries:
+        # Only the document names are needed to delete them
+        for doc in query.select([FieldPath.document_id()]).stream():  # type: ignore[no-untyped-call]
+            if doc.reference.path in keep:
+                continue
+
+            writer.delete(doc.reference)
+            deleted += 1
+
+            if deleted % PROGRESS_INTERVAL == 0:
+                logger.info('Deleting documents, %d queued in %.1fs', deleted, time.monotonic() - start)
+
+    writer.close()
+    logger.info('Deleted %d documents in %.1fs', deleted, time.monotonic() - start)
+
+    return deleted
@@ -0,0 +1,151 @@
+import math
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import grpc  # type: ignore[import-untyped]
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+from google.cloud.firestore_v1.services.firestore import client as firestore_client
+from google.cloud.firestore_v1.services.firestore.transports.grpc import FirestoreGrpcTransport
+
+# Concurrent streams Google front ends accept on a single HTTP/2 connection
+MAX_STREAMS_PER_CHANNEL = 100
+
+
+def channels_for(concurrency: int) -> int:
+    return max(1, math.ceil(concurrency / MAX_STREAMS_PER_CHANNEL))
+
+
+@dataclass(slots=True)
+class ChannelStats:
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    calls: int = 0
+
+
+class _PooledMultiCallable:
+    def __init__(self, pool: 'ChannelPool', callables: list[Any]) -> None:
+        self.pool = pool
+        self.callables = callables
+
+    def _invoke(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:  # noqa: ANN401
+        idx = self.pool.acquire()
+        try:
+            result = getattr(self.callables[idx], method)(*args, **kwargs)
+        except BaseException:
+            self.pool.release(idx)
+            raise
+
+        # Streaming calls and futures are still in flight when they are returned
+        if isinstance(result, grpc.Future):
+            result.add_done_callback(lambda _: self.pool.release(idx))
+        else:
+            self.pool.release(idx)
+
+        return result
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._invoke('__call__', args, kwargs)
+
+    def with_call(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._invoke('with_call', args, kwargs)
+
+    def future(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._invoke('future', args, kwargs)
+
+
+# Spreads the RPCs of a client over several channels, each one its own HTTP/2 connection, sending every call
+# to a channel with the fewest calls in flight
+class ChannelPool(grpc.Channel):  # type: ignore[misc]
+    def __init__(self, channels: Sequence[grpc.Channel]) -> None:
+        self.channels = list(channels)
+        self.lock = threading.Lock()
+        self.stats = [ChannelStats() for _ in self.channels]
+        # Where the search for the least busy channel starts, so idle channels take turns
+        self.next = 0
+
+    def acquire(self) -> int:
+        with self.lock:
+            count = len(self.stats)
+            order = [(self.next + i) % count for i in range(count)]
+            self.next = (self.next + 1) % count
+            idx = min(order, key=lambda i: self.stats[i].in_flight)
+            stats = self.stats[idx]
+            stats.in_flight += 1
+            stats.calls += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+        return idx
+
+    def release(self, idx: int) -> None:
+        with self.lock:
+            self.stats[idx].in_flight -= 1
+
+    def snapshot(self) -> list[ChannelStats]:
+        with self.lock:
+            return [ChannelStats(s.in_flight, s.peak_in_flight, s.calls) for s in self.stats]
+
+    def _pooled(self, kind: str, method: str, *args: Any, **kwargs: Any) -> _PooledMultiCallable:  # noqa: ANN401
+        return _PooledMultiCallable(self, [getattr(channel, kind)(method, *args, **kwargs) for channel in self.channels])
+
+    def unary_unary(self, method: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._pooled('unary_unary', method, *args, **kwargs)
+
+    def unary_stream(self, method: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._pooled('unary_stream', method, *args, **kwargs)
+
+    def stream_unary(self, method: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._pooled('stream_unary', method, *args, **kwargs)
+
+    def stream_stream(self, method: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self._pooled('stream_stream', method, *args, **kwargs)
+
+    def subscribe(self, callback: Callable[[grpc.ChannelConnectivity], None], try_to_connect: bool = False) -> None:  # noqa: FBT001, FBT002
+        for channel in self.channels:
+            channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback: Callable[[grpc.ChannelConnectivity], None]) -> None:
+        for channel in self.channels:
+            channel.unsubscribe(callback)
+
+    def close(self) -> None:
+        for channel in self.channels:
+            channel.close()
+
+    def __enter__(self) -> 'ChannelPool':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+# Firestore client shared by the repositories of a process, talking to Firestore through a pool of channels.
+# The library builds a single channel with fixed options on first use, so the GAPIC client is built here
+# instead, with the pool as its channel.
+class PooledFirestoreClient(FirestoreClient):  # type: ignore[misc]
+    def __init__(self, database: str, channels: int, keepalive_time_ms: int, keepalive_timeout_ms: int) -> None:
+        super().__init__(database=database)
+
+        options = [
+            ('grpc.keepalive_time_ms', keepalive_time_ms),
+            ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+        ]
+        self.channel_pool = ChannelPool([self._create_channel(options) for _ in range(channels)])
+        self._transport = FirestoreGrpcTransport(host=self._target, channel=self.channel_pool)
+        self._firestore_api_internal = firestore_client.FirestoreClient(
+            transport=self._transport, client_options=self._client_options
+        )
+        firestore_client._client_info = self._client_info  # type: ignore[attr-defined] # noqa: SLF001
+
+    def _create_channel(self, options: list[tuple[str, Any]]) -> grpc.Channel:
+        if self._emulator_host is not None:
+            # Same as the library does for the emulator, which accepts any token
+            return grpc.insecure_channel(self._emulator_host, options=[('Authorization', 'Bearer owner'), *options])
+
+        return FirestoreGrpcTransport.create_channel(self._target, credentials=self._credentials, options=options)
+
+    # The library only closes its HTTP session, the channels are closed here
+    def close(self) -> None:
+        super().close()
+        self.channel_pool.close()
@@ -1,76 +1,160 @@
+import contextlib
 import logging
-from collections.abc import Generator  # pragma: no cover
-from dataclasses import asdict
-from enum import Enum
+from collections import defaultdict
+from collections.abc import Collection, Generator, Iterable, Sequence  # pragma: no cover
 from typing import Any, cast
 
-import dacite
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition
 from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
 from google.cloud.firestore import transactional
 from google.cloud.firestore_v1 import DocumentReference, DocumentSnapshot, Transaction
 from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
 
 from models import Client
 from repositories import ClientRepository
-from repositories.errors import DuplicateEmailError
+from repositories.errors import DuplicateEmailError, first_duplicate
 
+from .bulk import (
+    MAX_BATCH_WRITES,
+    MAX_IN_VALUES,
+    BatchWriter,
+    bulk_delete,
+    bulk_writer_options,
+    chunked,
+    find_existing,
+    find_existing_docs,
+)
 from .constants import UUID_UNASSIGNED
+from .converters import Converter
+from .keys import key_id
+
+CLIENT_CONVERTER = Converter(Client, exclude=('id',))
+
+
+def email_filter(emails: Sequence[str]) -> FieldFilter:
+    return FieldFilter('email_incidents', 'in', list(emails))  # type: ignore[no-untyped-call]
+
+
+# Client documents by e-mail, leaving out the e-mails shared by several clients
+def unique_by_email(docs: Iterable[DocumentSnapshot], logger: logging.Logger) -> dict[str, DocumentSnapshot]:
+    by_email = defaultdict[str, list[DocumentSnapshot]](list)
+    for doc in docs:
+        by_email[doc.get('email_incidents')].append(doc)
+
+    for email in [email for email, matches in by_email.items() if len(matches) > 1]:
+        logger.error('Multiple clients found with email %s', email)
+        del by_email[email]
+
+    return {email: matches[0] for email, matches in by_email.items()}
 
 
 class FirestoreClientRepository(ClientRepository):
-    def __init__(self, database: str) -> None:
-        self.db = FirestoreClient(database=database)
+    def __init__(
+        self,
+        db: FirestoreClient,
+        bulk_ops_per_second: int = 500,
+        bulk_max_ops_per_second: int = 10000,
+        *,
+        email_index_fallback: bool = True,
+    ) -> None:
+        self.db = db
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.bulk_options = bulk_writer_options(bulk_ops_per_second, bulk_max_ops_per_second)
+        # Turned off once every client has a key document, e-mails without one are then unknown
+        self.email_index_fallback = email_index_fallback
 
     def doc_to_client(self, doc: DocumentSnapshot) -> Client:
-        return dacite.from_dict(
-            data_class=Client,
-            data={
+        return CLIENT_CONVERTER.from_dict(
+            {
                 # Can never be None, as it's a Firestore DocumentSnapshot and therefore always exists
                 **cast(dict[str, Any], doc.to_dict()),
                 'id': doc.id,
             },
-            config=dacite.Config(cast=[Enum]),
         )
 
-    def _find_by_email(self, email: str, transaction: Transaction | None = None) -> DocumentSnapshot | None:
-        docs = (
-            self.db.collection('clients')
-            .where(filter=FieldFilter('email_incidents', '==', email))  # type: ignore[no-untyped-call]
-            .get(transaction=transaction)
-        )
+    # Clients are indexed by incident e-mail in client_emails/{email}, which holds the id of the client
+    def _email_ref(self, email: str) -> DocumentReference:
+        return cast(DocumentReference, self.db.collection('client_emails').document(key_id(email)))
 
-        if len(docs) == 0:
-            return None
+    # Instances deployed before the index keep writing clients without a key document until the rollout ends.
+    # Until the backfill runs again after it and EMAIL_INDEX_FALLBACK is turned off, e-mails without a key fall
+    # back to querying the clients, and the clients found are indexed.
+    def _find_unindexed_by_email(self, emails: Collection[str]) -> dict[str, Client]:
+        if not self.email_index_fallback or not emails:
+            return {}
 
-        if len(docs) > 1:
-            self.logger.error('Multiple clients found with email %s', email)
-            return None
+        docs: list[DocumentSnapshot] = []
+        for chunk in chunked(sorted(emails), MAX_IN_VALUES):
+            docs.extend(self.db.collection('clients').where(filter=email_filter(chunk)).stream())
+
+        found: dict[str, Client] = {}
+        for email, doc in unique_by_email(docs, self.logger).items():
+            # A client created with the same e-mail in the meantime keeps its key
+            with contextlib.suppress(AlreadyExists):
+                self._email_ref(email).create({'id': doc.id})
+
+            found[email] = self.doc_to_client(doc)
+
+        return found
 
-        return cast(DocumentSnapshot, docs[0])
+    # Clients without a key document are not caught by the create precondition
+    def _check_unindexed_duplicates(self, emails: list[str]) -> None:
+        if not self.email_index_fallback:
+            return
+
+        existing = find_existing(self.db.collection('clients'), 'email_incidents', emails)
+        if existing:
+            raise DuplicateEmailError(min(existing))
 
     def find_by_email(self, email: str) -> Client | None:
-        doc = self._find_by_email(email)
+        key_doc = self._email_ref(email).get()
+        if not key_doc.exists:
+            return self._find_unindexed_by_email([email]).get(email)
 
-        if doc is None:
+        doc = self.db.collection('clients').document(key_doc.get('id')).get()
+        if not doc.exists or doc.get('email_incidents') != email:
+            self.logger.error('Stale e-mail index entry for %s', email)
             return None
 
         return self.doc_to_client(doc)
 
     def create(self, client: Client) -> None:
-        client_dict = asdict(client)
-        del client_dict['id']
+        client_dict = CLIENT_CONVERTER.to_dict(client)
+        self._check_unindexed_duplicates([client.email_incidents])
 
-        client_ref = self.db.collection('clients').document(client.id)
+        # Creating the e-mail key fails if it already exists, which makes the whole batch fail
+        batch = self.db.batch()
+        batch.create(self._email_ref(client.email_incidents), {'id': client.id})
+        batch.create(self.db.collection('clients').document(client.id), client_dict)
 
-        @transactional  # type: ignore[misc]
-        def create_client_transaction(transaction: Transaction, client_dict_trans: dict[str, Any]) -> None:
-            if self._find_by_email(client_dict_trans['email_incidents'], transaction) is not None:
-                raise DuplicateEmailError(client_dict_trans['email_incidents'])
+        try:
+            batch.commit()
+        except AlreadyExists as err:
+            raise DuplicateEmailError(client.email_incidents) from err
+
+    # Writes many clients in a few batches, which unlike create is not atomic as a whole
+    def create_many(self, clients: list[Client]) -> None:
+        emails = [client.email_incidents for client in clients]
+
+        duplicate = first_duplicate(emails)
+        if duplicate is not None:
+            raise DuplicateEmailError(duplicate)
+
+        key_refs = {self._email_ref(email).path: email for email in emails}
+        existing = find_existing_docs(self.db, [self.db.document(path) for path in key_refs])
+        if existing:
+            raise DuplicateEmailError(key_refs[min(existing)])
+
+        self._check_unindexed_duplicates(emails)
 
-            transaction.create(client_ref, client_dict_trans)
+        writer = BatchWriter(self.db)
+        for client in clients:
+            client_dict = CLIENT_CONVERTER.to_dict(client)
+            writer.next().create(self._email_ref(client.email_incidents), {'id': client.id})
+            writer.next().create(self.db.collection('clients').document(client.id), client_dict)
 
-        create_client_transaction(self.db.transaction(), client_dict)
+        writer.commit()
 
     def get(self, client_id: str) -> Client | None:
         if client_id == UUID_UNASSIGNED:
@@ -83,18 +167,140 @@ class FirestoreClientRepository(ClientRepository):
 
         return self.doc_to_client(client_doc)
 
+    def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        refs = [
+            self.db.collection('clients').document(client_id) for client_id in set(client_ids) if client_id != UUID_UNASSIGNED
+        ]
+        if not refs:
+            return {}
+
+        # A single multi-document read, whatever the number of ids
+        return {doc.id: self.doc_to_client(doc) for doc in self.db.get_all(refs) if doc.exists}
+
+    def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        key_refs = {self._email_ref(email).path: email for email in set(emails)}
+        if not key_refs:
+            return {}
+
+        key_docs = self.db.get_all([self.db.document(path) for path in key_refs])
+        ids = {key_refs[key_doc.reference.path]: key_doc.get('id') for key_doc in key_docs if key_doc.exists}
+        clients = self.get_many(list(ids.values()))
+
+        found = self._find_unindexed_by_email(set(key_refs.values()) - ids.keys())
+        for email, client_id in ids.items():
+            client = clients.get(client_id)
+            if client is None or client.email_incidents != email:
+                self.logger.error('Stale e-mail index entry for %s', email)
+                continue
+
+            found[email] = client
+
+        return found
+
     def update(self, client: Client) -> None:
-        client_dict = asdict(client)
-        del client_dict['id']
+        client_dict = CLIENT_CONVERTER.to_dict(client)
+
+        client_ref = self.db.collection('clients').document(client.id)
+        email_ref = self._email_ref(client.email_incidents)
+
+        # When the e-mail is the same, e.g. a plan change, the key stays and a write conditioned on the document
+        # not having changed since it was read is enough
+        old = client_ref.get()
+        if old.exists and old.get('email_incidents') == client.email_incidents:
+            with contextlib.suppress(FailedPrecondition):
+                client_ref.update(client_dict, option=self.db.write_option(last_update_time=old.update_time))
+                return
+
+        @transactional  # type: ignore[misc]
+        def update_client_transaction(transaction: Transaction) -> None:
+            old = client_ref.get(transaction=transaction)
+            old_email = old.get('email_incidents') if old.exists else None
+
+            if old_email != client.email_incidents:
+                key_doc = email_ref.get(transaction=transaction)
+                if key_doc.exists and key_doc.get('id') != client.id:
+                    raise DuplicateEmailError(client.email_incidents)
 
-        self.db.collection('clients').document(client.id).set(client_dict)
+                if old_email is not None:
+                    transaction.delete(self._email_ref(old_email))
+                transaction.set(email_ref, {'id': client.id})
+
+            transaction.set(client_ref, client_dict)
+
+        update_client_transaction(self.db.transaction())
 
     def get_all(self) -> Generator[Client, None, None]:
         stream: Generator[DocumentSnapshot, None, None] = self.db.collection('clients').order_by('name').stream()
         for doc in stream:
             yield self.doc_to_client(doc)
 
+    def delete(self, client_id: str) -> None:
+        client_ref = self.db.collection('clients').document(client_id)
+
+        @transactional  # type: ignore[misc]
+        def delete_client_transaction(transaction: Transaction) -> None:
+            doc = client_ref.get(transaction=transaction)
+            if not doc.exists:
+                return
+
+            transaction.delete(client_ref)
+            transaction.delete(self._email_ref(doc.get('email_incidents')))
+
+        delete_client_transaction(self.db.transaction())
+
     def delete_all(self) -> None:
-        stream: Generator[DocumentSnapshot, None, None] = self.db.collection('clients').stream()
-        for client in stream:
-            cast(DocumentReference, client.reference).delete()
+        # The placeholder of unassigned employees is created once per process, so it must survive a reset
+        placeholder = self.db.collection('clients').document(UUID_UNASSIGNED).path
+        bulk_delete(
+            self.db,
+            [self.db.collection('clients'), self.db.collection('client_emails')],
+            self.bulk_options,
+            self.logger,
+            keep={placeholder},
+        )
+
+    # Creates the missing e-mail index entries of clients written before the index existed. It processes the
+    # clients in pages ordered by id and returns the id of the last one, so an interrupted run can be resumed
+    # by passing it as start_after.
+    def backfill_email_index(self, page_size: int = MAX_BATCH_WRITES, start_after: str | None = None) -> str | None:
+        query = self.db.collection('clients').order_by(FieldPath.document_id()).select(['email_incidents']).limit(page_size)  # type: ignore[no-untyped-call]
+        indexed = 0
+
+        while True:
+            page = query
+            if start_after is not None:
+                page = query.start_after({FieldPath.document_id(): self.db.collection('clients').document(start_after)})  # type: ignore[no-untyped-call]
+
+            docs: list[DocumentSnapshot] = list(page.stream())
+            if not docs:
+                break
+
+            # The placeholder of unassigned employees has no e-mail
+            emails = {doc.id: cast(dict[str, Any], doc.to_dict()).get('email_incidents') for doc in docs}
+            key_refs = {email: self._email_ref(email) for email in emails.values() if email is not None}
+            key_docs = self.db.get_all(list(key_refs.values()))
+            ids = {key_doc.reference.path: key_doc.get('id') for key_doc in key_docs if key_doc.exists}
+
+            batch = self.db.batch()
+            for client_id, email in emails.items():
+                if email is None:
+                    continue
+
+                key_ref = key_refs[email]
+                if key_ref.path not in ids:
+                    batch.set(key_ref, {'id': client_id})
+                    ids[key_ref.path] = client_id
+                elif ids[key_ref.path] != client_id:
+                    self.logger.error('Multiple clients found with email %s', email)
+
+            if len(batch) > 0:
+                batch.commit()
+
+            indexed += len(batch)
+            start_after = docs[-1].id
+            self.logger.info('Indexed %d client e-mails, resume after %s', indexed, start_after)
+
+            if len(docs) < page_size:
+                break
+
+        return start_after
@@ -0,0 +1,87 @@
+import dataclasses
+import types
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, TypeVar, Union, get_args, get_origin, get_type_hints
+
+T = TypeVar('T')
+
+# Field types stored as they are, checked with isinstance when reading
+PLAIN_TYPES: tuple[type, ...] = (str, int, float, bool, datetime)
+
+
+class ConversionError(ValueError):
+    pass
+
+
+def _unwrap_optional(field_type: Any) -> tuple[Any, bool]:  # noqa: ANN401
+    if get_origin(field_type) in (Union, types.UnionType):
+        args = [arg for arg in get_args(field_type) if arg is not type(None)]
+        if len(args) == 1 and len(get_args(field_type)) == 2:  # noqa: PLR2004
+            return args[0], True
+
+    return field_type, False
+
+
+# Converts dataclass instances from and to Firestore document dicts. The conversion functions are generated
+# once per dataclass from its fields, instead of inspecting the types of every document like dacite does.
+class Converter(Generic[T]):
+    def __init__(self, cls: type[T], exclude: Iterable[str] = ()) -> None:
+        if not dataclasses.is_dataclass(cls):
+            raise TypeError(f'{cls.__name__} is not a dataclass')
+
+        self.cls = cls
+        # Fields kept out of the document, like the id, which is the name of the document
+        self.exclude = frozenset(exclude)
+        hints = get_type_hints(cls)
+        fields = dataclasses.fields(cls)
+
+        unknown = self.exclude - {field.name for field in fields}
+        if unknown:
+            raise TypeError(f'{cls.__name__} has no fields {sorted(unknown)}')
+
+        namespace: dict[str, Any] = {'cls': cls, 'ConversionError': ConversionError}
+        lines = ['def from_dict(data):']
+        for idx, field in enumerate(fields):
+            field_type, optional = _unwrap_optional(hints[field.name])
+            value = f'v{idx}'
+            namespace[f't{idx}'] = field_type
+
+            if optional:
+                lines.append(f'    {value} = data.get({field.name!r})')
+                lines.append(f'    if {value} is not None:')
+                indent = '        '
+            else:
+                lines.append(f'    {value} = data[{field.name!r}]')
+                indent = '    '
+
+            if isinstance(field_type, type) and issubclass(field_type, Enum):
+                lines.append(f'{indent}{value} = t{idx}({value})')
+            elif field_type in PLAIN_TYPES:
+                namespace[f'm{idx}'] = f'Field {field.name} of {cls.__name__} is not a {field_type.__name__}'
+                lines.append(f'{indent}if not isinstance({value}, t{idx}):')
+                lines.append(f'{indent}    raise ConversionError(m{idx})')
+            else:
+                raise TypeError(f'Unsupported type {hints[field.name]} of field {cls.__name__}.{field.name}')
+
+        args = ', '.join(f'{field.name}=v{idx}' for idx, field in enumerate(fields))
+        lines.append(f'    return cls({args})')
+
+        items = ', '.join(f'{field.name!r}: obj.{field.name}' for field in fields if field.name not in self.exclude)
+        lines.append('def to_dict(obj):')
+        lines.append(f'    return {{{items}}}')
+
+        exec('\n'.join(lines), namespace)  # noqa: S102
+        self._from_dict: Callable[[dict[str, Any]], T] = namespace['from_dict']
+        self._to_dict: Callable[[T], dict[str, Any]] = namespace['to_dict']
+
+    def from_dict(self, data: dict[str, Any]) -> T:
+        try:
+            return self._from_dict(data)
+        except KeyError as err:
+            raise ConversionError(f'Missing field {err.args[0]} of {self.cls.__name__}') from err
+
+    # Same as dataclasses.asdict without the excluded fields, enums are kept as they are
+    def to_dict(self, obj: T) -> dict[str, Any]:
+        return self._to_dict(obj)
@@ -1,44 +1,103 @@
 import contextlib
 import logging
 import secrets
+import threading
+from collections import Counter, defaultdict
 from collections.abc import Generator
-from dataclasses import asdict
-from enum import Enum
 from typing import Any, cast
 
-import dacite
 from google.api_core.exceptions import AlreadyExists
 from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
 from google.cloud.firestore import transactional
 from google.cloud.firestore_v1 import CollectionReference, DocumentReference, DocumentSnapshot, Query, Transaction
-from google.cloud.firestore_v1.base_aggregation import AggregationResult
 from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.transforms import Increment
 
-from models import Employee
-from repositories import DuplicateEmailError, EmployeeRepository
+from models import Employee, EmployeeSummary, InvitationStatus, Role
+from repositories import DuplicateEmailError, EmployeeCursor, EmployeeRepository
+from repositories.cached import TTLCache
+from repositories.errors import first_duplicate
 
+from .bulk import MAX_BATCH_WRITES, BatchWriter, bulk_delete, bulk_writer_options, find_existing, find_existing_docs
 from .constants import UUID_UNASSIGNED
+from .converters import Converter
+from .keys import key_id
+
+EMPLOYEE_CONVERTER = Converter(Employee, exclude=('id', 'client_id'))
+SUMMARY_CONVERTER = Converter(EmployeeSummary, exclude=('id', 'client_id'))
+# Document fields read for listings, which leave out the password hash
+SUMMARY_FIELDS = [field for field in EmployeeSummary.__dataclass_fields__ if field not in SUMMARY_CONVERTER.exclude]
+
+
+def parent_client_id(doc: DocumentSnapshot) -> str:
+    return str(cast(DocumentReference, cast(CollectionReference, cast(DocumentReference, doc.reference).parent).parent).id)
+
+
+# Fields of an employee document, plus the ones stored in its path
+def doc_data(doc: DocumentSnapshot) -> dict[str, Any]:
+    client_id: str | None = parent_client_id(doc)
+    if client_id == UUID_UNASSIGNED:
+        client_id = None
+
+    return {
+        **cast(dict[str, Any], doc.to_dict()),
+        'id': doc.id,
+        'client_id': client_id,
+    }
 
 
 class FirestoreEmployeeRepository(EmployeeRepository):
-    def __init__(self, database: str) -> None:
-        self.db = FirestoreClient(database=database)
+    def __init__(  # noqa: PLR0913
+        self,
+        db: FirestoreClient,
+        agent_pool_max_size: int = 1024,
+        agent_pool_ttl: float = 60,
+        counter_shards: int = 5,
+        bulk_ops_per_second: int = 500,
+        bulk_max_ops_per_second: int = 10000,
+        *,
+        email_index_fallback: bool = True,
+    ) -> None:
+        self.db = db
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.bulk_options = bulk_writer_options(bulk_ops_per_second, bulk_max_ops_per_second)
+        # Turned off once every employee has a key document, e-mails without one are then unknown
+        self.email_index_fallback = email_index_fallback
+        # Employees per client are counted in several shards, so concurrent writes don't contend on a single document
+        self.counter_shards = counter_shards
+        # Ids of the accepted agents of each client, used to pick a random agent
+        self.agent_pools: TTLCache[str, tuple[str, ...]] = TTLCache(agent_pool_max_size, agent_pool_ttl)
+        # The parent document of unassigned employees only has to be written once per process
+        self.placeholder_lock = threading.Lock()
+        self.placeholder_ready = False
+        self.placeholder_writes = 0
 
     def doc_to_employee(self, doc: DocumentSnapshot) -> Employee:
-        client_id = cast(DocumentReference, cast(CollectionReference, cast(DocumentReference, doc.reference).parent).parent).id
-        if client_id == UUID_UNASSIGNED:
-            client_id = None
-
-        return dacite.from_dict(
-            data_class=Employee,
-            data={
-                **cast(dict[str, Any], doc.to_dict()),
-                'id': doc.id,
-                'client_id': client_id,
-            },
-            config=dacite.Config(cast=[Enum]),
-        )
+        return EMPLOYEE_CONVERTER.from_dict(doc_data(doc))
+
+    def doc_to_summary(self, doc: DocumentSnapshot) -> EmployeeSummary:
+        return SUMMARY_CONVERTER.from_dict(doc_data(doc))
+
+    def _ensure_placeholder(self) -> None:
+        if self.placeholder_ready:
+            return
+
+        with self.placeholder_lock:
+            if self.placeholder_ready:
+                return
+
+            self.placeholder_writes += 1
+            with contextlib.suppress(AlreadyExists):
+                self.db.collection('clients').document(UUID_UNASSIGNED).create({})
+
+            self.placeholder_ready = True
+
+    def _counter_shards_ref(self, client_id: str) -> CollectionReference:
+        return cast(CollectionReference, self.db.collection('clients').document(client_id).collection('employee_counters'))
+
+    def _random_counter_shard(self, client_id: str) -> DocumentReference:
+        return self._counter_shards_ref(client_id).document(str(secrets.randbelow(self.counter_shards)))
 
     def get(self, employee_id: str, client_id: str | None) -> Employee | None:
         if client_id is None:
@@ -53,9 +112,27 @@ class FirestoreEmployeeRepository(EmployeeRepository):
 
         return self.doc_to_employee(doc)
 
-    def get_all(self, client_id: str, offset: int | None, limit: int | None) -> Generator[Employee, None, None]:
+    def get_many(self, keys: list[tuple[str | None, str]]) -> dict[tuple[str | None, str], Employee]:
+        refs = [self._employee_ref(employee_id, client_id) for client_id, employee_id in set(keys)]
+        if not refs:
+            return {}
+
+        # A single multi-document read, whatever the number of keys
+        employees = (self.doc_to_employee(doc) for doc in self.db.get_all(refs) if doc.exists)
+        return {(employee.client_id, employee.id): employee for employee in employees}
+
+    def get_all(
+        self, client_id: str, offset: int | None, limit: int | None, start_after: EmployeeCursor | None = None
+    ) -> Generator[EmployeeSummary, None, None]:
         employees_ref = cast(CollectionReference, self.db.collection('clients').document(client_id).collection('employees'))
-        query = employees_ref.order_by('invitation_date', direction=Query.DESCENDING)
+        query = employees_ref.order_by('invitation_date', direction=Query.DESCENDING).order_by(
+            FieldPath.document_id(),  # type: ignore[no-untyped-call]
+            direction=Query.DESCENDING,
+        )
+
+        if start_after is not None:
+            invitation_date, employee_id = start_after
+            query = query.start_after({'invitation_date': invitation_date, FieldPath.document_id(): employee_id})  # type: ignore[no-untyped-call]
 
         if offset is not None:
             query = query.offset(offset)
@@ -63,14 +140,26 @@ class FirestoreEmployeeRepository(EmployeeRepository):
         if limit is not None:
             query = query.limit(limit)
 
-        docs = query.stream()
+        docs = query.select(SUMMARY_FIELDS).stream()
         for doc in docs:
-            yield self.doc_to_employee(doc)
+            yield self.doc_to_summary(doc)
 
-    def _find_by_email(self, email: str, transaction: Transaction | None = None) -> DocumentSnapshot | None:
-        docs = (
-            self.db.collection_group('employees').where(filter=FieldFilter('email', '==', email)).get(transaction=transaction)  # type: ignore[no-untyped-call]
-        )
+    # Employees are indexed by e-mail in employee_emails/{email}, which holds the path of the employee document
+    def _email_ref(self, email: str) -> DocumentReference:
+        return cast(DocumentReference, self.db.collection('employee_emails').document(key_id(email)))
+
+    def _employee_ref(self, employee_id: str, client_id: str | None) -> DocumentReference:
+        client_ref = self.db.collection('clients').document(UUID_UNASSIGNED if client_id is None else client_id)
+        return cast(CollectionReference, client_ref.collection('employees')).document(employee_id)
+
+    # Instances deployed before the index keep writing employees without a key document until the rollout ends.
+    # Until the backfill runs again after it and EMAIL_INDEX_FALLBACK is turned off, a missing key falls back to
+    # querying by e-mail and indexes the employee it finds.
+    def _find_unindexed_by_email(self, email: str) -> DocumentSnapshot | None:
+        if not self.email_index_fallback:
+            return None
+
+        docs = self.db.collection_group('employees').where(filter=FieldFilter('email', '==', email)).get()  # type: ignore[no-untyped-call]
 
         if len(docs) == 0:
             return None
@@ -79,7 +168,33 @@ class FirestoreEmployeeRepository(EmployeeRepository):
             self.logger.error('Multiple employees found with email %s', email)
             return None
 
-        return cast(DocumentSnapshot, docs[0])
+        doc = cast(DocumentSnapshot, docs[0])
+        # An employee created with the same e-mail in the meantime keeps its key
+        with contextlib.suppress(AlreadyExists):
+            self._email_ref(email).create({'path': doc.reference.path})
+
+        return doc
+
+    # The key document only guards against employees that have one, so the unindexed ones are queried too
+    def _check_unindexed_duplicates(self, emails: list[str]) -> None:
+        if not self.email_index_fallback:
+            return
+
+        existing = find_existing(self.db.collection_group('employees'), 'email', emails)
+        if existing:
+            raise DuplicateEmailError(min(existing))
+
+    def _find_by_email(self, email: str) -> DocumentSnapshot | None:
+        key_doc = self._email_ref(email).get()
+        if not key_doc.exists:
+            return self._find_unindexed_by_email(email)
+
+        doc = cast(DocumentReference, self.db.document(key_doc.get('path'))).get()
+        if not doc.exists or doc.get('email') != email:
+            self.logger.error('Stale e-mail index entry for %s', email)
+            return None
+
+        return doc
 
     def find_by_email(self, email: str) -> Employee | None:
         doc = self._find_by_email(email)
@@ -90,65 +205,274 @@ class FirestoreEmployeeRepository(EmployeeRepository):
         return self.doc_to_employee(doc)
 
     def create(self, employee: Employee) -> None:
-        employee_dict = asdict(employee)
-        del employee_dict['id']
-        del employee_dict['client_id']
+        employee_dict = EMPLOYEE_CONVERTER.to_dict(employee)
 
         client_id = UUID_UNASSIGNED if employee.client_id is None else employee.client_id
 
-        client_ref = self.db.collection('clients').document(UUID_UNASSIGNED)
-        with contextlib.suppress(AlreadyExists):
-            client_ref.create({})
+        self._check_unindexed_duplicates([employee.email])
+        self._ensure_placeholder()
 
-        client_ref = self.db.collection('clients').document(client_id)
-        employee_ref = cast(CollectionReference, client_ref.collection('employees')).document(employee.id)
+        employee_ref = self._employee_ref(employee.id, employee.client_id)
+
+        # Creating the e-mail key fails if it already exists, which makes the whole batch fail
+        batch = self.db.batch()
+        batch.create(self._email_ref(employee.email), {'path': employee_ref.path})
+        batch.create(employee_ref, employee_dict)
+        batch.set(self._random_counter_shard(client_id), {'count': Increment(1)}, merge=True)
+
+        try:
+            batch.commit()
+        except AlreadyExists as err:
+            raise DuplicateEmailError(employee.email) from err
+
+        if employee.client_id is not None:
+            self.agent_pools.pop(employee.client_id)
+
+    # Writes many employees in a few batches, which unlike create is not atomic as a whole
+    def create_many(self, employees: list[Employee]) -> None:
+        emails = [employee.email for employee in employees]
+
+        duplicate = first_duplicate(emails)
+        if duplicate is not None:
+            raise DuplicateEmailError(duplicate)
+
+        key_refs = {self._email_ref(email).path: email for email in emails}
+        existing = find_existing_docs(self.db, [self.db.document(path) for path in key_refs])
+        if existing:
+            raise DuplicateEmailError(key_refs[min(existing)])
+
+        self._check_unindexed_duplicates(emails)
+        self._ensure_placeholder()
+
+        writer = BatchWriter(self.db)
+        counts = Counter[str]()
+        for employee in employees:
+            employee_dict = EMPLOYEE_CONVERTER.to_dict(employee)
+
+            client_id = UUID_UNASSIGNED if employee.client_id is None else employee.client_id
+            employee_ref = self._employee_ref(employee.id, employee.client_id)
+            writer.next().create(self._email_ref(employee.email), {'path': employee_ref.path})
+            writer.next().create(employee_ref, employee_dict)
+            counts[client_id] += 1
+
+        for client_id, count in counts.items():
+            writer.next().set(self._random_counter_shard(client_id), {'count': Increment(count)}, merge=True)
+
+        # Dropped once written, a pool rebuilt before would be cached without the new agents. The batches that
+        # committed before a failed one are written too.
+        try:
+            writer.commit()
+        finally:
+            for client_id in counts:
+                self.agent_pools.pop(client_id)
+
+    # The e-mail is not checked again, as the employee keeps it while moving
+    def move(self, employee: Employee, from_client_id: str | None) -> bool:
+        employee_dict = EMPLOYEE_CONVERTER.to_dict(employee)
+
+        from_id = UUID_UNASSIGNED if from_client_id is None else from_client_id
+        to_id = UUID_UNASSIGNED if employee.client_id is None else employee.client_id
+        if to_id == UUID_UNASSIGNED:
+            self._ensure_placeholder()
+
+        from_ref = self._employee_ref(employee.id, from_id)
+        to_ref = self._employee_ref(employee.id, to_id)
 
         @transactional  # type: ignore[misc]
-        def create_employee_transaction(transaction: Transaction, employee_dict_trans: dict[str, Any]) -> None:
-            if self._find_by_email(employee_dict_trans['email'], transaction) is not None:
-                raise DuplicateEmailError(employee_dict_trans['email'])
+        def move_employee_transaction(transaction: Transaction) -> bool:
+            if not from_ref.get(transaction=transaction).exists:
+                return False
+
+            if from_id != to_id:
+                transaction.delete(from_ref)
+                transaction.set(self._email_ref(employee.email), {'path': to_ref.path})
+                transaction.set(self._random_counter_shard(from_id), {'count': Increment(-1)}, merge=True)
+                transaction.set(self._random_counter_shard(to_id), {'count': Increment(1)}, merge=True)
 
-            transaction.create(employee_ref, employee_dict_trans)
+            transaction.set(to_ref, employee_dict)
+            return True
 
-        create_employee_transaction(self.db.transaction(), employee_dict)
+        moved = cast(bool, move_employee_transaction(self.db.transaction()))
+        self.agent_pools.pop(from_id)
+        self.agent_pools.pop(to_id)
+        return moved
 
     def delete(self, employee_id: str, client_id: str | None) -> None:
         if client_id is None:
             client_id = UUID_UNASSIGNED
 
-        client_ref = self.db.collection('clients').document(client_id)
-        employee_ref = cast(CollectionReference, client_ref.collection('employees')).document(employee_id)
+        employee_ref = self._employee_ref(employee_id, client_id)
 
-        employee_ref.delete()
+        @transactional  # type: ignore[misc]
+        def delete_employee_transaction(transaction: Transaction) -> None:
+            doc = employee_ref.get(transaction=transaction)
+            if not doc.exists:
+                return
+
+            transaction.delete(employee_ref)
+            transaction.delete(self._email_ref(doc.get('email')))
+            transaction.set(self._random_counter_shard(client_id), {'count': Increment(-1)}, merge=True)
+
+        delete_employee_transaction(self.db.transaction())
+        self.agent_pools.pop(client_id)
 
     def delete_all(self) -> None:
-        stream: Generator[DocumentSnapshot, None, None] = self.db.collection_group('employees').stream()
-        for e in stream:
-            cast(DocumentReference, e.reference).delete()
+        bulk_delete(
+            self.db,
+            [
+                self.db.collection_group('employees'),
+                self.db.collection_group('employee_counters'),
+                self.db.collection('employee_emails'),
+            ],
+            self.bulk_options,
+            self.logger,
+        )
+        self.agent_pools.clear()
 
     def count(self, client_id: str) -> int:
-        client_ref = self.db.collection('clients').document(client_id)
-        employees_ref = cast(CollectionReference, client_ref.collection('employees'))
-        result = cast(AggregationResult, employees_ref.count().get()[0][0])  # type: ignore[no-untyped-call]
-        return int(result.value)
+        shards = list(self._counter_shards_ref(client_id).stream())
+        if shards:
+            return sum(int(shard.get('count')) for shard in shards)
+
+        # Clients whose employees were written before the counters have none. Their employees are counted by an
+        # aggregation, which seeds the first shard so the next count reads the shards. Writes by instances of the
+        # previous version are not counted, reconcile_counts fixes the counters once the rollout is over.
+        employees_ref = self.db.collection('clients').document(client_id).collection('employees')
+        count = int(employees_ref.count().get()[0][0].value)
+        if count > 0:
+            with contextlib.suppress(AlreadyExists):
+                self._counter_shards_ref(client_id).document('0').create({'count': count})
+
+        return count
+
+    # Recomputes the employee counters of every client from the employee documents. Writes racing with the
+    # reconciliation may be lost, so it should run while the service is idle, and after every instance of a
+    # version without the counters is gone.
+    def reconcile_counts(self) -> dict[str, int]:
+        counts = Counter[str]()
+        employees: Generator[DocumentSnapshot, None, None] = (
+            self.db.collection_group('employees').select([FieldPath.document_id()]).stream()  # type: ignore[no-untyped-call]
+        )
+        for doc in employees:
+            counts[parent_client_id(doc)] += 1
 
-    def get_agents_by_client(self, client_id: str) -> list[Employee]:
+        # Clients whose employees are all gone still need their counters zeroed
+        shards: Generator[DocumentSnapshot, None, None] = (
+            self.db.collection_group('employee_counters').select([FieldPath.document_id()]).stream()  # type: ignore[no-untyped-call]
+        )
+        shard_ids = {str(shard) for shard in range(self.counter_shards)}
+        stale = defaultdict[str, list[DocumentReference]](list)
+        for doc in shards:
+            client_id = parent_client_id(doc)
+            counts[client_id] += 0
+
+            # Left by a higher EMPLOYEE_COUNTER_SHARDS, count() would still add them up
+            if doc.id not in shard_ids:
+                stale[client_id].append(doc.reference)
+
+        batch = self.db.batch()
+        for idx, (client_id, count) in enumerate(counts.items()):
+            stale_refs = stale.get(client_id, [])
+            if len(batch) + self.counter_shards + len(stale_refs) > MAX_BATCH_WRITES:
+                batch.commit()
+                batch = self.db.batch()
+                self.logger.info('Reconciled employee counters of %d/%d clients', idx, len(counts))
+
+            for shard in range(self.counter_shards):
+                batch.set(self._counter_shards_ref(client_id).document(str(shard)), {'count': count if shard == 0 else 0})
+
+            for ref in stale_refs:
+                batch.delete(ref)
+
+        batch.commit()
+        self.logger.info('Reconciled employee counters of %d clients', len(counts))
+
+        return dict(counts)
+
+    # Creates the missing e-mail index entries of employees written before the index existed. It processes the
+    # employees in pages ordered by path and returns the path of the last one, so an interrupted run can be
+    # resumed by passing it as start_after.
+    def backfill_email_index(self, page_size: int = MAX_BATCH_WRITES, start_after: str | None = None) -> str | None:
+        query = self.db.collection_group('employees').order_by(FieldPath.document_id()).select(['email']).limit(page_size)  # type: ignore[no-untyped-call]
+        indexed = 0
+
+        while True:
+            page = query
+            if start_after is not None:
+                page = query.start_after({FieldPath.document_id(): self.db.document(start_after)})  # type: ignore[no-untyped-call]
+
+            docs: list[DocumentSnapshot] = list(page.stream())
+            if not docs:
+                break
+
+            # Employee path of every e-mail of the page that is already indexed
+            key_refs = {doc.get('email'): self._email_ref(doc.get('email')) for doc in docs}
+            key_docs = self.db.get_all(list(key_refs.values()))
+            paths = {key_doc.reference.path: key_doc.get('path') for key_doc in key_docs if key_doc.exists}
+
+            batch = self.db.batch()
+            for doc in docs:
+                key_ref = key_refs[doc.get('email')]
+                if key_ref.path not in paths:
+                    batch.set(key_ref, {'path': doc.reference.path})
+                    paths[key_ref.path] = doc.reference.path
+                elif paths[key_ref.path] != doc.reference.path:
+                    self.logger.error('Multiple employees found with email %s', doc.get('email'))
+
+            if len(batch) > 0:
+                batch.commit()
+
+            indexed += len(batch)
+            start_after = docs[-1].reference.path
+            self.logger.info('Indexed %d employee e-mails, resume after %s', indexed, start_after)
+
+            if len(docs) < page_size:
+                break
+
+        return start_after
+
+    def _agents_query(self, client_id: str) -> Query:
         # Obtain a reference to the client's collection of employees
         employees_ref = cast(CollectionReference, self.db.collection('clients').document(client_id).collection('employees'))
 
         # Query the employees collection for agents
-        query = employees_ref.where(filter=FieldFilter('role', '==', 'agent')).where(  # type: ignore[no-untyped-call]
+        return employees_ref.where(filter=FieldFilter('role', '==', 'agent')).where(  # type: ignore[no-untyped-call]
             filter=FieldFilter('invitation_status', '==', 'accepted')  # type: ignore[no-untyped-call]
         )
-        docs = query.stream()
 
-        return [self.doc_to_employee(doc) for doc in docs]
+    def get_agent_ids(self, client_id: str) -> tuple[str, ...]:
+        agent_ids = self.agent_pools.get(client_id)
+
+        if agent_ids is None:
+            generation = self.agent_pools.generation
+            docs = self._agents_query(client_id).select([FieldPath.document_id()]).stream()  # type: ignore[no-untyped-call]
+            agent_ids = tuple(doc.id for doc in docs)
+            self.agent_pools.put(client_id, agent_ids, generation)
 
-    def get_random_agent(self, client_id: str) -> Employee | None:
-        agents = self.get_agents_by_client(client_id)
+        return agent_ids
+
+    # Reads only the summary fields, without the password hash
+    def _get_summary(self, employee_id: str, client_id: str) -> EmployeeSummary | None:
+        doc = self._employee_ref(employee_id, client_id).get(field_paths=SUMMARY_FIELDS)
+
+        if not doc.exists:
+            return None
+
+        return self.doc_to_summary(doc)
+
+    def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
+        agent_ids = self.get_agent_ids(client_id)
 
         # If there are no agents, return None
-        if not agents:
+        if not agent_ids:
             return None
 
-        return secrets.choice(agents)
+        agent = self._get_summary(secrets.choice(agent_ids), client_id)
+        if agent is not None and agent.role == Role.AGENT and agent.invitation_status == InvitationStatus.ACCEPTED:
+            return agent
+
+        # The pool was changed by another instance, rebuild it
+        self.agent_pools.pop(client_id)
+        agent_ids = self.get_agent_ids(client_id)
+
+        return self._get_summary(secrets.choice(agent_ids), client_id) if agent_ids else None
@@ -0,0 +1,12 @@
+import re
+from urllib.parse import quote
+
+# Ids Firestore rejects even without slashes
+RESERVED_ID = re.compile(r'\.{0,2}|__.*__')
+
+
+# Document id of a unique key document. Ids can't contain slashes, so the value is percent-encoded. The few
+# values that are still reserved ids get a '%' that percent-encoding never leaves on its own.
+def key_id(value: str) -> str:
+    encoded = quote(value, safe='@+')
+    return f'%{encoded}' if RESERVED_ID.fullmatch(encoded) else encoded
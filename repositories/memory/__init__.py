@@ -0,0 +1,11 @@
+from .async_client import AsyncMemoryClientRepository
+from .async_employee import AsyncMemoryEmployeeRepository
+from .client import MemoryClientRepository
+from .employee import MemoryEmployeeRepository
+
+__all__ = [
+    'AsyncMemoryClientRepository',
+    'AsyncMemoryEmployeeRepository',
+    'MemoryClientRepository',
+    'MemoryEmployeeRepository',
+]
@@ -0,0 +1,22 @@
+from models import Client
+from repositories import AsyncClientRepository
+
+from .client import MemoryClientRepository
+
+
+# Shares the clients of the synchronous repository, which never waits on anything but its lock
+class AsyncMemoryClientRepository(AsyncClientRepository):
+    def __init__(self, repo: MemoryClientRepository) -> None:
+        self.repo = repo
+
+    async def get(self, client_id: str) -> Client | None:
+        return self.repo.get(client_id)
+
+    async def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        return self.repo.get_many(client_ids)
+
+    async def find_by_email(self, email: str) -> Client | None:
+        return self.repo.find_by_email(email)
+
+    async def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        return self.repo.find_many_by_email(emails)
@@ -0,0 +1,22 @@
+from models import Employee, EmployeeSummary
+from repositories import AsyncEmployeeRepository
+
+from .employee import EmployeeKey, MemoryEmployeeRepository
+
+
+# Shares the employees of the synchronous repository, which never waits on anything but its lock
+class AsyncMemoryEmployeeRepository(AsyncEmployeeRepository):
+    def __init__(self, repo: MemoryEmployeeRepository) -> None:
+        self.repo = repo
+
+    async def get(self, employee_id: str, client_id: str | None) -> Employee | None:
+        return self.repo.get(employee_id, client_id)
+
+    async def get_many(self, keys: list[EmployeeKey]) -> dict[EmployeeKey, Employee]:
+        return self.repo.get_many(keys)
+
+    async def find_by_email(self, email: str) -> Employee | None:
+        return self.repo.find_by_email(email)
+
+    async def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
+        return self.repo.get_random_agent(client_id)
@@ -0,0 +1,81 @@
+import copy
+import threading
+from collections.abc import Generator
+
+from models import Client
+from repositories import ClientRepository
+from repositories.errors import DuplicateEmailError, first_duplicate
+
+
+class MemoryClientRepository(ClientRepository):
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.clients: dict[str, Client] = {}
+        self.by_email: dict[str, str] = {}
+
+    def create(self, client: Client) -> None:
+        with self.lock:
+            if client.email_incidents in self.by_email:
+                raise DuplicateEmailError(client.email_incidents)
+
+            self.clients[client.id] = copy.copy(client)
+            self.by_email[client.email_incidents] = client.id
+
+    def create_many(self, clients: list[Client]) -> None:
+        emails = [client.email_incidents for client in clients]
+        with self.lock:
+            duplicate = first_duplicate(emails) or next((email for email in emails if email in self.by_email), None)
+            if duplicate is not None:
+                raise DuplicateEmailError(duplicate)
+
+            for client in clients:
+                self.clients[client.id] = copy.copy(client)
+                self.by_email[client.email_incidents] = client.id
+
+    def get(self, client_id: str) -> Client | None:
+        with self.lock:
+            client = self.clients.get(client_id)
+            return None if client is None else copy.copy(client)
+
+    def get_many(self, client_ids: list[str]) -> dict[str, Client]:
+        with self.lock:
+            return {client_id: copy.copy(self.clients[client_id]) for client_id in client_ids if client_id in self.clients}
+
+    def find_many_by_email(self, emails: list[str]) -> dict[str, Client]:
+        with self.lock:
+            return {email: copy.copy(self.clients[self.by_email[email]]) for email in emails if email in self.by_email}
+
+    def get_all(self) -> Generator[Client, None, None]:
+        with self.lock:
+            clients = sorted(self.clients.values(), key=lambda c: c.name)
+
+        for client in clients:
+            yield copy.copy(client)
+
+    def find_by_email(self, email: str) -> Client | None:
+        with self.lock:
+            client_id = self.by_email.get(email)
+            return None if client_id is None else copy.copy(self.clients[client_id])
+
+    def delete(self, client_id: str) -> None:
+        with self.lock:
+            client = self.clients.pop(client_id, None)
+            if client is not None and self.by_email.get(client.email_incidents) == client_id:
+                del self.by_email[client.email_incidents]
+
+    def delete_all(self) -> None:
+        with self.lock:
+            self.clients.clear()
+            self.by_email.clear()
+
+    def update(self, client: Client) -> None:
+        with self.lock:
+            if self.by_email.get(client.email_incidents, client.id) != client.id:
+                raise DuplicateEmailError(client.email_incidents)
+
+            old = self.clients.get(client.id)
+            if old is not None and self.by_email.get(old.email_incidents) == client.id:
+                del self.by_email[old.email_incidents]
+
+            self.clients[client.id] = copy.copy(client)
+            self.by_email[client.email_incidents] = client.id
@@ -0,0 +1,126 @@
+import bisect
+import copy
+import itertools
+import secrets
+import threading
+from collections.abc import Generator
+from datetime import datetime
+
+from models import Employee, EmployeeSummary, InvitationStatus, Role
+from repositories import DuplicateEmailError, EmployeeCursor, EmployeeRepository
+from repositories.errors import first_duplicate
+
+EmployeeKey = tuple[str | None, str]
+
+
+class MemoryEmployeeRepository(EmployeeRepository):
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.employees: dict[EmployeeKey, Employee] = {}
+
+        # Secondary indexes, all of them pointing to keys of self.employees
+        self.by_email: dict[str, EmployeeKey] = {}
+        self.by_client: dict[str | None, set[str]] = {}
+        self.by_role_status: dict[tuple[str | None, Role, InvitationStatus], set[str]] = {}
+        # Sorted ascending by (invitation_date, id), per client
+        self.by_invitation_date: dict[str | None, list[tuple[datetime, str]]] = {}
+
+    def _index(self, employee: Employee) -> None:
+        key = (employee.client_id, employee.id)
+        self.employees[key] = employee
+        self.by_email[employee.email] = key
+        self.by_client.setdefault(employee.client_id, set()).add(employee.id)
+        self.by_role_status.setdefault((employee.client_id, employee.role, employee.invitation_status), set()).add(employee.id)
+        bisect.insort(self.by_invitation_date.setdefault(employee.client_id, []), (employee.invitation_date, employee.id))
+
+    def _unindex(self, employee: Employee) -> None:
+        key = (employee.client_id, employee.id)
+        del self.employees[key]
+        del self.by_email[employee.email]
+        self.by_client[employee.client_id].discard(employee.id)
+        self.by_role_status[(employee.client_id, employee.role, employee.invitation_status)].discard(employee.id)
+
+        dates = self.by_invitation_date[employee.client_id]
+        del dates[bisect.bisect_left(dates, (employee.invitation_date, employee.id))]
+
+    def get(self, employee_id: str, client_id: str | None) -> Employee | None:
+        with self.lock:
+            employee = self.employees.get((client_id, employee_id))
+            return None if employee is None else copy.copy(employee)
+
+    def get_many(self, keys: list[EmployeeKey]) -> dict[EmployeeKey, Employee]:
+        with self.lock:
+            return {key: copy.copy(self.employees[key]) for key in keys if key in self.employees}
+
+    def get_all(
+        self, client_id: str, offset: int | None, limit: int | None, start_after: EmployeeCursor | None = None
+    ) -> Generator[EmployeeSummary, None, None]:
+        start = 0 if offset is None else offset
+        stop = None if limit is None else start + limit
+        with self.lock:
+            dates = self.by_invitation_date.get(client_id, [])
+            end = len(dates) if start_after is None else bisect.bisect_left(dates, start_after)
+            page = itertools.islice((dates[i] for i in range(end - 1, -1, -1)), start, stop)
+            employees = [self.employees[(client_id, employee_id)].to_summary() for _, employee_id in page]
+
+        yield from employees
+
+    def find_by_email(self, email: str) -> Employee | None:
+        with self.lock:
+            key = self.by_email.get(email)
+            return None if key is None else copy.copy(self.employees[key])
+
+    def create(self, employee: Employee) -> None:
+        with self.lock:
+            if employee.email in self.by_email:
+                raise DuplicateEmailError(employee.email)
+
+            self._index(copy.copy(employee))
+
+    def create_many(self, employees: list[Employee]) -> None:
+        emails = [employee.email for employee in employees]
+        with self.lock:
+            duplicate = first_duplicate(emails) or next((email for email in emails if email in self.by_email), None)
+            if duplicate is not None:
+                raise DuplicateEmailError(duplicate)
+
+            for employee in employees:
+                self._index(copy.copy(employee))
+
+    def move(self, employee: Employee, from_client_id: str | None) -> bool:
+        with self.lock:
+            current = self.employees.get((from_client_id, employee.id))
+            if current is None:
+                return False
+
+            self._unindex(current)
+            self._index(copy.copy(employee))
+            return True
+
+    def delete(self, employee_id: str, client_id: str | None) -> None:
+        with self.lock:
+            employee = self.employees.get((client_id, employee_id))
+            if employee is not None:
+                self._unindex(employee)
+
+    def delete_all(self) -> None:
+        with self.lock:
+            self.employees.clear()
+            self.by_email.clear()
+            self.by_client.clear()
+            self.by_role_status.clear()
+            self.by_invitation_date.clear()
+
+    def count(self, client_id: str) -> int:
+        with self.lock:
+            return len(self.by_client.get(client_id, ()))
+
+    def get_random_agent(self, client_id: str) -> EmployeeSummary | None:
+        with self.lock:
+            agent_ids = self.by_role_status.get((client_id, Role.AGENT, InvitationStatus.ACCEPTED))
+
+            # If there are no agents, return None
+            if not agent_ids:
+                return None
+
+            return self.employees[(client_id, secrets.choice(tuple(agent_ids)))].to_summary()
@@ -0,0 +1,19 @@
+# ruff: noqa: INP001, T201
+# Usage: python -m scripts.backfill_employee_emails [resume_after_path]
+# Run before deploying, and again once no instance of the previous version is left. EMAIL_INDEX_FALLBACK can be
+# turned off after the second run, see README.md
+import logging
+import os
+import sys
+
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+
+from repositories.firestore import FirestoreEmployeeRepository
+
+FIRESTORE_DB = os.getenv('FIRESTORE_DB') or '(default)'
+
+logging.basicConfig(level=logging.INFO)
+
+start_after = sys.argv[1] if len(sys.argv) > 1 else None
+last = FirestoreEmployeeRepository(FirestoreClient(database=FIRESTORE_DB)).backfill_email_index(start_after=start_after)
+print(f'Done, last employee: {last}')
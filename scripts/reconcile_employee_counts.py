@@ -0,0 +1,18 @@
+# ruff: noqa: INP001, T201
+# Usage: python -m scripts.reconcile_employee_counts
+# Run once no instance of a version without the employee counters is left, as the employees those instances
+# create or delete in the meantime are not counted
+import logging
+import os
+
+from google.cloud.firestore import Client as FirestoreClient  # type: ignore[import-untyped]
+
+from repositories.firestore import FirestoreEmployeeRepository
+
+FIRESTORE_DB = os.getenv('FIRESTORE_DB') or '(default)'
+
+logging.basicConfig(level=logging.INFO)
+
+counts = FirestoreEmployeeRepository(FirestoreClient(database=FIRESTORE_DB)).reconcile_counts()
+for client_id, count in sorted(counts.items()):
+    print(f'{client_id}: {count}')
@@ -0,0 +1,4 @@
+from .hashing import HashingMetrics, HashingUnavailableError, PasswordHasher, max_queue_for
+from .tokens import TokenSigner
+
+__all__ = ['HashingMetrics', 'HashingUnavailableError', 'PasswordHasher', 'TokenSigner', 'max_queue_for']
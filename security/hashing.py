@@ -0,0 +1,148 @@
+import dataclasses
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, cast
+
+from passlib.hash import pbkdf2_sha256
+
+
+class HashingUnavailableError(Exception):
+    def __init__(self, retry_after: int) -> None:
+        self.retry_after = retry_after
+        super().__init__('Password hashing queue is full.')
+
+
+@dataclass
+class HashingMetrics:
+    completed: int = 0
+    rejected: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    hash_time_total: float = 0.0
+    hash_time_max: float = 0.0
+    worker_restarts: int = 0
+
+
+def _hash(password: str) -> str:
+    return pbkdf2_sha256.hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return pbkdf2_sha256.verify(password, password_hash)
+
+
+# Runs inside the worker process, time.monotonic is system-wide on Linux so it can be compared with the submit time
+def _timed(func: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:  # noqa: ANN401
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic() - started
+
+
+# Hashes running or queued are bounded below the request threads of a worker, so a thread is always left to
+# answer 503 instead of every thread waiting on a hash
+def max_queue_for(threads: int, workers: int) -> int:
+    return max(0, threads - max(workers, 1) - 1)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, retry_after: int = 1) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.retry_after = retry_after
+        self.workers = workers
+
+        # With no workers hashes run inline on the request thread, still bounded by the queue limit
+        self.executor: ProcessPoolExecutor | None = None
+        self.executor_lock = threading.Lock()
+        if workers > 0:
+            self.executor = self._new_executor()
+
+        self.slots = threading.BoundedSemaphore(max(workers, 1) + max_queue)
+
+        self.metrics_lock = threading.Lock()
+        self.metrics = HashingMetrics()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned workers, as forking a process with live gRPC channels and threads is unsafe
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    # A pool whose worker died, e.g. killed for running out of memory, fails every hash from then on
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self.executor_lock:
+            # Every thread waiting on the broken pool gets here, only the first one replaces it
+            if self.executor is not broken:
+                return
+
+            self.logger.error('Password hashing worker died, restarting the worker processes')
+            broken.shutdown(wait=False)
+            self.executor = self._new_executor()
+
+        with self.metrics_lock:
+            self.metrics.worker_restarts += 1
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:  # noqa: ANN401
+        executor = cast(ProcessPoolExecutor, self.executor)
+        try:
+            return executor.submit(_timed, func, *args).result()
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+
+        # Retried once on the new workers, the hash may have been what killed the worker
+        executor = cast(ProcessPoolExecutor, self.executor)
+        try:
+            return executor.submit(_timed, func, *args).result()
+        except BrokenProcessPool as err:
+            self._replace_executor(executor)
+            raise HashingUnavailableError(self.retry_after) from err
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        if not self.slots.acquire(blocking=False):
+            with self.metrics_lock:
+                self.metrics.rejected += 1
+
+            self.logger.warning('Password hashing queue is full, rejecting request')
+            raise HashingUnavailableError(self.retry_after)
+
+        try:
+            submitted = time.monotonic()
+            if self.executor is None:
+                result, started, hash_time = _timed(func, *args)
+            else:
+                result, started, hash_time = self._submit(func, *args)
+
+            queue_wait = max(0.0, started - submitted)
+            with self.metrics_lock:
+                self.metrics.completed += 1
+                self.metrics.queue_wait_total += queue_wait
+                self.metrics.queue_wait_max = max(self.metrics.queue_wait_max, queue_wait)
+                self.metrics.hash_time_total += hash_time
+                self.metrics.hash_time_max = max(self.metrics.hash_time_max, hash_time)
+
+            return result
+        finally:
+            self.slots.release()
+
+    # Starts the worker processes, which otherwise start with the first hash and import passlib then
+    def warm_up(self) -> None:
+        if self.executor is not None:
+            for future in [self.executor.submit(_timed, int) for _ in range(self.workers)]:
+                future.result()
+
+    def hash(self, password: str) -> str:
+        return str(self._run(_hash, password))
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return bool(self._run(_verify, password, password_hash))
+
+    def get_metrics(self) -> HashingMetrics:
+        with self.metrics_lock:
+            return dataclasses.replace(self.metrics)
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
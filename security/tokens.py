@@ -0,0 +1,30 @@
+import base64
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _json_segment(data: Mapping[str, Any]) -> bytes:
+    return _b64encode(json.dumps(data, separators=(',', ':')).encode())
+
+
+class TokenSigner:
+    def __init__(self, private_key: str | bytes) -> None:
+        key = load_pem_private_key(private_key.encode() if isinstance(private_key, str) else private_key, password=None)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise TypeError('JWT private key must be an Ed25519 key.')
+
+        # Parsed once, so signing a token is just the Ed25519 signature over the two encoded segments
+        self.key = key
+        self.header = _json_segment({'alg': 'EdDSA', 'typ': 'JWT'})
+
+    def sign(self, payload: Mapping[str, Any]) -> str:
+        signing_input = self.header + b'.' + _json_segment(payload)
+        return (signing_input + b'.' + _b64encode(self.key.sign(signing_input))).decode()
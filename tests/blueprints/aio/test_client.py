@@ -0,0 +1,135 @@
+import json
+from typing import Any, cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock
+
+from faker import Faker
+from quart.wrappers import Response
+
+from asgi import create_asgi_app
+from blueprints.client import client_to_dict
+from models import Client, Plan
+from repositories import AsyncClientRepository
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+    FIND_API_URL = '/api/v1/clients/detail'
+    BATCH_API_URL = '/api/v1/clients/batch'
+
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.app = create_asgi_app().app
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        self.app.container.unwire()
+
+    def gen_clients(self, n: int) -> list[Client]:
+        return [
+            Client(
+                id=cast(str, self.faker.uuid4()),
+                name=self.faker.company(),
+                plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+                email_incidents=self.faker.unique.email(),
+            )
+            for _ in range(n)
+        ]
+
+    async def resp_json(self, resp: Response) -> Any:  # noqa: ANN401
+        return json.loads(await resp.get_data())
+
+    async def test_retrieve(self) -> None:
+        client = self.gen_clients(1)[0]
+
+        client_repo_mock = Mock(AsyncClientRepository)
+        cast(Mock, client_repo_mock.get).return_value = client
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.get(f'/api/v1/clients/{client.id}', query_string={'include_plan': 'true'})
+
+        cast(Mock, client_repo_mock.get).assert_awaited_once_with(client.id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(await self.resp_json(resp), client_to_dict(client, include_plan=True))
+
+    async def test_retrieve_not_found(self) -> None:
+        client_repo_mock = Mock(AsyncClientRepository)
+        cast(Mock, client_repo_mock.get).return_value = None
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.get(f'/api/v1/clients/{cast(str, self.faker.uuid4())}')
+
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(await self.resp_json(resp), {'code': 404, 'message': 'Client not found.'})
+
+    async def test_retrieve_invalid_id(self) -> None:
+        client_repo_mock = Mock(AsyncClientRepository)
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.get('/api/v1/clients/not-a-uuid')
+
+        cast(Mock, client_repo_mock.get).assert_not_called()
+        self.assertEqual(resp.status_code, 400)
+
+    async def test_find(self) -> None:
+        client = self.gen_clients(1)[0]
+
+        client_repo_mock = Mock(AsyncClientRepository)
+        cast(Mock, client_repo_mock.find_by_email).return_value = client
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.post(self.FIND_API_URL, json={'email': client.email_incidents.upper()})
+
+        cast(Mock, client_repo_mock.find_by_email).assert_awaited_once_with(client.email_incidents.lower())
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(await self.resp_json(resp), client_to_dict(client, include_plan=True))
+
+    async def test_find_invalid(self) -> None:
+        client_repo_mock = Mock(AsyncClientRepository)
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp_json = await self.client.post(self.FIND_API_URL, data='{', headers={'Content-Type': 'application/json'})
+            resp_email = await self.client.post(self.FIND_API_URL, json={'email': 'not-an-email'})
+
+        cast(Mock, client_repo_mock.find_by_email).assert_not_called()
+        self.assertEqual(resp_json.status_code, 400)
+        self.assertEqual(resp_email.status_code, 400)
+        self.assertEqual((await self.resp_json(resp_email))['message'], 'Invalid value for email: Not a valid email address.')
+
+    async def test_batch(self) -> None:
+        clients = self.gen_clients(3)
+        missing_id = cast(str, self.faker.uuid4())
+
+        client_repo_mock = Mock(AsyncClientRepository)
+        cast(Mock, client_repo_mock.get_many).return_value = {clients[0].id: clients[0]}
+        cast(Mock, client_repo_mock.find_many_by_email).return_value = {c.email_incidents: c for c in clients}
+
+        body = {'ids': [clients[0].id, missing_id], 'emails': [c.email_incidents for c in clients]}
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.post(self.BATCH_API_URL, json=body)
+
+        cast(Mock, client_repo_mock.get_many).assert_awaited_once_with([clients[0].id, missing_id])
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            await self.resp_json(resp),
+            {'clients': [client_to_dict(c) for c in clients], 'missing': {'ids': [missing_id], 'emails': []}},
+        )
+
+    async def test_batch_invalid(self) -> None:
+        client_repo_mock = Mock(AsyncClientRepository)
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.post(self.BATCH_API_URL, json={})
+
+        cast(Mock, client_repo_mock.get_many).assert_not_called()
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual((await self.resp_json(resp))['message'], 'At least one id or email is required.')
+
+    async def test_batch_invalid_email(self) -> None:
+        client_repo_mock = Mock(AsyncClientRepository)
+
+        with self.app.container.async_client_repo.override(client_repo_mock):
+            resp = await self.client.post(self.BATCH_API_URL, json={'emails': ['.']})
+
+        cast(Mock, client_repo_mock.find_many_by_email).assert_not_called()
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual((await self.resp_json(resp))['message'], 'Invalid email.')
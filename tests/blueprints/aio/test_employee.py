@@ -0,0 +1,122 @@
+import json
+from datetime import UTC
+from typing import Any, cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock
+
+from faker import Faker
+from quart.wrappers import Response
+
+from asgi import create_asgi_app
+from blueprints.employee import EMPLOYEE_NOT_FOUND_ERROR, employee_to_dict
+from models import Employee, InvitationStatus, Role
+from repositories import AsyncEmployeeRepository
+from repositories.firestore.constants import UUID_UNASSIGNED
+
+
+class TestAsyncEmployee(IsolatedAsyncioTestCase):
+    BATCH_API_URL = '/api/v1/employees/batch'
+
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.app = create_asgi_app().app
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        self.app.container.unwire()
+
+    def gen_employee(self, client_id: str | None = None) -> Employee:
+        return Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client_id,
+            name=self.faker.name(),
+            email=self.faker.unique.email(),
+            password=self.faker.password(),
+            role=Role.AGENT,
+            invitation_status=InvitationStatus.ACCEPTED,
+            invitation_date=self.faker.past_datetime(tzinfo=UTC).replace(microsecond=0),
+        )
+
+    async def resp_json(self, resp: Response) -> Any:  # noqa: ANN401
+        return json.loads(await resp.get_data())
+
+    async def test_retrieve(self) -> None:
+        employee = self.gen_employee()
+
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+        cast(Mock, employee_repo_mock.get).return_value = employee
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.get(f'/api/v1/employees/{UUID_UNASSIGNED}/{employee.id}')
+
+        # The unassigned sentinel is looked up as an employee without client
+        cast(Mock, employee_repo_mock.get).assert_awaited_once_with(employee_id=employee.id, client_id=None)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(await self.resp_json(resp), employee_to_dict(employee))
+
+    async def test_retrieve_not_found(self) -> None:
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+        cast(Mock, employee_repo_mock.get).return_value = None
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.get(f'/api/v1/employees/{cast(str, self.faker.uuid4())}/{cast(str, self.faker.uuid4())}')
+
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(await self.resp_json(resp), {'code': 404, 'message': EMPLOYEE_NOT_FOUND_ERROR})
+
+    async def test_retrieve_invalid_id(self) -> None:
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp_client = await self.client.get(f'/api/v1/employees/x/{cast(str, self.faker.uuid4())}')
+            resp_employee = await self.client.get(f'/api/v1/employees/{cast(str, self.faker.uuid4())}/x')
+
+        cast(Mock, employee_repo_mock.get).assert_not_called()
+        self.assertEqual((await self.resp_json(resp_client))['message'], 'Invalid client ID.')
+        self.assertEqual((await self.resp_json(resp_employee))['message'], 'Invalid employee ID.')
+
+    async def test_batch(self) -> None:
+        employee = self.gen_employee(cast(str, self.faker.uuid4()))
+        missing = {'clientId': cast(str, self.faker.uuid4()), 'employeeId': cast(str, self.faker.uuid4())}
+
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+        cast(Mock, employee_repo_mock.get_many).return_value = {(employee.client_id, employee.id): employee}
+
+        payload = {'employees': [{'clientId': employee.client_id, 'employeeId': employee.id}, missing]}
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.post(self.BATCH_API_URL, json=payload)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(await self.resp_json(resp), {'employees': [employee_to_dict(employee)], 'missing': [missing]})
+
+    async def test_batch_invalid(self) -> None:
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.post(self.BATCH_API_URL, json={'employees': []})
+
+        cast(Mock, employee_repo_mock.get_many).assert_not_called()
+        self.assertEqual(resp.status_code, 400)
+
+    async def test_random_agent(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agent = self.gen_employee(client_id).to_summary()
+
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+        cast(Mock, employee_repo_mock.get_random_agent).return_value = agent
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.get(f'/api/v1/random/{client_id}/agent')
+
+        cast(Mock, employee_repo_mock.get_random_agent).assert_awaited_once_with(client_id)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(await self.resp_json(resp), employee_to_dict(agent))
+
+    async def test_random_agent_not_found(self) -> None:
+        employee_repo_mock = Mock(AsyncEmployeeRepository)
+        cast(Mock, employee_repo_mock.get_random_agent).return_value = None
+
+        with self.app.container.async_employee_repo.override(employee_repo_mock):
+            resp = await self.client.get(f'/api/v1/random/{cast(str, self.faker.uuid4())}/agent')
+
+        self.assertEqual(resp.status_code, 404)
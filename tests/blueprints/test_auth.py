@@ -1,7 +1,10 @@
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC
 from typing import Any, cast
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import jwt
 from cryptography.hazmat.primitives import serialization
@@ -14,6 +17,7 @@ from werkzeug.test import TestResponse
 from app import create_app
 from models import Employee, InvitationStatus, Role
 from repositories import EmployeeRepository
+from security import HashingUnavailableError, PasswordHasher
 
 
 class TestAuth(ParametrizedTestCase):
@@ -102,6 +106,90 @@ class TestAuth(ParametrizedTestCase):
         self.assertEqual(resp_data['code'], 401)
         self.assertEqual(resp_data['message'], 'Invalid username or password.')
 
+    def test_login_busy(self) -> None:
+        login_data = {
+            'username': self.faker.email(),
+            'password': self.faker.password(),
+        }
+
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=None,
+            name=self.faker.name(),
+            email=login_data['username'],
+            password=pbkdf2_sha256.hash(login_data['password']),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=InvitationStatus.UNINVITED,
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.find_by_email).return_value = employee
+        password_hasher_mock = Mock(PasswordHasher)
+        cast(Mock, password_hasher_mock.verify).side_effect = HashingUnavailableError(retry_after=2)
+
+        with (
+            self.app.container.employee_repo.override(employee_repo_mock),
+            self.app.container.password_hasher.override(password_hasher_mock),
+        ):
+            resp = self.call_api(login_data)
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers['Retry-After'], '2')
+        resp_data = json.loads(resp.get_data())
+
+        self.assertEqual(resp_data['code'], 503)
+        self.assertEqual(resp_data['message'], 'Service is busy, please try again later.')
+
+    def test_login_threads_saturated(self) -> None:
+        # Two request threads, one hashing inline
+        with patch.dict(os.environ, {'WORKER_THREADS': '2', 'HASHING_WORKERS': '0'}):
+            app = create_app()
+        self.addCleanup(app.container.unwire)
+        client = app.test_client()
+
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=None,
+            name=self.faker.name(),
+            email=self.faker.email(),
+            password=pbkdf2_sha256.hash('secret'),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=InvitationStatus.UNINVITED,
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.find_by_email).return_value = employee
+
+        hashing = threading.Event()
+        release = threading.Event()
+
+        def slow_verify(password: str, password_hash: str) -> bool:  # noqa: ARG001
+            hashing.set()
+            release.wait(10)
+            return False
+
+        def login() -> TestResponse:
+            body = json.dumps({'username': employee.email, 'password': self.faker.password()})
+            return client.post('/api/v1/auth/employee', data=body, content_type='application/json')
+
+        with (
+            app.container.employee_repo.override(employee_repo_mock),
+            patch('security.hashing._verify', slow_verify),
+            ThreadPoolExecutor(max_workers=2) as threads,
+        ):
+            first = threads.submit(login)
+            self.assertTrue(hashing.wait(10))
+
+            # The other thread is left to answer instead of waiting on the hash
+            resp = threads.submit(login).result(10)
+            release.set()
+
+            self.assertEqual(first.result(10).status_code, 401)
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(app.container.password_hasher().get_metrics().rejected, 1)
+
     @parametrize(
         'assigned',
         [
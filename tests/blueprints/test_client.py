@@ -10,6 +10,7 @@ from unittest_parametrize import ParametrizedTestCase, parametrize
 from werkzeug.test import TestResponse
 
 from app import create_app
+from blueprints.client import MAX_BATCH_CLIENTS, client_to_dict
 from models import Client, Employee, InvitationStatus, Plan, Role
 from repositories import ClientRepository, EmployeeRepository
 from repositories.errors import DuplicateEmailError
@@ -19,6 +20,7 @@ class TestClient(ParametrizedTestCase):
     INFO_API_URL = '/api/v1/clients/me'
     PLAN_API_URL = '/api/v1/clients/me/plan'
     FIND_API_URL = '/api/v1/clients/detail'
+    BATCH_API_URL = '/api/v1/clients/batch'
 
     def setUp(self) -> None:
         self.faker = Faker()
@@ -344,6 +346,7 @@ class TestClient(ParametrizedTestCase):
         client_repo_mock = Mock(ClientRepository)
         employee_repo_mock = Mock(EmployeeRepository)
         cast(Mock, employee_repo_mock.get).return_value = employee
+        cast(Mock, employee_repo_mock.move).return_value = True
         with (
             self.app.container.client_repo.override(client_repo_mock),
             self.app.container.employee_repo.override(employee_repo_mock),
@@ -354,6 +357,8 @@ class TestClient(ParametrizedTestCase):
         repo_client: Client = cast(Mock, client_repo_mock.create).call_args[0][0]
         self.assertEqual(repo_client.name, register_data['name'])
         self.assertEqual(repo_client.email_incidents, f'{register_data["prefixEmailIncidents"]}@{self.domain}'.lower())
+        cast(Mock, employee_repo_mock.move).assert_called_once_with(employee, from_client_id=token['cid'])
+        self.assertEqual(employee.client_id, repo_client.id)
 
         self.assertEqual(resp.status_code, 201)
         resp_data = json.loads(resp.get_data())
@@ -392,6 +397,7 @@ class TestClient(ParametrizedTestCase):
         repo_client: Client = cast(Mock, client_repo_mock.create).call_args[0][0]
         self.assertEqual(repo_client.name, register_data['name'])
         self.assertEqual(repo_client.email_incidents, f'{register_data["prefixEmailIncidents"]}@{self.domain}'.lower())
+        cast(Mock, employee_repo_mock.move).assert_not_called()
 
         self.assertEqual(resp.status_code, 409)
         resp_data = json.loads(resp.get_data())
@@ -399,6 +405,37 @@ class TestClient(ParametrizedTestCase):
         self.assertEqual(resp_data['code'], 409)
         self.assertEqual(resp_data['message'], 'Email already registered.')
 
+    def test_register_employee_removed(self) -> None:
+        employee = self.gen_random_employee()
+
+        token = self.gen_token_client(
+            client_id=employee.client_id,
+            role=employee.role,
+            assigned=False,
+        )
+
+        register_data = {
+            'name': self.faker.name(),
+            'prefixEmailIncidents': self.faker.email().split('@')[0].lower(),
+        }
+
+        client_repo_mock = Mock(ClientRepository)
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.get).return_value = employee
+        # Removed between the read and the move
+        cast(Mock, employee_repo_mock.move).return_value = False
+        with (
+            self.app.container.client_repo.override(client_repo_mock),
+            self.app.container.employee_repo.override(employee_repo_mock),
+        ):
+            resp = self.call_register_api(register_data, token=token)
+
+        repo_client: Client = cast(Mock, client_repo_mock.create).call_args[0][0]
+        cast(Mock, client_repo_mock.delete).assert_called_once_with(repo_client.id)
+
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(json.loads(resp.get_data()), {'code': 404, 'message': 'Employee not found'})
+
     def test_select_plan(self) -> None:
         new_plan: Plan = cast(Plan, self.faker.random_element(list(Plan)))
 
@@ -484,3 +521,99 @@ class TestClient(ParametrizedTestCase):
 
         self.assertEqual(resp_data['code'], 400)
         self.assertEqual(resp_data['message'], 'Invalid value for email: Not a valid email address.')
+
+    def gen_clients(self, n: int) -> list[Client]:
+        return [
+            Client(
+                id=cast(str, self.faker.uuid4()),
+                name=self.faker.company(),
+                plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+                email_incidents=self.faker.unique.email(),
+            )
+            for _ in range(n)
+        ]
+
+    def call_batch_api(self, body: dict[str, Any] | str, *, include_plan: bool = False) -> TestResponse:
+        return self.client.post(
+            self.BATCH_API_URL + ('?include_plan=true' if include_plan else ''),
+            data=body if isinstance(body, str) else json.dumps(body),
+            content_type='application/json',
+        )
+
+    @parametrize(
+        ('include_plan',),
+        [
+            (True,),
+            (False,),
+        ],
+    )
+    def test_batch(self, *, include_plan: bool) -> None:
+        clients = self.gen_clients(4)
+        missing_id = cast(str, self.faker.uuid4())
+        missing_email = self.faker.unique.email()
+
+        client_repo_mock = Mock(ClientRepository)
+        cast(Mock, client_repo_mock.get_many).return_value = {c.id: c for c in clients[:2]}
+        cast(Mock, client_repo_mock.find_many_by_email).return_value = {c.email_incidents: c for c in clients[1:]}
+
+        body = {
+            'ids': [clients[0].id, missing_id, clients[1].id, clients[0].id],
+            'emails': [c.email_incidents.upper() for c in clients[1:]] + [missing_email],
+        }
+        with self.app.container.client_repo.override(client_repo_mock):
+            resp = self.call_batch_api(body, include_plan=include_plan)
+
+        cast(Mock, client_repo_mock.get_many).assert_called_once_with([clients[0].id, missing_id, clients[1].id])
+        cast(Mock, client_repo_mock.find_many_by_email).assert_called_once_with(
+            [c.email_incidents for c in clients[1:]] + [missing_email]
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        resp_data = json.loads(resp.get_data())
+
+        self.assertEqual([c['id'] for c in resp_data['clients']], [c.id for c in clients])
+        for client_data in resp_data['clients']:
+            self.assertEqual('plan' in client_data, include_plan)
+        self.assertEqual(resp_data['missing'], {'ids': [missing_id], 'emails': [missing_email]})
+
+    def test_batch_only_emails(self) -> None:
+        client = self.gen_clients(1)[0]
+
+        client_repo_mock = Mock(ClientRepository)
+        cast(Mock, client_repo_mock.find_many_by_email).return_value = {client.email_incidents: client}
+
+        with self.app.container.client_repo.override(client_repo_mock):
+            resp = self.call_batch_api({'emails': [client.email_incidents]})
+
+        cast(Mock, client_repo_mock.get_many).assert_not_called()
+        self.assertEqual(resp.status_code, 200)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['clients'], [client_to_dict(client)])
+        self.assertEqual(resp_data['missing'], {'ids': [], 'emails': []})
+
+    @parametrize(
+        ('body', 'message'),
+        [
+            ('{', 'The request body could not be parsed as valid JSON.'),
+            ({}, 'At least one id or email is required.'),
+            ({'ids': ['not-a-uuid']}, 'Invalid client ID.'),
+            ({'emails': ['client@example.com', '']}, 'Invalid email.'),
+            ({'emails': ['..']}, 'Invalid email.'),
+            ({'emails': ['not-an-email']}, 'Invalid email.'),
+            (
+                {'emails': [f'client{i}@example.com' for i in range(MAX_BATCH_CLIENTS + 1)]},
+                f'At most {MAX_BATCH_CLIENTS} ids and emails can be requested at once.',
+            ),
+        ],
+    )
+    def test_batch_invalid(self, body: dict[str, Any] | str, message: str) -> None:
+        client_repo_mock = Mock(ClientRepository)
+        with self.app.container.client_repo.override(client_repo_mock):
+            resp = self.call_batch_api(body)
+
+        cast(Mock, client_repo_mock.get_many).assert_not_called()
+        cast(Mock, client_repo_mock.find_many_by_email).assert_not_called()
+
+        self.assertEqual(resp.status_code, 400)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['message'], message)
@@ -10,9 +10,17 @@ from unittest_parametrize import ParametrizedTestCase, parametrize
 from werkzeug.test import TestResponse
 
 from app import create_app
-from blueprints.employee import EMPLOYEE_NOT_FOUND_ERROR
+from blueprints.employee import (
+    EMPLOYEE_NOT_FOUND_ERROR,
+    MAX_BATCH_EMPLOYEES,
+    decode_page_token,
+    employee_to_dict,
+    encode_page_token,
+)
 from models import Employee, InvitationResponse, InvitationStatus, Role
 from repositories import DuplicateEmailError, EmployeeRepository
+from repositories.firestore.constants import UUID_UNASSIGNED
+from security import HashingUnavailableError, PasswordHasher
 
 
 class TestEmployee(ParametrizedTestCase):
@@ -22,6 +30,7 @@ class TestEmployee(ParametrizedTestCase):
     INVITE_API_URL = '/api/v1/employees/invite'
     ANSWER_API_URL = '/api/v1/employees/invitation'
     DETAIL_API_URL = '/api/v1/employees/detail'
+    BATCH_API_URL = '/api/v1/employees/batch'
     RANDOM_AGENT_URL = '/api/v1/random/{client_id}/agent'
 
     def setUp(self) -> None:
@@ -187,6 +196,69 @@ class TestEmployee(ParametrizedTestCase):
         self.assertEqual(resp_data['code'], 400)
         self.assertEqual(resp_data['message'], 'Invalid client ID.' if param == 'client_id' else 'Invalid employee ID.')
 
+    def test_batch_get_employees(self) -> None:
+        employees = [self.setup_employee(client_id=cast(str, self.faker.uuid4())), self.setup_employee()]
+        missing = {'clientId': cast(str, self.faker.uuid4()), 'employeeId': cast(str, self.faker.uuid4())}
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.get_many).return_value = {(e.client_id, e.id): e for e in employees}
+
+        payload = {
+            'employees': [
+                {'clientId': employees[0].client_id, 'employeeId': employees[0].id},
+                missing,
+                {'clientId': UUID_UNASSIGNED, 'employeeId': employees[1].id},
+                {'clientId': employees[0].client_id, 'employeeId': employees[0].id},
+            ]
+        }
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.client.post(self.BATCH_API_URL, json=payload)
+
+        # The unassigned sentinel is looked up as an employee without client
+        cast(Mock, employee_repo_mock.get_many).assert_called_once_with(
+            [
+                (employees[0].client_id, employees[0].id),
+                (missing['clientId'], missing['employeeId']),
+                (None, employees[1].id),
+            ]
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['employees'], [employee_to_dict(e) for e in employees])
+        self.assertEqual(resp_data['missing'], [missing])
+
+    @parametrize(
+        ('payload', 'message'),
+        [
+            ({'employees': []}, 'Invalid value for employees: Length must be between 1 and 300.'),
+            (
+                {'employees': [{'clientId': 'x', 'employeeId': '00000000-0000-4000-8000-000000000000'}]},
+                'Invalid client ID.',
+            ),
+            (
+                {'employees': [{'clientId': '00000000-0000-4000-8000-000000000000', 'employeeId': 'x'}]},
+                'Invalid employee ID.',
+            ),
+        ],
+    )
+    def test_batch_get_employees_invalid(self, payload: dict[str, Any], message: str) -> None:
+        employee_repo_mock = Mock(EmployeeRepository)
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.client.post(self.BATCH_API_URL, json=payload)
+
+        cast(Mock, employee_repo_mock.get_many).assert_not_called()
+        self.assertEqual(resp.status_code, 400)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['message'], message)
+
+    def test_batch_get_employees_too_many(self) -> None:
+        keys = [{'clientId': UUID_UNASSIGNED, 'employeeId': cast(str, self.faker.uuid4())}]
+        with self.app.container.employee_repo.override(Mock(EmployeeRepository)):
+            resp = self.client.post(self.BATCH_API_URL, json={'employees': keys * (MAX_BATCH_EMPLOYEES + 1)})
+
+        self.assertEqual(resp.status_code, 400)
+
     def test_register_employee_success(self) -> None:
         employee_repo_mock = Mock(EmployeeRepository)
         cast(Mock, employee_repo_mock.find_by_email).return_value = None
@@ -226,6 +298,30 @@ class TestEmployee(ParametrizedTestCase):
 
         self.assertEqual(resp_data, {'code': 409, 'message': 'Email already registered'})
 
+    def test_register_employee_busy(self) -> None:
+        employee_repo_mock = Mock(EmployeeRepository)
+        password_hasher_mock = Mock(PasswordHasher)
+        cast(Mock, password_hasher_mock.hash).side_effect = HashingUnavailableError(retry_after=3)
+
+        with (
+            self.app.container.employee_repo.override(employee_repo_mock),
+            self.app.container.password_hasher.override(password_hasher_mock),
+        ):
+            payload = {
+                'name': self.faker.name(),
+                'email': self.faker.email(),
+                'password': self.faker.password(length=12),
+                'role': self.faker.random_element(list(Role)),
+            }
+            resp = self.call_register_api(payload)
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers['Retry-After'], '3')
+        resp_data = json.loads(resp.get_data())
+
+        self.assertEqual(resp_data, {'code': 503, 'message': 'Service is busy, please try again later.'})
+        cast(Mock, employee_repo_mock.create).assert_not_called()
+
     def test_register_employee_validation_error(self) -> None:
         invalid_payload = {
             'name': '',  # Name is required and cannot be empty
@@ -315,6 +411,101 @@ class TestEmployee(ParametrizedTestCase):
         self.assertEqual(resp_data['totalPages'], total_pages)
         self.assertEqual(resp_data['currentPage'], page_number)
 
+    def gen_employees(self, client_id: str, n: int) -> list[Employee]:
+        employees = [
+            Employee(
+                id=cast(str, self.faker.uuid4()),
+                client_id=client_id,
+                name=self.faker.name(),
+                email=self.faker.email(),
+                password=self.faker.password(),
+                role=cast(Role, self.faker.random_element(list(Role))),
+                invitation_status=self.faker.random_element([InvitationStatus.ACCEPTED, InvitationStatus.PENDING]),
+                invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+            )
+            for _ in range(n)
+        ]
+        employees.sort(key=lambda e: (e.invitation_date, e.id), reverse=True)
+        return employees
+
+    @parametrize(
+        ('page_size', 'returned', 'has_next'),
+        [
+            (5, 5, True),  # Full page, there may be more
+            (50, 12, False),  # Larger than the legacy sizes, last page
+            (100, 0, False),  # Empty
+        ],
+    )
+    def test_list_employees_cursor(self, page_size: int, returned: int, has_next: bool) -> None:  # noqa: FBT001
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_employees(client_id, returned)
+        token = self.gen_token_employee(client_id=client_id, role=Role.ADMIN, assigned=True)
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.count).return_value = 12
+        cast(Mock, employee_repo_mock.get_all).return_value = (e for e in employees)
+
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.call_list_api(token, {'page_size': page_size, 'page_token': ''})
+
+        self.assertEqual(resp.status_code, 200)
+        resp_data = json.loads(resp.get_data())
+
+        cast(Mock, employee_repo_mock.get_all).assert_called_once_with(
+            client_id, offset=None, limit=page_size, start_after=None
+        )
+        self.assertEqual([e['id'] for e in resp_data['employees']], [e.id for e in employees])
+        self.assertEqual(resp_data['totalEmployees'], 12)
+        self.assertEqual(resp_data['totalPages'], (12 + page_size - 1) // page_size)
+
+        if has_next:
+            self.assertIsNotNone(resp_data['nextPageToken'])
+            self.assertEqual(decode_page_token(resp_data['nextPageToken']), (employees[-1].invitation_date, employees[-1].id))
+        else:
+            self.assertIsNone(resp_data['nextPageToken'])
+
+    def test_list_employees_cursor_next_page(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_employees(client_id, 10)
+        token = self.gen_token_employee(client_id=client_id, role=Role.ADMIN, assigned=True)
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.count).return_value = len(employees)
+        cast(Mock, employee_repo_mock.get_all).return_value = (e for e in employees[5:])
+
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.call_list_api(token, {'page_size': 5, 'page_token': encode_page_token(employees[4])})
+
+        self.assertEqual(resp.status_code, 200)
+
+        cast(Mock, employee_repo_mock.get_all).assert_called_once_with(
+            client_id, offset=None, limit=5, start_after=(employees[4].invitation_date, employees[4].id)
+        )
+
+    @parametrize(
+        ('params', 'message'),
+        [
+            ({'page_token': 'not a token'}, 'Invalid page_token.'),
+            ({'page_token': 'WyJmb28iXQ=='}, 'Invalid page_token.'),  # ["foo"]
+            ({'page_token': 'WyIyMDI0LTEwLTEwVDE3OjU2OjU1IiwgImlkIl0='}, 'Invalid page_token.'),  # Naive date
+            ({'page_token': '', 'page_size': 0}, 'Invalid page_size. Page size must be between 1 and 100.'),
+            ({'page_token': '', 'page_size': 101}, 'Invalid page_size. Page size must be between 1 and 100.'),
+        ],
+    )
+    def test_list_employees_cursor_invalid(self, params: dict[str, Any], message: str) -> None:
+        token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=True)
+
+        employee_repo_mock = Mock(EmployeeRepository)
+
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.call_list_api(token, params)
+
+        self.assertEqual(resp.status_code, 400)
+        resp_data = json.loads(resp.get_data())
+
+        self.assertEqual(resp_data, {'code': 400, 'message': message})
+        cast(Mock, employee_repo_mock.get_all).assert_not_called()
+
     def test_invalid_page_size(self) -> None:
         # Probar con un page_size inválido
         token = self.gen_token_employee(
@@ -372,9 +563,10 @@ class TestEmployee(ParametrizedTestCase):
             invitation_date=datetime.now(UTC).replace(microsecond=0),
         )
 
-    def setup_invite_test(self, employee: Employee, token: dict[str, Any]) -> TestResponse:
+    def setup_invite_test(self, employee: Employee, token: dict[str, Any], *, moved: bool = True) -> TestResponse:
         employee_repo_mock = Mock(EmployeeRepository)
         cast(Mock, employee_repo_mock.find_by_email).return_value = employee
+        cast(Mock, employee_repo_mock.move).return_value = moved
 
         with self.app.container.employee_repo.override(employee_repo_mock):
             payload = {'email': employee.email}
@@ -393,6 +585,32 @@ class TestEmployee(ParametrizedTestCase):
         self.assertEqual(resp_data['employee']['invitationStatus'], InvitationStatus.PENDING.value)
         self.assertIsNotNone(resp_data['employee']['invitationDate'])
 
+    def test_invite_employee_moves_employee(self) -> None:
+        token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=False)
+        employee = self.setup_employee()
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.find_by_email).return_value = employee
+        cast(Mock, employee_repo_mock.move).return_value = True
+
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.call_invite_api({'email': employee.email}, token)
+
+        self.assertEqual(resp.status_code, 201)
+        cast(Mock, employee_repo_mock.move).assert_called_once_with(employee, from_client_id=None)
+        self.assertEqual(employee.client_id, token['cid'])
+        cast(Mock, employee_repo_mock.delete).assert_not_called()
+        cast(Mock, employee_repo_mock.create).assert_not_called()
+
+    def test_invite_employee_moved_concurrently(self) -> None:
+        token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=False)
+        employee = self.setup_employee()
+        resp = self.setup_invite_test(employee, token, moved=False)
+
+        self.assertEqual(resp.status_code, 404)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['message'], EMPLOYEE_NOT_FOUND_ERROR)
+
     def test_invite_employee_not_admin(self) -> None:
         token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.ANALYST, assigned=True)
         payload = {'email': self.faker.email()}
@@ -481,8 +699,7 @@ class TestEmployee(ParametrizedTestCase):
 
         employee_repo_mock = Mock(EmployeeRepository)
         cast(Mock, employee_repo_mock.get).return_value = employee
-        cast(Mock, employee_repo_mock.delete).return_value = None
-        cast(Mock, employee_repo_mock.create).return_value = None
+        cast(Mock, employee_repo_mock.move).return_value = True
 
         with self.app.container.employee_repo.override(employee_repo_mock):
             resp = self.call_answer_api(payload, token)
@@ -491,6 +708,7 @@ class TestEmployee(ParametrizedTestCase):
         resp_data = json.loads(resp.get_data())
         self.assertEqual(resp_data['message'], 'Invitation accepted successfully')
         self.assertEqual(resp_data['employee']['invitationStatus'], InvitationStatus.ACCEPTED.value)
+        cast(Mock, employee_repo_mock.move).assert_called_once_with(employee, from_client_id=client_id)
 
     def test_decline_invitation_success(self) -> None:
         token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.AGENT, assigned=True)
@@ -499,8 +717,7 @@ class TestEmployee(ParametrizedTestCase):
 
         employee_repo_mock = Mock(EmployeeRepository)
         cast(Mock, employee_repo_mock.get).return_value = employee
-        cast(Mock, employee_repo_mock.delete).return_value = None
-        cast(Mock, employee_repo_mock.create).return_value = None
+        cast(Mock, employee_repo_mock.move).return_value = True
 
         with self.app.container.employee_repo.override(employee_repo_mock):
             resp = self.call_answer_api(payload, token)
@@ -510,6 +727,23 @@ class TestEmployee(ParametrizedTestCase):
         self.assertEqual(resp_data['message'], 'Invitation declined successfully')
         self.assertEqual(resp_data['employee']['invitationStatus'], InvitationStatus.UNINVITED.value)
         self.assertIsNone(resp_data['employee']['clientId'])
+        cast(Mock, employee_repo_mock.move).assert_called_once_with(employee, from_client_id=token['cid'])
+
+    def test_invitation_moved_concurrently(self) -> None:
+        token = self.gen_token_employee(client_id=cast(str, self.faker.uuid4()), role=Role.AGENT, assigned=True)
+        employee = self.setup_employee(client_id=token['cid'], invitation_status=InvitationStatus.PENDING)
+        payload = {'response': InvitationResponse.ACCEPTED.value}
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.get).return_value = employee
+        cast(Mock, employee_repo_mock.move).return_value = False
+
+        with self.app.container.employee_repo.override(employee_repo_mock):
+            resp = self.call_answer_api(payload, token)
+
+        self.assertEqual(resp.status_code, 404)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp_data['message'], EMPLOYEE_NOT_FOUND_ERROR)
 
     def test_invitation_not_found(self) -> None:
         token = self.gen_token_employee(client_id=None, role=Role.AGENT, assigned=True)
@@ -634,7 +868,7 @@ class TestEmployee(ParametrizedTestCase):
         client_id = cast(str, self.faker.uuid4())
         employee = self.setup_employee(client_id=client_id)
         employee_repo_mock = Mock(EmployeeRepository)
-        cast(Mock, employee_repo_mock.get_random_agent).return_value = employee
+        cast(Mock, employee_repo_mock.get_random_agent).return_value = employee.to_summary()
 
         with self.app.container.employee_repo.override(employee_repo_mock):
             resp = self.call_get_random_agent(client_id)
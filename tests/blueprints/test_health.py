@@ -1,14 +1,106 @@
+import json
+from typing import cast
 from unittest import TestCase
+from unittest.mock import Mock
 
 from app import create_app
+from repositories.firestore import ChannelStats, FirestoreEmployeeRepository, PooledFirestoreClient
+from repositories.firestore.channels import ChannelPool
+from security import HashingMetrics, PasswordHasher
+from warmup import WarmUp
 
 
 class TestHealth(TestCase):
     def setUp(self) -> None:
-        app = create_app()
-        self.client = app.test_client()
+        self.app = create_app()
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        self.app.container.unwire()
 
     def test_health(self) -> None:
         resp = self.client.get('/api/v1/health/client')
 
         self.assertEqual(resp.status_code, 200)
+
+    def test_readiness(self) -> None:
+        warmup = WarmUp()
+
+        with self.app.container.warmup.override(warmup):
+            resp_warming = self.client.get('/api/v1/health/ready')
+            warmup.run([('step', lambda: None)])
+            resp_ready = self.client.get('/api/v1/health/ready')
+
+        self.assertEqual(resp_warming.status_code, 503)
+        self.assertFalse(json.loads(resp_warming.get_data())['ready'])
+        self.assertEqual(resp_ready.status_code, 200)
+        self.assertEqual(list(json.loads(resp_ready.get_data())['timingsMs']), ['step', 'total'])
+
+    def test_ready_without_warmup(self) -> None:
+        resp = self.client.get('/api/v1/health/ready')
+
+        self.assertEqual(resp.status_code, 200)
+
+    def test_firestore_channels(self) -> None:
+        firestore_client = Mock(PooledFirestoreClient, channel_pool=Mock(ChannelPool))
+        cast(Mock, firestore_client.channel_pool.snapshot).return_value = [ChannelStats(2, 5, 100), ChannelStats(0, 4, 99)]
+
+        with self.app.container.firestore_client.override(firestore_client):
+            resp = self.client.get('/api/v1/health/firestore')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            json.loads(resp.get_data()),
+            {
+                'channels': [
+                    {'inFlight': 2, 'peakInFlight': 5, 'calls': 100},
+                    {'inFlight': 0, 'peakInFlight': 4, 'calls': 99},
+                ]
+            },
+        )
+
+    def test_firestore_channels_memory_backend(self) -> None:
+        self.app.container.config.repository.backend.override('memory')
+
+        resp = self.client.get('/api/v1/health/firestore')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.get_data()), {'channels': []})
+
+    def test_hashing(self) -> None:
+        password_hasher = Mock(PasswordHasher)
+        cast(Mock, password_hasher.get_metrics).return_value = HashingMetrics(10, 2, 0.5, 0.25, 1.5, 0.2, 1)
+
+        with self.app.container.password_hasher.override(password_hasher):
+            resp = self.client.get('/api/v1/health/hashing')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            json.loads(resp.get_data()),
+            {
+                'completed': 10,
+                'rejected': 2,
+                'queueWaitTotal': 0.5,
+                'queueWaitMax': 0.25,
+                'hashTimeTotal': 1.5,
+                'hashTimeMax': 0.2,
+                'workerRestarts': 1,
+            },
+        )
+
+    def test_placeholder(self) -> None:
+        employee_repo = Mock(FirestoreEmployeeRepository, placeholder_writes=1)
+
+        with self.app.container.firestore_employee_repo.override(employee_repo):
+            resp = self.client.get('/api/v1/health/placeholder')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.get_data()), {'placeholderWrites': 1})
+
+    def test_placeholder_memory_backend(self) -> None:
+        self.app.container.config.repository.backend.override('memory')
+
+        resp = self.client.get('/api/v1/health/placeholder')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.get_data()), {'placeholderWrites': 0})
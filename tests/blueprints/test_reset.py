@@ -41,8 +41,8 @@ class TestReset(ParametrizedTestCase):
 
         cast(Mock, client_repo_mock.delete_all).side_effect = lambda: call_order.append('client:delete_all')
         cast(Mock, employee_repo_mock.delete_all).side_effect = lambda: call_order.append('employee:delete_all')
-        cast(Mock, client_repo_mock.create).side_effect = lambda _x: call_order.append('client:create')
-        cast(Mock, employee_repo_mock.create).side_effect = lambda _x: call_order.append('employee:create')
+        cast(Mock, client_repo_mock.create_many).side_effect = lambda _x: call_order.append('client:create_many')
+        cast(Mock, employee_repo_mock.create_many).side_effect = lambda _x: call_order.append('employee:create_many')
 
         with (
             self.app.container.client_repo.override(client_repo_mock),
@@ -58,9 +58,12 @@ class TestReset(ParametrizedTestCase):
         else:
             self.assertEqual(
                 call_order,
-                ['employee:delete_all', 'client:delete_all']
-                + ['client:create'] * len(demo.clients)
-                + ['employee:create'] * len(demo.employees),
+                ['employee:delete_all', 'client:delete_all', 'client:create_many', 'employee:create_many'],
             )
 
+            clients = cast(Mock, client_repo_mock.create_many).call_args.args[0]
+            self.assertEqual([c.id for c in clients], [c.id for c in demo.clients])
+            self.assertTrue(all(c.email_incidents.endswith(f'@{self.domain}') for c in clients))
+            cast(Mock, employee_repo_mock.create_many).assert_called_once_with(demo.employees)
+
         self.assertEqual(resp.status_code, 200)
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from unittest import TestCase
+
+from blueprints import client
+from blueprints.util import _body_schemas, body_schema, preload_body_schemas
+
+
+@dataclass
+class DummyBody:
+    name: str
+
+
+class TestUtil(TestCase):
+    def test_body_schema_cached(self) -> None:
+        schema = body_schema(DummyBody)
+
+        self.assertIs(body_schema(DummyBody), schema)
+        self.assertEqual(schema.load({'name': 'foo'}), DummyBody(name='foo'))
+
+    def test_body_schema_threads(self) -> None:
+        @dataclass
+        class OtherBody:
+            value: int
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            schemas = list(executor.map(lambda _: body_schema(OtherBody), range(32)))
+
+        self.assertTrue(all(schema is schemas[0] for schema in schemas))
+
+    def test_preload_body_schemas(self) -> None:
+        self.assertEqual(preload_body_schemas(client), 3)
+
+        for cls in (client.RegisterClientBody, client.FindByEmailBody, client.BatchClientsBody):
+            self.assertIn(cls, _body_schemas)
@@ -0,0 +1,86 @@
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import Mock
+
+from faker import Faker
+
+from models import Client, Plan
+from repositories import AsyncClientRepository, ClientRepository
+from repositories.cached import AsyncCachedClientRepository, CachedClientRepository
+
+
+class TestAsyncCachedClient(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.sync_inner = Mock(ClientRepository)
+        self.cache = CachedClientRepository(self.sync_inner, max_size=16, ttl=60, negative_max_size=16, negative_ttl=60)
+        self.inner = Mock(AsyncClientRepository)
+        self.repo = AsyncCachedClientRepository(self.inner, self.cache)
+
+    def gen_client(self) -> Client:
+        return Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+            email_incidents=self.faker.unique.email(),
+        )
+
+    async def test_get_read_through(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.get).return_value = client
+
+        self.assertEqual(await self.repo.get(client.id), client)
+        self.assertEqual(await self.repo.get(client.id), client)
+
+        cast(Mock, self.inner.get).assert_awaited_once_with(client.id)
+
+    async def test_shares_cache(self) -> None:
+        client = self.gen_client()
+        self.cache.create(client)
+
+        # Clients written through the synchronous repository are served from the cache
+        self.assertEqual(await self.repo.get(client.id), client)
+        self.assertEqual(await self.repo.find_by_email(client.email_incidents), client)
+        cast(Mock, self.inner.get).assert_not_called()
+        cast(Mock, self.inner.find_by_email).assert_not_called()
+
+        # And updates through it are seen here
+        client.name = self.faker.company()
+        self.cache.update(client)
+        cast(Mock, self.inner.get).return_value = client
+
+        self.assertEqual(await self.repo.get(client.id), client)
+        cast(Mock, self.inner.get).assert_awaited_once_with(client.id)
+
+    async def test_find_by_email_negative(self) -> None:
+        email = self.faker.unique.email()
+        cast(Mock, self.inner.find_by_email).return_value = None
+
+        self.assertIsNone(await self.repo.find_by_email(email))
+        self.assertIsNone(await self.repo.find_by_email(email))
+        self.assertIsNone(self.cache.find_by_email(email))
+
+        cast(Mock, self.inner.find_by_email).assert_awaited_once_with(email)
+        cast(Mock, self.sync_inner.find_by_email).assert_not_called()
+
+    async def test_get_many(self) -> None:
+        clients = [self.gen_client() for _ in range(3)]
+        self.cache.create(clients[0])
+        cast(Mock, self.inner.get_many).return_value = {c.id: c for c in clients[1:]}
+
+        found = await self.repo.get_many([c.id for c in clients])
+
+        self.assertEqual(found, {c.id: c for c in clients})
+        cast(Mock, self.inner.get_many).assert_awaited_once_with([c.id for c in clients[1:]])
+
+    async def test_find_many_by_email(self) -> None:
+        clients = [self.gen_client() for _ in range(2)]
+        missing = self.faker.unique.email()
+        self.cache.create(clients[0])
+        cast(Mock, self.inner.find_many_by_email).return_value = {clients[1].email_incidents: clients[1]}
+
+        emails = [c.email_incidents for c in clients] + [missing]
+        self.assertEqual(await self.repo.find_many_by_email(emails), {c.email_incidents: c for c in clients})
+        self.assertEqual(await self.repo.find_many_by_email(emails), {c.email_incidents: c for c in clients})
+
+        cast(Mock, self.inner.find_many_by_email).assert_awaited_once_with([clients[1].email_incidents, missing])
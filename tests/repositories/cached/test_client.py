@@ -0,0 +1,252 @@
+from typing import cast
+from unittest import TestCase
+from unittest.mock import Mock
+
+from faker import Faker
+
+from models import Client, Plan
+from repositories import ClientRepository, DuplicateEmailError
+from repositories.cached import CachedClientRepository
+
+
+class TestCachedClient(TestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.inner = Mock(ClientRepository)
+        self.repo = CachedClientRepository(self.inner, max_size=16, ttl=60, negative_max_size=16, negative_ttl=60)
+
+    def gen_client(self) -> Client:
+        return Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+            email_incidents=self.faker.unique.email(),
+        )
+
+    def test_get_read_through(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.get).return_value = client
+
+        self.assertEqual(self.repo.get(client.id), client)
+        self.assertEqual(self.repo.get(client.id), client)
+
+        cast(Mock, self.inner.get).assert_called_once_with(client.id)
+
+    def test_get_missing_not_cached(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        cast(Mock, self.inner.get).return_value = None
+
+        self.assertIsNone(self.repo.get(client_id))
+        self.assertIsNone(self.repo.get(client_id))
+
+        self.assertEqual(cast(Mock, self.inner.get).call_count, 2)
+
+    def test_get_returns_copy(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.get).return_value = client
+
+        self.repo.get(client.id)
+        cast(Client, self.repo.get(client.id)).plan = None
+        client_cached = cast(Client, self.repo.get(client.id))
+
+        self.assertEqual(client_cached.plan, client.plan)
+        self.assertIsNot(client_cached, client)
+
+    def test_create(self) -> None:
+        client = self.gen_client()
+
+        self.repo.create(client)
+
+        cast(Mock, self.inner.create).assert_called_once_with(client)
+        self.assertEqual(self.repo.get(client.id), client)
+        cast(Mock, self.inner.get).assert_not_called()
+
+    def test_create_duplicate(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.create).side_effect = DuplicateEmailError(client.email_incidents)
+        cast(Mock, self.inner.get).return_value = None
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create(client)
+
+        self.assertIsNone(self.repo.get(client.id))
+
+    def test_create_many(self) -> None:
+        clients = [self.gen_client() for _ in range(3)]
+        cast(Mock, self.inner.find_by_email).return_value = None
+        self.assertIsNone(self.repo.find_by_email(clients[0].email_incidents))
+
+        self.repo.create_many(clients)
+
+        cast(Mock, self.inner.create_many).assert_called_once_with(clients)
+        for client in clients:
+            self.assertEqual(self.repo.get(client.id), client)
+            self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+        cast(Mock, self.inner.get).assert_not_called()
+        cast(Mock, self.inner.find_by_email).assert_called_once_with(clients[0].email_incidents)
+
+    def test_create_many_duplicate(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.create_many).side_effect = DuplicateEmailError(client.email_incidents)
+        cast(Mock, self.inner.get).return_value = None
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create_many([client])
+
+        self.assertIsNone(self.repo.get(client.id))
+
+    def test_get_many(self) -> None:
+        clients = [self.gen_client() for _ in range(3)]
+        missing_id = cast(str, self.faker.uuid4())
+        cast(Mock, self.inner.get).return_value = clients[0]
+        self.repo.get(clients[0].id)
+        cast(Mock, self.inner.get_many).return_value = {clients[1].id: clients[1]}
+
+        self.assertEqual(self.repo.get_many([clients[0].id, clients[1].id, missing_id]), {c.id: c for c in clients[:2]})
+        cast(Mock, self.inner.get_many).assert_called_once_with([clients[1].id, missing_id])
+
+        # Found clients are cached, missing ones are not
+        self.assertEqual(self.repo.get_many([clients[1].id]), {clients[1].id: clients[1]})
+        cast(Mock, self.inner.get_many).assert_called_once()
+
+    def test_find_many_by_email(self) -> None:
+        clients = [self.gen_client() for _ in range(2)]
+        missing_email = self.faker.unique.email()
+        cast(Mock, self.inner.find_many_by_email).return_value = {clients[0].email_incidents: clients[0]}
+
+        emails = [clients[0].email_incidents, missing_email]
+        self.assertEqual(self.repo.find_many_by_email(emails), {clients[0].email_incidents: clients[0]})
+        cast(Mock, self.inner.find_many_by_email).assert_called_once_with(emails)
+
+        # Both the found and the missing e-mails are answered from the cache
+        self.assertEqual(self.repo.find_many_by_email(emails), {clients[0].email_incidents: clients[0]})
+        self.assertIsNone(self.repo.find_by_email(missing_email))
+        cast(Mock, self.inner.find_many_by_email).assert_called_once()
+        cast(Mock, self.inner.get_many).assert_not_called()
+        cast(Mock, self.inner.find_by_email).assert_not_called()
+
+    def test_update_invalidates(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.get).return_value = client
+        self.repo.get(client.id)
+
+        client_updated = self.gen_client()
+        client_updated.id = client.id
+        self.repo.update(client_updated)
+        cast(Mock, self.inner.get).return_value = client_updated
+
+        cast(Mock, self.inner.update).assert_called_once_with(client_updated)
+        self.assertEqual(self.repo.get(client.id), client_updated)
+        self.assertEqual(cast(Mock, self.inner.get).call_count, 2)
+
+    def test_delete_invalidates(self) -> None:
+        client = self.gen_client()
+        self.repo.create(client)
+        cast(Mock, self.inner.get).return_value = None
+        cast(Mock, self.inner.find_by_email).return_value = None
+
+        self.repo.delete(client.id)
+
+        cast(Mock, self.inner.delete).assert_called_once_with(client.id)
+        self.assertIsNone(self.repo.get(client.id))
+        self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+
+    def test_delete_all_invalidates(self) -> None:
+        client = self.gen_client()
+        self.repo.create(client)
+        cast(Mock, self.inner.get).return_value = None
+
+        self.repo.delete_all()
+
+        cast(Mock, self.inner.delete_all).assert_called_once()
+        self.assertIsNone(self.repo.get(client.id))
+
+    def test_get_all(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.get_all).return_value = iter([client])
+
+        self.assertEqual(list(self.repo.get_all()), [client])
+
+    def test_find_by_email_indexed(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.find_by_email).return_value = client
+
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+        self.assertEqual(self.repo.get(client.id), client)
+
+        cast(Mock, self.inner.find_by_email).assert_called_once_with(client.email_incidents)
+        cast(Mock, self.inner.get).assert_not_called()
+
+    def test_find_by_email_created(self) -> None:
+        client = self.gen_client()
+
+        self.repo.create(client)
+
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+        cast(Mock, self.inner.find_by_email).assert_not_called()
+
+    def test_find_by_email_negative(self) -> None:
+        email = self.faker.unique.email()
+        cast(Mock, self.inner.find_by_email).return_value = None
+
+        self.assertIsNone(self.repo.find_by_email(email))
+        self.assertIsNone(self.repo.find_by_email(email))
+
+        cast(Mock, self.inner.find_by_email).assert_called_once_with(email)
+
+        # Registering a client with that email drops the negative entry
+        client = self.gen_client()
+        client.email_incidents = email
+        self.repo.create(client)
+
+        self.assertEqual(self.repo.find_by_email(email), client)
+
+    def test_find_by_email_updated(self) -> None:
+        client = self.gen_client()
+        old_email = client.email_incidents
+        self.repo.create(client)
+
+        client_updated = Client(id=client.id, name=client.name, plan=client.plan, email_incidents=self.faker.unique.email())
+        self.repo.update(client_updated)
+        cast(Mock, self.inner.get).return_value = client_updated
+        cast(Mock, self.inner.find_by_email).side_effect = lambda email: client_updated if email == old_email else None
+
+        # The stale index entry is detected and the backend is asked again
+        self.assertIsNone(self.repo.find_by_email(client_updated.email_incidents))
+        cast(Mock, self.inner.find_by_email).side_effect = None
+        cast(Mock, self.inner.find_by_email).return_value = None
+        self.assertIsNone(self.repo.find_by_email(old_email))
+
+    def test_find_by_email_update_clears_negative(self) -> None:
+        client = self.gen_client()
+        cast(Mock, self.inner.find_by_email).return_value = None
+        self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+
+        self.repo.update(client)
+        cast(Mock, self.inner.find_by_email).return_value = client
+
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+    def test_delete_all_clears_email_index(self) -> None:
+        client = self.gen_client()
+        self.repo.create(client)
+        cast(Mock, self.inner.find_by_email).return_value = None
+
+        self.repo.delete_all()
+
+        self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+        cast(Mock, self.inner.find_by_email).assert_called_once_with(client.email_incidents)
+
+    def test_prime(self) -> None:
+        clients = [self.gen_client() for _ in range(20)]
+        cast(Mock, self.inner.get_all).return_value = iter(clients)
+
+        # Only as many clients as the cache holds are loaded
+        self.assertEqual(self.repo.prime(), 16)
+
+        self.assertEqual(self.repo.get(clients[0].id), clients[0])
+        self.assertEqual(self.repo.find_by_email(clients[15].email_incidents), clients[15])
+        cast(Mock, self.inner.get).assert_not_called()
+        cast(Mock, self.inner.find_by_email).assert_not_called()
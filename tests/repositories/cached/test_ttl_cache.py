@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from repositories.cached import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache(TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache: TTLCache[str, int] = TTLCache(max_size=3, ttl=10, clock=self.clock)
+
+    def test_get_put(self) -> None:
+        self.assertIsNone(self.cache.get('a'))
+
+        self.cache.put('a', 1)
+
+        self.assertEqual(self.cache.get('a'), 1)
+
+    def test_expiry(self) -> None:
+        self.cache.put('a', 1)
+
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get('a'), 1)
+
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self) -> None:
+        for i, key in enumerate(['a', 'b', 'c']):
+            self.cache.put(key, i)
+
+        # Touch 'a' so 'b' becomes the least recently used entry
+        self.cache.get('a')
+        self.cache.put('d', 3)
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 0)
+        self.assertEqual(self.cache.get('d'), 3)
+
+    def test_invalidation(self) -> None:
+        self.cache.put('a', 1)
+        self.cache.put('b', 2)
+
+        self.cache.pop('a')
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 2)
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_stale_generation(self) -> None:
+        generation = self.cache.generation
+        self.cache.pop('a')
+
+        self.cache.put('a', 1, generation)
+
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_disabled(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(max_size=0, ttl=10)
+
+        cache.put('a', 1)
+
+        self.assertIsNone(cache.get('a'))
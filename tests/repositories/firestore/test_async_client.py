@@ -0,0 +1,100 @@
+import os
+from typing import cast
+from unittest import IsolatedAsyncioTestCase, skipUnless
+
+import requests
+from faker import Faker
+from google.cloud.firestore import AsyncClient  # type: ignore[import-untyped]
+from google.cloud.firestore import Client as FirestoreClient
+
+from models import Client, Plan
+from repositories.firestore import UUID_UNASSIGNED, AsyncFirestoreClientRepository, FirestoreClientRepository
+from repositories.firestore.keys import key_id
+
+FIRESTORE_DATABASE = '(default)'
+
+
+@skipUnless('FIRESTORE_EMULATOR_HOST' in os.environ, 'Firestore emulator not available')
+class TestAsyncClient(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+        # Reset Firestore emulator before each test
+        requests.delete(
+            f'http://{os.environ["FIRESTORE_EMULATOR_HOST"]}/emulator/v1/projects/google-cloud-firestore-emulator/databases/{FIRESTORE_DATABASE}/documents',
+            timeout=5,
+        )
+
+    async def asyncSetUp(self) -> None:
+        # The async client must be created in the event loop of the test
+        self.repo = AsyncFirestoreClientRepository(AsyncClient(database=FIRESTORE_DATABASE))
+        self.client = FirestoreClient(database=FIRESTORE_DATABASE)
+        self.sync_repo = FirestoreClientRepository(self.client)
+
+    def add_random_clients(self, n: int) -> list[Client]:
+        clients = [
+            Client(
+                id=cast(str, self.faker.uuid4()),
+                name=self.faker.company(),
+                plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+                email_incidents=self.faker.unique.email(),
+            )
+            for _ in range(n)
+        ]
+        self.sync_repo.create_many(clients)
+
+        return clients
+
+    async def test_get(self) -> None:
+        client = self.add_random_clients(1)[0]
+
+        self.assertEqual(await self.repo.get(client.id), client)
+        self.assertIsNone(await self.repo.get(cast(str, self.faker.uuid4())))
+        self.assertIsNone(await self.repo.get(UUID_UNASSIGNED))
+
+    async def test_get_many(self) -> None:
+        clients = self.add_random_clients(3)
+        missing_id = cast(str, self.faker.uuid4())
+
+        self.assertEqual(
+            await self.repo.get_many([clients[0].id, missing_id, clients[2].id, UUID_UNASSIGNED]),
+            {c.id: c for c in clients[::2]},
+        )
+        self.assertEqual(await self.repo.get_many([]), {})
+
+    async def test_find_by_email(self) -> None:
+        client = self.add_random_clients(1)[0]
+
+        self.assertEqual(await self.repo.find_by_email(client.email_incidents), client)
+        self.assertIsNone(await self.repo.find_by_email(self.faker.unique.email()))
+
+    async def test_find_by_email_unindexed(self) -> None:
+        clients = self.add_random_clients(2)
+        key_refs = [self.client.collection('client_emails').document(key_id(c.email_incidents)) for c in clients]
+        for key_ref in key_refs:
+            key_ref.delete()
+
+        self.assertEqual(await self.repo.find_by_email(clients[0].email_incidents), clients[0])
+        self.assertEqual(
+            await self.repo.find_many_by_email([clients[1].email_incidents]), {clients[1].email_incidents: clients[1]}
+        )
+        for key_ref in key_refs:
+            self.assertTrue(key_ref.get().exists)
+
+    async def test_find_by_email_stale_index(self) -> None:
+        client = self.add_random_clients(1)[0]
+        self.client.collection('clients').document(client.id).delete()
+
+        with self.assertLogs() as cm:
+            self.assertIsNone(await self.repo.find_by_email(client.email_incidents))
+
+        self.assertEqual(cm.records[0].message, f'Stale e-mail index entry for {client.email_incidents}')
+
+    async def test_find_many_by_email(self) -> None:
+        clients = self.add_random_clients(3)
+        missing_email = self.faker.unique.email()
+
+        found = await self.repo.find_many_by_email([clients[0].email_incidents, missing_email, clients[1].email_incidents])
+
+        self.assertEqual(found, {c.email_incidents: c for c in clients[:2]})
+        self.assertEqual(await self.repo.find_many_by_email([]), {})
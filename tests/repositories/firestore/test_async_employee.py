@@ -0,0 +1,100 @@
+import os
+from datetime import UTC
+from typing import cast
+from unittest import IsolatedAsyncioTestCase, skipUnless
+
+import requests
+from faker import Faker
+from google.cloud.firestore import AsyncClient  # type: ignore[import-untyped]
+from google.cloud.firestore import Client as FirestoreClient
+
+from models import Employee, InvitationStatus, Role
+from repositories.firestore import AsyncFirestoreEmployeeRepository, FirestoreEmployeeRepository
+from repositories.firestore.keys import key_id
+
+FIRESTORE_DATABASE = '(default)'
+
+
+@skipUnless('FIRESTORE_EMULATOR_HOST' in os.environ, 'Firestore emulator not available')
+class TestAsyncEmployee(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+        # Reset Firestore emulator before each test
+        requests.delete(
+            f'http://{os.environ["FIRESTORE_EMULATOR_HOST"]}/emulator/v1/projects/google-cloud-firestore-emulator/databases/{FIRESTORE_DATABASE}/documents',
+            timeout=5,
+        )
+
+    async def asyncSetUp(self) -> None:
+        # The async client must be created in the event loop of the test
+        self.sync_repo = FirestoreEmployeeRepository(FirestoreClient(database=FIRESTORE_DATABASE))
+        self.repo = AsyncFirestoreEmployeeRepository(
+            AsyncClient(database=FIRESTORE_DATABASE), agent_pools=self.sync_repo.agent_pools
+        )
+
+    def add_employees(self, num: int, client_id: str | None, role: Role = Role.AGENT) -> list[Employee]:
+        employees = [
+            Employee(
+                id=cast(str, self.faker.uuid4()),
+                client_id=client_id,
+                name=self.faker.name(),
+                email=self.faker.unique.email(),
+                password=self.faker.password(),
+                role=role,
+                invitation_status=InvitationStatus.ACCEPTED,
+                invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+            )
+            for _ in range(num)
+        ]
+        self.sync_repo.create_many(employees)
+
+        return employees
+
+    async def test_get(self) -> None:
+        employee = self.add_employees(1, cast(str, self.faker.uuid4()))[0]
+        unassigned = self.add_employees(1, None)[0]
+
+        self.assertEqual(await self.repo.get(employee.id, employee.client_id), employee)
+        self.assertEqual(await self.repo.get(unassigned.id, None), unassigned)
+        self.assertIsNone(await self.repo.get(employee.id, None))
+
+    async def test_get_many(self) -> None:
+        employees = [*self.add_employees(2, cast(str, self.faker.uuid4())), *self.add_employees(1, None)]
+        missing = (cast(str, self.faker.uuid4()), cast(str, self.faker.uuid4()))
+
+        found = await self.repo.get_many([*((e.client_id, e.id) for e in employees), missing])
+
+        self.assertEqual(found, {(e.client_id, e.id): e for e in employees})
+        self.assertEqual(await self.repo.get_many([]), {})
+
+    async def test_find_by_email(self) -> None:
+        employee = self.add_employees(1, cast(str, self.faker.uuid4()))[0]
+
+        self.assertEqual(await self.repo.find_by_email(employee.email), employee)
+        self.assertIsNone(await self.repo.find_by_email(self.faker.unique.email()))
+
+    async def test_find_by_email_unindexed(self) -> None:
+        employee = self.add_employees(1, cast(str, self.faker.uuid4()))[0]
+        key_ref = self.sync_repo.db.collection('employee_emails').document(key_id(employee.email))
+        key_ref.delete()
+
+        self.assertEqual(await self.repo.find_by_email(employee.email), employee)
+        self.assertTrue(key_ref.get().exists)
+
+    async def test_get_random_agent(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agents = self.add_employees(3, client_id)
+        self.add_employees(2, client_id, Role.ANALYST)
+
+        for _ in range(5):
+            self.assertIn(await self.repo.get_random_agent(client_id), [a.to_summary() for a in agents])
+
+        self.assertIsNone(await self.repo.get_random_agent(cast(str, self.faker.uuid4())))
+
+    async def test_get_random_agent_shares_pools(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agent = self.add_employees(1, client_id)[0]
+
+        self.assertEqual(await self.repo.get_random_agent(client_id), agent.to_summary())
+        self.assertEqual(self.sync_repo.agent_pools.get(client_id), (agent.id,))
@@ -0,0 +1,19 @@
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from repositories.firestore.bulk import bulk_writer_options
+
+
+class TestBulkWriterOptions(ParametrizedTestCase):
+    @parametrize(
+        ('ops_per_second', 'max_ops_per_second', 'expected_max'),
+        [
+            (500, 10000, 10000),  # Ramps up from 500
+            (10000, 10000, 10000),
+            (2000, 1000, 2000),  # Never below the starting rate
+        ],
+    )
+    def test_bulk_writer_options(self, ops_per_second: int, max_ops_per_second: int, expected_max: int) -> None:
+        options = bulk_writer_options(ops_per_second, max_ops_per_second)
+
+        self.assertEqual(options.initial_ops_per_second, ops_per_second)
+        self.assertEqual(options.max_ops_per_second, expected_max)
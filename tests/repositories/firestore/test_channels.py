@@ -0,0 +1,133 @@
+import os
+from typing import Any, cast
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import grpc  # type: ignore[import-untyped]
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from repositories.firestore import PooledFirestoreClient, channels_for
+from repositories.firestore.channels import ChannelPool, ChannelStats
+
+
+class FakeFuture(grpc.Future):  # type: ignore[misc]
+    def __init__(self) -> None:
+        self.callbacks: list[Any] = []
+
+    def finish(self) -> None:
+        for callback in self.callbacks:
+            callback(self)
+
+    def add_done_callback(self, fn: Any) -> None:  # noqa: ANN401
+        self.callbacks.append(fn)
+
+    def cancel(self) -> bool:
+        return False
+
+    def cancelled(self) -> bool:
+        return False
+
+    def running(self) -> bool:
+        return True
+
+    def done(self) -> bool:
+        return False
+
+    def result(self, timeout: float | None = None) -> None:
+        pass
+
+    def exception(self, timeout: float | None = None) -> None:
+        pass
+
+    def traceback(self, timeout: float | None = None) -> None:
+        pass
+
+
+class TestChannelPool(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.channels = [Mock(grpc.Channel) for _ in range(3)]
+        self.pool = ChannelPool(self.channels)
+
+    def in_flight(self) -> list[int]:
+        return [stats.in_flight for stats in self.pool.snapshot()]
+
+    def test_unary_spreads_calls(self) -> None:
+        call = self.pool.unary_unary('/method')
+        for channel in self.channels:
+            cast(Mock, channel.unary_unary).assert_called_once_with('/method')
+
+        for _ in range(6):
+            call('request')
+
+        self.assertEqual(self.pool.snapshot(), [ChannelStats(0, 1, 2)] * 3)
+
+    def test_stream_in_flight_until_done(self) -> None:
+        futures = [FakeFuture() for _ in range(4)]
+        returned = iter(futures)
+        for channel in self.channels:
+            cast(Mock, channel.unary_stream).return_value.side_effect = lambda _: next(returned)
+
+        call = self.pool.unary_stream('/method')
+        for _ in range(3):
+            call('request')
+
+        self.assertEqual(self.in_flight(), [1, 1, 1])
+
+        # The next call goes to the channel that is done with its call
+        futures[1].finish()
+        self.assertEqual(self.in_flight(), [1, 0, 1])
+        call('request')
+        self.assertEqual(self.in_flight(), [1, 1, 1])
+        cast(Mock, self.channels[1].unary_stream.return_value).assert_called_with('request')
+
+    def test_error_releases(self) -> None:
+        for channel in self.channels:
+            cast(Mock, channel.unary_unary).return_value.side_effect = grpc.RpcError()
+
+        call = self.pool.unary_unary('/method')
+        with self.assertRaises(grpc.RpcError):
+            call('request')
+
+        self.assertEqual(self.in_flight(), [0, 0, 0])
+
+    def test_close(self) -> None:
+        self.pool.close()
+
+        for channel in self.channels:
+            cast(Mock, channel.close).assert_called_once()
+
+    @parametrize(
+        ('concurrency', 'channels'),
+        [
+            (1, 1),
+            (8, 1),
+            (100, 1),
+            (101, 2),
+            (500, 5),
+        ],
+    )
+    def test_channels_for(self, concurrency: int, channels: int) -> None:
+        self.assertEqual(channels_for(concurrency), channels)
+
+
+class TestPooledFirestoreClient(TestCase):
+    def test_requests_use_pool(self) -> None:
+        # Nothing listens on the discard port, so the calls fail, but only after going through the pool
+        with patch.dict(os.environ, {'FIRESTORE_EMULATOR_HOST': '127.0.0.1:9'}):
+            client = PooledFirestoreClient('(default)', channels=2, keepalive_time_ms=30000, keepalive_timeout_ms=10000)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):  # noqa: B017
+                client.collection('clients').document('id').get(timeout=1, retry=None)
+
+        self.assertEqual(client.channel_pool.snapshot(), [ChannelStats(0, 1, 1)] * 2)
+        client.close()
+
+    def test_close(self) -> None:
+        with patch.dict(os.environ, {'FIRESTORE_EMULATOR_HOST': '127.0.0.1:9'}):
+            client = PooledFirestoreClient('(default)', channels=2, keepalive_time_ms=30000, keepalive_timeout_ms=10000)
+
+        with patch.object(client.channel_pool, 'close', wraps=client.channel_pool.close) as close:
+            client.close()
+
+        close.assert_called_once_with()
@@ -3,6 +3,7 @@ import os
 from dataclasses import asdict
 from typing import cast
 from unittest import skipUnless
+from unittest.mock import patch
 
 import requests
 from faker import Faker
@@ -13,6 +14,7 @@ from unittest_parametrize import ParametrizedTestCase, parametrize
 from models import Client, Plan
 from repositories.errors import DuplicateEmailError
 from repositories.firestore import UUID_UNASSIGNED, FirestoreClientRepository
+from repositories.firestore.keys import key_id
 
 FIRESTORE_DATABASE = '(default)'
 
@@ -28,12 +30,12 @@ class TestClient(ParametrizedTestCase):
             timeout=5,
         )
 
-        self.repo = FirestoreClientRepository(FIRESTORE_DATABASE)
         self.client = FirestoreClient(database=FIRESTORE_DATABASE)
+        self.repo = FirestoreClientRepository(self.client)
 
         self.emails = [self.faker.unique.email() for _ in range(4)]
 
-    def add_random_clients(self, n: int) -> list[Client]:
+    def add_random_clients(self, n: int, *, indexed: bool = True) -> list[Client]:
         clients: list[Client] = []
 
         # Add n clients to Firestore
@@ -50,6 +52,9 @@ class TestClient(ParametrizedTestCase):
             del client_dict['id']
             self.client.collection('clients').document(client.id).set(client_dict)
 
+            if indexed:
+                self.client.collection('client_emails').document(key_id(client.email_incidents)).set({'id': client.id})
+
         client_ref = self.client.collection('clients').document(UUID_UNASSIGNED)
         with contextlib.suppress(AlreadyExists):
             client_ref.create({})
@@ -57,35 +62,26 @@ class TestClient(ParametrizedTestCase):
         return clients
 
     @parametrize(
-        ('email_idx_map', 'find_idx', 'expected'),
+        ('find_idx', 'expected'),
         [
-            ({0: 0, 1: 1, 2: 2}, 0, 0),  # Client found
-            ({0: 0, 1: 1, 2: 2}, 3, None),  # Client not found
-            ({0: 0, 1: 0, 2: 2}, 0, None),  # Multiple clients found
+            (0, 0),  # Client found
+            (3, None),  # Client not found
         ],
     )
-    def test_find_by_email(self, email_idx_map: dict[int, int], find_idx: int, expected: int | None) -> None:
+    def test_find_by_email(self, find_idx: int, expected: int | None) -> None:
         clients: list[Client] = []
         for idx in range(3):
             client = Client(
                 id=cast(str, self.faker.uuid4()),
                 name=self.faker.company(),
                 plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
-                email_incidents=self.emails[email_idx_map[idx]],
+                email_incidents=self.emails[idx],
             )
             clients.append(client)
-            client_dict = asdict(client)
-            del client_dict['id']
-            self.client.collection('clients').document(client.id).set(client_dict)
-
-        duplicate_emails = len(set(email_idx_map.values())) != len(email_idx_map)
+            self.repo.create(client)
 
-        if duplicate_emails:
-            with self.assertLogs() as cm:
-                client_db = self.repo.find_by_email(self.emails[find_idx])
-        else:
-            with self.assertNoLogs():
-                client_db = self.repo.find_by_email(self.emails[find_idx])
+        with self.assertNoLogs():
+            client_db = self.repo.find_by_email(self.emails[find_idx])
 
         if expected is not None:
             self.assertIsNotNone(client_db)
@@ -93,9 +89,54 @@ class TestClient(ParametrizedTestCase):
         else:
             self.assertIsNone(client_db)
 
-            if duplicate_emails:
-                self.assertEqual(cm.records[0].message, f'Multiple clients found with email {self.emails[find_idx]}')
-                self.assertEqual(cm.records[0].levelname, 'ERROR')
+    def test_find_by_email_stale_index(self) -> None:
+        client = self.add_random_clients(1)[0]
+        self.client.collection('clients').document(client.id).delete()
+
+        with self.assertLogs() as cm:
+            self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+
+        self.assertEqual(cm.records[0].message, f'Stale e-mail index entry for {client.email_incidents}')
+        self.assertEqual(cm.records[0].levelname, 'ERROR')
+
+    def test_find_by_email_unindexed(self) -> None:
+        client = self.add_random_clients(1, indexed=False)[0]
+
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+        # The key document is written, so the next lookup does not query
+        key_doc = self.client.collection('client_emails').document(key_id(client.email_incidents)).get()
+        self.assertEqual(key_doc.to_dict(), {'id': client.id})
+
+    def test_email_index_fallback_off(self) -> None:
+        repo = FirestoreClientRepository(self.client, email_index_fallback=False)
+        client = self.add_random_clients(1)[0]
+        self.client.collection('client_emails').document(key_id(client.email_incidents)).delete()
+
+        self.assertIsNone(repo.find_by_email(client.email_incidents))
+        self.assertEqual(repo.find_many_by_email([client.email_incidents]), {})
+        self.assertFalse(self.client.collection('client_emails').document(key_id(client.email_incidents)).get().exists)
+
+    def test_find_many_by_email_unindexed(self) -> None:
+        indexed = self.add_random_clients(1)[0]
+        unindexed = self.add_random_clients(2, indexed=False)
+        emails = [indexed.email_incidents, *(client.email_incidents for client in unindexed), self.faker.unique.email()]
+
+        self.assertEqual(self.repo.find_many_by_email(emails), {c.email_incidents: c for c in [indexed, *unindexed]})
+        for client in unindexed:
+            self.assertTrue(self.client.collection('client_emails').document(key_id(client.email_incidents)).get().exists)
+
+    def test_backfill_email_index(self) -> None:
+        clients = self.add_random_clients(5, indexed=False)
+
+        last = self.repo.backfill_email_index(page_size=2)
+
+        for client in clients:
+            self.assertTrue(self.client.collection('client_emails').document(key_id(client.email_incidents)).get().exists)
+            self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+        # Resuming after the last client finds nothing left to do
+        self.assertEqual(self.repo.backfill_email_index(page_size=2, start_after=last), last)
 
     def test_create(self) -> None:
         client = Client(
@@ -113,6 +154,9 @@ class TestClient(ParametrizedTestCase):
         del client_dict['id']
         self.assertEqual(doc.to_dict(), client_dict)
 
+        key_doc = self.client.collection('client_emails').document(key_id(client.email_incidents)).get()
+        self.assertEqual(key_doc.to_dict(), {'id': client.id})
+
     def test_create_duplicate(self) -> None:
         client1 = Client(
             id=cast(str, self.faker.uuid4()),
@@ -142,6 +186,58 @@ class TestClient(ParametrizedTestCase):
         doc = self.client.collection('clients').document(client2.id).get()
         self.assertFalse(doc.exists)
 
+    def test_create_unindexed_duplicate(self) -> None:
+        existing = self.add_random_clients(1, indexed=False)[0]
+        client = Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=None,
+            email_incidents=existing.email_incidents,
+        )
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create(client)
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create_many([client])
+
+        self.assertFalse(self.client.collection('clients').document(client.id).get().exists)
+
+    def test_create_many(self) -> None:
+        clients = [
+            Client(
+                id=cast(str, self.faker.uuid4()),
+                name=self.faker.company(),
+                plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+                email_incidents=self.faker.unique.email(),
+            )
+            for _ in range(self.faker.random_int(min=501, max=520))  # More than one batch
+        ]
+
+        self.repo.create_many(clients)
+
+        for client in clients:
+            doc = self.client.collection('clients').document(client.id).get()
+            self.assertTrue(doc.exists)
+            client_dict = asdict(client)
+            del client_dict['id']
+            self.assertEqual(doc.to_dict(), client_dict)
+
+    def test_create_many_duplicate(self) -> None:
+        existing = self.add_random_clients(1)[0]
+        client = Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+            email_incidents=existing.email_incidents,
+        )
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create_many([client])
+
+        doc = self.client.collection('clients').document(client.id).get()
+        self.assertFalse(doc.exists)
+
     def test_get_existing(self) -> None:
         client = self.add_random_clients(1)[0]
 
@@ -155,6 +251,24 @@ class TestClient(ParametrizedTestCase):
 
         self.assertIsNone(client_repo)
 
+    def test_get_many(self) -> None:
+        clients = self.add_random_clients(3)
+        missing_id = cast(str, self.faker.uuid4())
+
+        self.assertEqual(
+            self.repo.get_many([clients[0].id, missing_id, clients[2].id, UUID_UNASSIGNED]), {c.id: c for c in clients[::2]}
+        )
+        self.assertEqual(self.repo.get_many([]), {})
+
+    def test_find_many_by_email(self) -> None:
+        clients = self.add_random_clients(3)
+        missing_email = self.faker.unique.email()
+
+        self.assertEqual(
+            self.repo.find_many_by_email([clients[1].email_incidents, missing_email]),
+            {clients[1].email_incidents: clients[1]},
+        )
+
     def test_get_missing(self) -> None:
         client_repo = self.repo.get(cast(str, self.faker.uuid4()))
 
@@ -178,15 +292,56 @@ class TestClient(ParametrizedTestCase):
             doc = self.client.collection('clients').document(client.id).get()
 
             self.assertFalse(doc.exists)
+            self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+
+        # The placeholder of unassigned employees is kept
+        self.assertTrue(self.client.collection('clients').document(UUID_UNASSIGNED).get().exists)
+
+    def test_delete(self) -> None:
+        client1, client2 = self.add_random_clients(2)
+
+        self.repo.delete(client1.id)
+        self.repo.delete(client1.id)
+
+        self.assertIsNone(self.repo.get(client1.id))
+        self.assertFalse(self.client.collection('client_emails').document(key_id(client1.email_incidents)).get().exists)
+        self.assertEqual(self.repo.find_by_email(client2.email_incidents), client2)
 
     def test_update(self) -> None:
         client = self.add_random_clients(1)[0]
 
         client.plan = cast(Plan, self.faker.random_element(list(Plan)))
-        self.repo.update(client)
+        # The e-mail key does not move, so no transaction is needed
+        with patch.object(self.client, 'transaction') as transaction:
+            self.repo.update(client)
+
+        transaction.assert_not_called()
 
         doc = self.client.collection('clients').document(client.id).get()
         self.assertTrue(doc.exists)
         client_dict = asdict(client)
         del client_dict['id']
         self.assertEqual(doc.to_dict(), client_dict)
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+    def test_update_email(self) -> None:
+        client = self.add_random_clients(1)[0]
+        old_email = client.email_incidents
+
+        client.email_incidents = self.faker.unique.email()
+        self.repo.update(client)
+
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+        self.assertIsNone(self.repo.find_by_email(old_email))
+        self.assertFalse(self.client.collection('client_emails').document(key_id(old_email)).get().exists)
+
+    def test_update_duplicate(self) -> None:
+        client1, client2 = self.add_random_clients(2)
+        old_email = client2.email_incidents
+
+        client2.email_incidents = client1.email_incidents
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.update(client2)
+
+        self.assertEqual(self.repo.find_by_email(client1.email_incidents), client1)
+        self.assertEqual(cast(Client, self.repo.find_by_email(old_email)).id, client2.id)
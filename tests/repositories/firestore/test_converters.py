@@ -0,0 +1,103 @@
+from dataclasses import asdict, dataclass
+from datetime import UTC
+from typing import cast
+from unittest import TestCase
+
+from faker import Faker
+
+from models import Client, Employee, InvitationStatus, Plan, Role
+from repositories.firestore.converters import ConversionError, Converter
+from repositories.firestore.employee import SUMMARY_CONVERTER, SUMMARY_FIELDS
+
+
+class TestConverter(TestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.converter = Converter(Employee, exclude=('id', 'client_id'))
+
+    def gen_employee(self) -> Employee:
+        return Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.name(),
+            email=self.faker.email(),
+            password=self.faker.password(),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=cast(InvitationStatus, self.faker.random_element(list(InvitationStatus))),
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+
+    def test_round_trip(self) -> None:
+        employee = self.gen_employee()
+
+        data = self.converter.to_dict(employee)
+        expected = asdict(employee)
+        del expected['id']
+        del expected['client_id']
+        self.assertEqual(data, expected)
+
+        self.assertEqual(self.converter.from_dict({**data, 'id': employee.id, 'client_id': employee.client_id}), employee)
+
+    def test_summary_projection(self) -> None:
+        employee = self.gen_employee()
+
+        self.assertEqual(SUMMARY_FIELDS, ['name', 'email', 'role', 'invitation_status', 'invitation_date'])
+
+        # A projected document reads into a summary, which has no password
+        data = {field: getattr(employee, field) for field in SUMMARY_FIELDS}
+        summary = SUMMARY_CONVERTER.from_dict({**data, 'id': employee.id, 'client_id': employee.client_id})
+        self.assertEqual(summary, employee.to_summary())
+        self.assertFalse(hasattr(summary, 'password'))
+
+    def test_from_dict_enums(self) -> None:
+        employee = self.gen_employee()
+        data = {**asdict(employee), 'role': employee.role.value, 'invitation_status': employee.invitation_status.value}
+
+        converted = self.converter.from_dict(data)
+
+        self.assertIs(converted.role, employee.role)
+        self.assertIs(converted.invitation_status, employee.invitation_status)
+
+    def test_from_dict_optional(self) -> None:
+        converter = Converter(Client)
+        client = Client(
+            id=cast(str, self.faker.uuid4()), name=self.faker.company(), plan=None, email_incidents=self.faker.email()
+        )
+        data = asdict(client)
+
+        self.assertEqual(converter.from_dict(data), client)
+
+        # Missing optional fields are read as None
+        del data['plan']
+        self.assertEqual(converter.from_dict(data), client)
+
+        self.assertEqual(converter.from_dict({**data, 'plan': 'empresario'}).plan, Plan.EMPRESARIO)
+
+    def test_from_dict_invalid(self) -> None:
+        data = asdict(self.gen_employee())
+
+        with self.assertRaisesRegex(ConversionError, 'Missing field email of Employee'):
+            self.converter.from_dict({k: v for k, v in data.items() if k != 'email'})
+
+        with self.assertRaisesRegex(ConversionError, 'Field name of Employee is not a str'):
+            self.converter.from_dict({**data, 'name': 1})
+
+        with self.assertRaises(ValueError):
+            self.converter.from_dict({**data, 'role': 'owner'})
+
+        with self.assertRaises(ConversionError):
+            self.converter.from_dict({**data, 'client_id': 1})
+
+    def test_unsupported(self) -> None:
+        @dataclass
+        class Unsupported:
+            values: list[str]
+
+        with self.assertRaisesRegex(TypeError, 'Unsupported type'):
+            Converter(Unsupported)
+
+        with self.assertRaisesRegex(TypeError, 'has no fields'):
+            Converter(Client, exclude=('client_id',))
+
+        with self.assertRaisesRegex(TypeError, 'is not a dataclass'):
+            Converter(str)
@@ -3,6 +3,7 @@ from dataclasses import asdict
 from datetime import UTC
 from typing import cast
 from unittest import skipUnless
+from unittest.mock import patch
 
 import requests
 from faker import Faker
@@ -11,9 +12,11 @@ from google.cloud.firestore_v1 import DocumentReference
 from passlib.hash import pbkdf2_sha256
 from unittest_parametrize import ParametrizedTestCase, parametrize
 
-from models import Client, Employee, InvitationStatus, Plan, Role
+from models import Client, Employee, EmployeeSummary, InvitationStatus, Plan, Role
 from repositories import DuplicateEmailError
 from repositories.firestore import UUID_UNASSIGNED, FirestoreEmployeeRepository
+from repositories.firestore.bulk import BatchWriter
+from repositories.firestore.keys import key_id
 
 FIRESTORE_DATABASE = '(default)'
 
@@ -29,12 +32,14 @@ class TestEmployee(ParametrizedTestCase):
             timeout=5,
         )
 
-        self.repo = FirestoreEmployeeRepository(FIRESTORE_DATABASE)
         self.client = FirestoreClient(database=FIRESTORE_DATABASE)
+        self.repo = FirestoreEmployeeRepository(self.client)
 
         self.emails = [self.faker.unique.email() for _ in range(4)]
 
-    def gen_add_employees(self, num: int, client_id: str | None, email: str | None = None) -> list[Employee]:
+    def gen_add_employees(
+        self, num: int, client_id: str | None, email: str | None = None, *, indexed: bool = True
+    ) -> list[Employee]:
         employees: list[Employee] = []
         for _ in range(num):
             employee = Employee(
@@ -53,24 +58,26 @@ class TestEmployee(ParametrizedTestCase):
             del employee_dict['client_id']
 
             client_id = UUID_UNASSIGNED if employee.client_id is None else employee.client_id
-            self.client.collection('clients').document(client_id).collection('employees').document(employee.id).set(
-                employee_dict
+            employee_ref = cast(
+                DocumentReference,
+                self.client.collection('clients').document(client_id).collection('employees').document(employee.id),
             )
+            employee_ref.set(employee_dict)
+
+            if indexed:
+                self.client.collection('employee_emails').document(key_id(employee.email)).set({'path': employee_ref.path})
 
         return employees
 
     @parametrize(
-        ('email_idx_map', 'find_idx', 'assigned', 'expected'),
+        ('find_idx', 'assigned', 'expected'),
         [
-            ({0: 0, 1: 1, 2: 2}, 0, True, 0),  # Employee found
-            ({0: 0, 1: 1, 2: 2}, 3, True, None),  # Employee not found
-            ({0: 0, 1: 0, 2: 2}, 0, True, None),  # Multiple employees found
-            ({0: 0, 1: 1, 2: 2}, 0, False, 0),  # Unassigned employee found
+            (0, True, 0),  # Employee found
+            (3, True, None),  # Employee not found
+            (0, False, 0),  # Unassigned employee found
         ],
     )
-    def test_find_by_email(
-        self, *, email_idx_map: dict[int, int], find_idx: int, assigned: bool, expected: int | None
-    ) -> None:
+    def test_find_by_email(self, *, find_idx: int, assigned: bool, expected: int | None) -> None:
         client = Client(
             id=cast(str, self.faker.uuid4()),
             name=self.faker.company(),
@@ -86,16 +93,10 @@ class TestEmployee(ParametrizedTestCase):
 
         employees = list[Employee]()
         for idx in range(3):
-            employees.append(self.gen_add_employees(1, client_id, self.emails[email_idx_map[idx]])[0])
+            employees.append(self.gen_add_employees(1, client_id, self.emails[idx])[0])
 
-        duplicate_emails = len(set(email_idx_map.values())) != len(email_idx_map)
-
-        if duplicate_emails:
-            with self.assertLogs() as cm:
-                employee_db = self.repo.find_by_email(self.emails[find_idx])
-        else:
-            with self.assertNoLogs():
-                employee_db = self.repo.find_by_email(self.emails[find_idx])
+        with self.assertNoLogs():
+            employee_db = self.repo.find_by_email(self.emails[find_idx])
 
         if expected is not None:
             self.assertIsNotNone(employee_db)
@@ -103,9 +104,67 @@ class TestEmployee(ParametrizedTestCase):
         else:
             self.assertIsNone(employee_db)
 
-            if duplicate_emails:
-                self.assertEqual(cm.records[0].message, f'Multiple employees found with email {self.emails[find_idx]}')
-                self.assertEqual(cm.records[0].levelname, 'ERROR')
+    def test_find_by_email_stale_index(self) -> None:
+        employee = self.gen_add_employees(1, cast(str, self.faker.uuid4()))[0]
+        self.client.collection('clients').document(cast(str, employee.client_id)).collection('employees').document(
+            employee.id
+        ).delete()
+
+        with self.assertLogs() as cm:
+            self.assertIsNone(self.repo.find_by_email(employee.email))
+
+        self.assertEqual(cm.records[0].message, f'Stale e-mail index entry for {employee.email}')
+        self.assertEqual(cm.records[0].levelname, 'ERROR')
+
+    @parametrize(('assigned',), [(True,), (False,)])
+    def test_find_by_email_unindexed(self, *, assigned: bool) -> None:
+        employee = self.gen_add_employees(1, cast(str, self.faker.uuid4()) if assigned else None, indexed=False)[0]
+
+        self.assertEqual(self.repo.find_by_email(employee.email), employee)
+
+        # The key document is written, so the next lookup does not query
+        key_doc = self.client.collection('employee_emails').document(key_id(employee.email)).get()
+        self.assertTrue(key_doc.exists)
+        self.assertEqual(self.client.document(key_doc.get('path')).id, employee.id)
+
+    def test_email_index_fallback_off(self) -> None:
+        repo = FirestoreEmployeeRepository(self.client, email_index_fallback=False)
+        employee = self.gen_add_employees(1, None, indexed=False)[0]
+
+        self.assertIsNone(repo.find_by_email(employee.email))
+        self.assertFalse(self.client.collection('employee_emails').document(key_id(employee.email)).get().exists)
+
+    def test_find_by_email_unindexed_duplicate(self) -> None:
+        self.gen_add_employees(2, cast(str, self.faker.uuid4()), self.emails[0], indexed=False)
+
+        with self.assertLogs() as cm:
+            self.assertIsNone(self.repo.find_by_email(self.emails[0]))
+
+        self.assertEqual(cm.records[0].message, f'Multiple employees found with email {self.emails[0]}')
+        self.assertFalse(self.client.collection('employee_emails').document(key_id(self.emails[0])).get().exists)
+
+    def test_backfill_email_index(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(5, client_id, indexed=False) + self.gen_add_employees(2, None, indexed=False)
+
+        last = self.repo.backfill_email_index(page_size=3)
+
+        for employee in employees:
+            self.assertTrue(self.client.collection('employee_emails').document(key_id(employee.email)).get().exists)
+            self.assertEqual(self.repo.find_by_email(employee.email), employee)
+
+        # Resuming after the last employee finds nothing left to do
+        self.assertEqual(self.repo.backfill_email_index(page_size=3, start_after=last), last)
+
+    def test_backfill_email_index_duplicate(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        self.gen_add_employees(2, client_id, self.emails[0], indexed=False)
+
+        with self.assertLogs() as cm:
+            self.repo.backfill_email_index()
+
+        self.assertIn(f'Multiple employees found with email {self.emails[0]}', [record.message for record in cm.records])
+        self.assertIsNotNone(self.repo.find_by_email(self.emails[0]))
 
     @parametrize(
         ('assigned',),
@@ -177,6 +236,26 @@ class TestEmployee(ParametrizedTestCase):
         del employee_dict['client_id']
         self.assertEqual(doc.to_dict(), employee_dict)
 
+        key_doc = self.client.collection('employee_emails').document(key_id(employee.email)).get()
+        self.assertEqual(key_doc.to_dict(), {'path': employee_ref.path})
+
+    def test_create_placeholder_written_once(self) -> None:
+        for _ in range(3):
+            employee = Employee(
+                id=cast(str, self.faker.uuid4()),
+                client_id=None,
+                name=self.faker.name(),
+                email=self.faker.unique.email(),
+                password=pbkdf2_sha256.hash(self.faker.password()),
+                role=cast(Role, self.faker.random_element(list(Role))),
+                invitation_status=InvitationStatus.UNINVITED,
+                invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+            )
+            self.repo.create(employee)
+
+        self.assertEqual(self.repo.placeholder_writes, 1)
+        self.assertTrue(self.client.collection('clients').document(UUID_UNASSIGNED).get().exists)
+
     def test_create_duplicate(self) -> None:
         client_id = cast(str, self.faker.uuid4())
         self.client.collection('clients').document(client_id).set({})
@@ -195,7 +274,12 @@ class TestEmployee(ParametrizedTestCase):
         del employee_dict['id']
         del employee_dict['client_id']
 
-        self.client.collection('clients').document(client_id).collection('employees').document(employee1.id).set(employee_dict)
+        employee_ref = cast(
+            DocumentReference,
+            self.client.collection('clients').document(client_id).collection('employees').document(employee1.id),
+        )
+        employee_ref.set(employee_dict)
+        self.client.collection('employee_emails').document(key_id(employee1.email)).set({'path': employee_ref.path})
 
         employee2 = Employee(
             id=cast(str, self.faker.uuid4()),
@@ -220,6 +304,111 @@ class TestEmployee(ParametrizedTestCase):
         doc = employee_ref.get()
         self.assertFalse(doc.exists)
 
+    def test_get_many(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(2, client_id) + self.gen_add_employees(1, None)
+        missing = (client_id, cast(str, self.faker.uuid4()))
+
+        keys = [(e.client_id, e.id) for e in employees]
+        self.assertEqual(self.repo.get_many([*keys, missing]), dict(zip(keys, employees, strict=True)))
+        self.assertEqual(self.repo.get_many([]), {})
+
+    def test_create_many(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = [
+            Employee(
+                id=cast(str, self.faker.uuid4()),
+                client_id=client_id if idx % 2 == 0 else None,
+                name=self.faker.name(),
+                email=self.faker.unique.email(),
+                password=pbkdf2_sha256.hash(self.faker.password()),
+                role=cast(Role, self.faker.random_element(list(Role))),
+                invitation_status=cast(InvitationStatus, self.faker.random_element(list(InvitationStatus))),
+                invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+            )
+            for idx in range(40)  # More than one in-query chunk
+        ]
+
+        self.repo.create_many(employees)
+
+        for employee in employees:
+            self.assertEqual(self.repo.get(employee.id, employee.client_id), employee)
+
+        self.assertEqual(self.repo.count(client_id), 20)
+        self.assertEqual(self.repo.count(UUID_UNASSIGNED), 20)
+
+    def test_create_many_duplicate(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        existing = self.gen_add_employees(1, client_id)[0]
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client_id,
+            name=self.faker.name(),
+            email=existing.email,
+            password=pbkdf2_sha256.hash(self.faker.password()),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=cast(InvitationStatus, self.faker.random_element(list(InvitationStatus))),
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+
+        with self.assertRaises(DuplicateEmailError) as context:
+            self.repo.create_many([employee])
+
+        self.assertEqual(str(context.exception), f"A user with the email '{existing.email}' already exists.")
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+
+    @parametrize(('many',), [(False,), (True,)])
+    def test_create_unindexed_duplicate(self, *, many: bool) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        # Written by an instance that predates the index
+        existing = self.gen_add_employees(1, client_id, indexed=False)[0]
+        employee = self.gen_agent(client_id)
+        employee.email = existing.email
+
+        with self.assertRaises(DuplicateEmailError):
+            if many:
+                self.repo.create_many([employee])
+            else:
+                self.repo.create(employee)
+
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+        self.assertFalse(self.client.collection('employee_emails').document(key_id(existing.email)).get().exists)
+
+    def test_move(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, None)[0]
+        self.repo.reconcile_counts()
+
+        employee.client_id = client_id
+        employee.invitation_status = InvitationStatus.PENDING
+        self.assertTrue(self.repo.move(employee, None))
+
+        self.assertIsNone(self.repo.get(employee.id, None))
+        self.assertEqual(self.repo.get(employee.id, client_id), employee)
+        self.assertEqual(self.repo.find_by_email(employee.email), employee)
+        self.assertEqual(self.repo.count(client_id), 1)
+        self.assertEqual(self.repo.count(UUID_UNASSIGNED), 0)
+
+    def test_move_same_client(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, client_id)[0]
+        self.repo.reconcile_counts()
+
+        employee.invitation_status = InvitationStatus.ACCEPTED
+        self.assertTrue(self.repo.move(employee, client_id))
+
+        self.assertEqual(self.repo.get(employee.id, client_id), employee)
+        self.assertEqual(self.repo.count(client_id), 1)
+
+    def test_move_missing(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, None)[0]
+        self.repo.delete(employee.id, None)
+
+        employee.client_id = client_id
+        self.assertFalse(self.repo.move(employee, None))
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+
     def test_delete_all(self) -> None:
         employees: list[Employee] = []
 
@@ -264,11 +453,57 @@ class TestEmployee(ParametrizedTestCase):
         del client_dict['id']
         self.client.collection('clients').document(client.id).set(client_dict)
 
-        self.gen_add_employees(number_of_employees, client.id)
+        employees = self.gen_add_employees(number_of_employees, client.id)
+
+        # Employees written directly have no counter, they are counted by an aggregation that seeds one
+        self.assertEqual(self.repo.count(client.id), number_of_employees)
+        shard = self.client.collection('clients').document(client.id).collection('employee_counters').document('0').get()
+        self.assertEqual(shard.get('count'), number_of_employees)
+        self.assertEqual(self.repo.reconcile_counts(), {client.id: number_of_employees})
+        self.assertEqual(self.repo.count(client.id), number_of_employees)
+
+        # Writes through the repository keep the counter up to date
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client.id,
+            name=self.faker.name(),
+            email=self.faker.unique.email(),
+            password=pbkdf2_sha256.hash(self.faker.password()),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=cast(InvitationStatus, self.faker.random_element(list(InvitationStatus))),
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+        self.repo.create(employee)
+        self.assertEqual(self.repo.count(client.id), number_of_employees + 1)
+
+        self.repo.delete(employees[0].id, client.id)
+        self.repo.delete(employees[0].id, client.id)  # Deleting a missing employee is not counted
+        self.assertEqual(self.repo.count(client.id), number_of_employees)
+
+    def test_reconcile_counts_removed(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(3, client_id)
+        self.repo.reconcile_counts()
+
+        # Removed behind the repository's back
+        for employee in employees:
+            self.client.collection('clients').document(client_id).collection('employees').document(employee.id).delete()
+
+        self.assertEqual(self.repo.reconcile_counts(), {client_id: 0})
+        self.assertEqual(self.repo.count(client_id), 0)
+
+    def test_reconcile_counts_fewer_shards(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        wide_repo = FirestoreEmployeeRepository(self.client, counter_shards=10)
+        for _ in range(20):
+            wide_repo.create(self.gen_agent(client_id))
 
-        count = self.repo.count(client.id)
+        self.assertEqual(self.repo.reconcile_counts(), {client_id: 20})
 
-        self.assertEqual(count, number_of_employees)
+        # The shards above the current count are removed instead of being added up by count()
+        shards = self.client.collection('clients').document(client_id).collection('employee_counters').stream()
+        self.assertEqual({shard.id for shard in shards}, {str(shard) for shard in range(self.repo.counter_shards)})
+        self.assertEqual(self.repo.count(client_id), 20)
 
     def test_count_invalid(self) -> None:
         client_id = cast(str, self.faker.uuid4())
@@ -317,7 +552,34 @@ class TestEmployee(ParametrizedTestCase):
         if limit:
             employees = employees[:random_limit]
 
-        self.assertEqual(employees_db, employees)
+        self.assertEqual(employees_db, [e.to_summary() for e in employees])
+        self.assertTrue(all(not hasattr(e, 'password') for e in employees_db))
+
+    def test_get_all_start_after(self) -> None:
+        client = Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+            email_incidents=self.faker.unique.email(),
+        )
+
+        client_dict = asdict(client)
+        del client_dict['id']
+        self.client.collection('clients').document(client.id).set(client_dict)
+
+        employees = self.gen_add_employees(12, client.id)
+        employees.sort(key=lambda x: (x.invitation_date, x.id), reverse=True)
+
+        pages: list[EmployeeSummary] = []
+        start_after = None
+        while True:
+            page = list(self.repo.get_all(client.id, offset=None, limit=5, start_after=start_after))
+            pages += page
+            if len(page) < 5:  # noqa: PLR2004
+                break
+            start_after = (page[-1].invitation_date, page[-1].id)
+
+        self.assertEqual(pages, [e.to_summary() for e in employees])
 
     @parametrize(
         ('offset', 'limit'),
@@ -351,42 +613,12 @@ class TestEmployee(ParametrizedTestCase):
         # Delete the employee
         self.repo.delete(employee.id, employee.client_id)
 
-        # Verify employee is deleted
+        # Verify employee is deleted, along with its e-mail index entry
         doc = employee_ref.get()
         self.assertFalse(doc.exists)
+        self.assertFalse(self.client.collection('employee_emails').document(key_id(employee.email)).get().exists)
 
-    def test_get_agents_by_client_no_agents(self) -> None:
-        client_id = cast(str, self.faker.uuid4())
-        self.client.collection('clients').document(client_id).set({})
-
-        # No employees added to this client
-        agents = self.repo.get_agents_by_client(client_id)
-
-        # Assert no agents found
-        self.assertEqual(agents, [])
-
-    def test_get_agents_by_client_with_agents(self) -> None:
-        client_id = cast(str, self.faker.uuid4())
-        self.client.collection('clients').document(client_id).set({})
-
-        # Add multiple agents
-        agents = []
-        for _ in range(3):
-            agent = self.gen_add_employees(1, client_id)[0]
-            agent.role = Role.AGENT
-            agent.invitation_status = InvitationStatus.ACCEPTED
-            agent_ref = self.client.collection('clients').document(client_id).collection('employees').document(agent.id)
-            agent_ref.set(asdict(agent))
-            agents.append(agent)
-
-        # Get agents from repository
-        agents_db = self.repo.get_agents_by_client(client_id)
-
-        # Assert that all added agents are returned
-        self.assertEqual(len(agents_db), len(agents))
-        self.assertTrue(all(agent in agents for agent in agents_db))
-
-    def test_get_agents_by_client_no_matching_role(self) -> None:
+    def test_get_random_agent_no_matching_role(self) -> None:
         client_id = cast(str, self.faker.uuid4())
         self.client.collection('clients').document(client_id).set({})
 
@@ -397,11 +629,8 @@ class TestEmployee(ParametrizedTestCase):
             employee_ref = self.client.collection('clients').document(client_id).collection('employees').document(employee.id)
             employee_ref.set(asdict(employee))
 
-        # Get agents from repository
-        agents_db = self.repo.get_agents_by_client(client_id)
-
-        # Assert that no agents are found
-        self.assertEqual(agents_db, [])
+        # Assert that no agent is found
+        self.assertIsNone(self.repo.get_random_agent(client_id))
 
     def test_get_random_agent_no_agents(self) -> None:
         client_id = cast(str, self.faker.uuid4())
@@ -427,9 +656,8 @@ class TestEmployee(ParametrizedTestCase):
         # Get random agent
         agent_db = self.repo.get_random_agent(client_id)
 
-        # Assert the returned agent is the same as the only one added
-        self.assertIsNotNone(agent_db)
-        self.assertEqual(agent_db, agent)
+        # Assert the returned agent is the same as the only one added, without its password hash
+        self.assertEqual(agent_db, agent.to_summary())
 
     def test_get_random_agent_multiple_agents(self) -> None:
         client_id = cast(str, self.faker.uuid4())
@@ -448,5 +676,69 @@ class TestEmployee(ParametrizedTestCase):
         # Get random agent multiple times to test randomness
         for _ in range(10):
             agent_db = self.repo.get_random_agent(client_id)
-            self.assertIsNotNone(agent_db)
-            self.assertIn(agent_db, agents)
+            self.assertIn(agent_db, [a.to_summary() for a in agents])
+
+    def gen_agent(self, client_id: str) -> Employee:
+        return Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client_id,
+            name=self.faker.name(),
+            email=self.faker.unique.email(),
+            password=pbkdf2_sha256.hash(self.faker.password()),
+            role=Role.AGENT,
+            invitation_status=InvitationStatus.ACCEPTED,
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+
+    def test_get_agent_ids(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agents = [self.gen_agent(client_id) for _ in range(3)]
+        for agent in agents:
+            self.repo.create(agent)
+
+        agent_ids = self.repo.get_agent_ids(client_id)
+
+        self.assertEqual(set(agent_ids), {agent.id for agent in agents})
+        self.assertIs(self.repo.get_agent_ids(client_id), agent_ids)
+
+    def test_get_random_agent_pool_invalidated(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+
+        # Caches the empty pool
+        self.assertIsNone(self.repo.get_random_agent(client_id))
+
+        agent = self.gen_agent(client_id)
+        self.repo.create(agent)
+        self.assertEqual(self.repo.get_random_agent(client_id), agent.to_summary())
+
+        self.repo.delete(agent.id, client_id)
+        self.assertIsNone(self.repo.get_random_agent(client_id))
+
+    def test_create_many_agent_pool(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agent = self.gen_agent(client_id)
+        commit = BatchWriter.commit
+
+        # A pool rebuilt while the batch is committing must not outlive it
+        def rebuild_and_commit(writer: BatchWriter) -> None:
+            self.assertEqual(self.repo.get_agent_ids(client_id), ())
+            commit(writer)
+
+        with patch.object(BatchWriter, 'commit', rebuild_and_commit):
+            self.repo.create_many([agent])
+
+        self.assertEqual(self.repo.get_random_agent(client_id), agent.to_summary())
+
+    def test_get_random_agent_stale_pool(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        agent1 = self.gen_agent(client_id)
+        agent2 = self.gen_agent(client_id)
+        self.repo.create(agent1)
+        self.repo.create(agent2)
+        self.assertIsNotNone(self.repo.get_random_agent(client_id))
+
+        # Removed behind the repository's back, as another instance would
+        self.client.collection('clients').document(client_id).collection('employees').document(agent1.id).delete()
+
+        for _ in range(5):
+            self.assertEqual(self.repo.get_random_agent(client_id), agent2.to_summary())
@@ -0,0 +1,20 @@
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from repositories.firestore.keys import key_id
+
+
+class TestKeyId(ParametrizedTestCase):
+    @parametrize(
+        ('value', 'expected'),
+        [
+            ('user+tag@example.com', 'user+tag@example.com'),
+            ('a/b@example.com', 'a%2Fb@example.com'),
+            ('', '%'),
+            ('.', '%.'),
+            ('..', '%..'),
+            ('__id__', '%__id__'),
+            ('%', '%25'),
+        ],
+    )
+    def test_key_id(self, value: str, expected: str) -> None:
+        self.assertEqual(key_id(value), expected)
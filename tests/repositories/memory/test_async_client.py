@@ -0,0 +1,23 @@
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+
+from faker import Faker
+
+from models import Client
+from repositories.memory import AsyncMemoryClientRepository, MemoryClientRepository
+
+
+class TestAsyncMemoryClient(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.clients = MemoryClientRepository()
+        self.client_repo = AsyncMemoryClientRepository(self.clients)
+
+    async def test_reads(self) -> None:
+        client = Client(id=cast(str, self.faker.uuid4()), name=self.faker.company(), plan=None, email_incidents='a@b.com')
+        self.clients.create(client)
+
+        self.assertEqual(await self.client_repo.get(client.id), client)
+        self.assertEqual(await self.client_repo.get_many([client.id]), {client.id: client})
+        self.assertEqual(await self.client_repo.find_by_email('a@b.com'), client)
+        self.assertEqual(await self.client_repo.find_many_by_email(['a@b.com', 'c@d.com']), {'a@b.com': client})
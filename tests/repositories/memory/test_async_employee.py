@@ -0,0 +1,34 @@
+from datetime import UTC
+from typing import cast
+from unittest import IsolatedAsyncioTestCase
+
+from faker import Faker
+
+from models import Employee, InvitationStatus, Role
+from repositories.memory import AsyncMemoryEmployeeRepository, MemoryEmployeeRepository
+
+
+class TestAsyncMemoryEmployee(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.employees = MemoryEmployeeRepository()
+        self.employee_repo = AsyncMemoryEmployeeRepository(self.employees)
+
+    async def test_reads(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client_id,
+            name=self.faker.name(),
+            email=self.faker.unique.email(),
+            password=self.faker.password(),
+            role=Role.AGENT,
+            invitation_status=InvitationStatus.ACCEPTED,
+            invitation_date=self.faker.past_datetime(tzinfo=UTC),
+        )
+        self.employees.create(employee)
+
+        self.assertEqual(await self.employee_repo.get(employee.id, client_id), employee)
+        self.assertEqual(await self.employee_repo.get_many([(client_id, employee.id)]), {(client_id, employee.id): employee})
+        self.assertEqual(await self.employee_repo.find_by_email(employee.email), employee)
+        self.assertEqual(await self.employee_repo.get_random_agent(client_id), employee.to_summary())
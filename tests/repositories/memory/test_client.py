@@ -0,0 +1,146 @@
+from typing import cast
+from unittest import TestCase
+
+from faker import Faker
+
+from models import Client, Plan
+from repositories.errors import DuplicateEmailError
+from repositories.firestore import UUID_UNASSIGNED
+from repositories.memory import MemoryClientRepository
+
+
+class TestClient(TestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.repo = MemoryClientRepository()
+
+    def gen_client(self, email: str | None = None) -> Client:
+        return Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=self.faker.random_element(cast(list[Plan | None], [*list(Plan), None])),
+            email_incidents=self.faker.unique.email() if email is None else email,
+        )
+
+    def add_random_clients(self, n: int) -> list[Client]:
+        clients = [self.gen_client() for _ in range(n)]
+        for client in clients:
+            self.repo.create(client)
+
+        return clients
+
+    def test_create_get(self) -> None:
+        client = self.add_random_clients(1)[0]
+
+        self.assertEqual(self.repo.get(client.id), client)
+
+    def test_create_duplicate(self) -> None:
+        client1 = self.add_random_clients(1)[0]
+        client2 = self.gen_client(email=client1.email_incidents)
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create(client2)
+
+        self.assertIsNone(self.repo.get(client2.id))
+
+    def test_create_many(self) -> None:
+        clients = [self.gen_client() for _ in range(3)]
+
+        self.repo.create_many(clients)
+
+        for client in clients:
+            self.assertEqual(self.repo.get(client.id), client)
+            self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+
+    def test_create_many_duplicate(self) -> None:
+        existing = self.add_random_clients(1)[0]
+        clients = [self.gen_client(), self.gen_client(email=existing.email_incidents)]
+
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create_many(clients)
+
+        self.assertIsNone(self.repo.get(clients[0].id))
+
+        # Duplicates within the batch are rejected as well
+        client = self.gen_client()
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.create_many([client, self.gen_client(email=client.email_incidents)])
+
+        self.assertIsNone(self.repo.get(client.id))
+
+    def test_get_many(self) -> None:
+        clients = self.add_random_clients(3)
+        missing_id = cast(str, self.faker.uuid4())
+
+        self.assertEqual(self.repo.get_many([clients[0].id, missing_id, clients[2].id]), {c.id: c for c in clients[::2]})
+        self.assertEqual(
+            self.repo.find_many_by_email([clients[1].email_incidents, self.faker.unique.email()]),
+            {clients[1].email_incidents: clients[1]},
+        )
+
+    def test_get_missing(self) -> None:
+        self.add_random_clients(1)
+
+        self.assertIsNone(self.repo.get(cast(str, self.faker.uuid4())))
+        self.assertIsNone(self.repo.get(UUID_UNASSIGNED))
+
+    def test_get_returns_copy(self) -> None:
+        client = self.add_random_clients(1)[0]
+
+        client_repo = cast(Client, self.repo.get(client.id))
+        client_repo.name = self.faker.company()
+
+        self.assertEqual(self.repo.get(client.id), client)
+
+    def test_find_by_email(self) -> None:
+        clients = self.add_random_clients(3)
+
+        self.assertEqual(self.repo.find_by_email(clients[1].email_incidents), clients[1])
+        self.assertIsNone(self.repo.find_by_email(self.faker.unique.email()))
+
+    def test_get_all(self) -> None:
+        clients = self.add_random_clients(5)
+
+        self.assertEqual(list(self.repo.get_all()), sorted(clients, key=lambda c: c.name))
+
+    def test_delete_all(self) -> None:
+        clients = self.add_random_clients(5)
+
+        self.repo.delete_all()
+
+        for client in clients:
+            self.assertIsNone(self.repo.get(client.id))
+            self.assertIsNone(self.repo.find_by_email(client.email_incidents))
+
+    def test_update(self) -> None:
+        client = self.add_random_clients(1)[0]
+        old_email = client.email_incidents
+
+        client.plan = cast(Plan, self.faker.random_element(list(Plan)))
+        client.email_incidents = self.faker.unique.email()
+        self.repo.update(client)
+
+        self.assertEqual(self.repo.get(client.id), client)
+        self.assertEqual(self.repo.find_by_email(client.email_incidents), client)
+        self.assertIsNone(self.repo.find_by_email(old_email))
+
+    def test_delete(self) -> None:
+        client1, client2 = self.add_random_clients(2)
+
+        self.repo.delete(client1.id)
+        self.repo.delete(client1.id)
+
+        self.assertIsNone(self.repo.get(client1.id))
+        self.assertIsNone(self.repo.find_by_email(client1.email_incidents))
+        self.assertEqual(self.repo.get(client2.id), client2)
+
+    def test_update_duplicate(self) -> None:
+        client1, client2 = self.add_random_clients(2)
+        old_email = client2.email_incidents
+
+        client2.email_incidents = client1.email_incidents
+        with self.assertRaises(DuplicateEmailError):
+            self.repo.update(client2)
+
+        self.assertEqual(self.repo.find_by_email(client1.email_incidents), client1)
+        self.assertEqual(cast(Client, self.repo.find_by_email(old_email)).id, client2.id)
@@ -0,0 +1,250 @@
+from datetime import UTC
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from models import Employee, EmployeeSummary, InvitationStatus, Role
+from repositories import DuplicateEmailError
+from repositories.memory import MemoryEmployeeRepository
+
+
+class TestEmployee(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.repo = MemoryEmployeeRepository()
+
+    def gen_employee(self, client_id: str | None, email: str | None = None) -> Employee:
+        return Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=client_id,
+            name=self.faker.name(),
+            email=self.faker.unique.email() if email is None else email,
+            password=self.faker.password(),
+            role=cast(Role, self.faker.random_element(list(Role))),
+            invitation_status=cast(InvitationStatus, self.faker.random_element(list(InvitationStatus))),
+            invitation_date=self.faker.past_datetime(start_date='-30d', tzinfo=UTC),
+        )
+
+    def gen_add_employees(self, num: int, client_id: str | None) -> list[Employee]:
+        employees = [self.gen_employee(client_id) for _ in range(num)]
+        for employee in employees:
+            self.repo.create(employee)
+
+        return employees
+
+    def gen_add_agents(self, num: int, client_id: str) -> list[Employee]:
+        agents: list[Employee] = []
+        for _ in range(num):
+            agent = self.gen_employee(client_id)
+            agent.role = Role.AGENT
+            agent.invitation_status = InvitationStatus.ACCEPTED
+            self.repo.create(agent)
+            agents.append(agent)
+
+        return agents
+
+    @parametrize(
+        ('assigned',),
+        [
+            (True,),  # Assigned employee
+            (False,),  # Unassigned employee
+        ],
+    )
+    def test_create_get(self, *, assigned: bool) -> None:
+        client_id = cast(str, self.faker.uuid4()) if assigned else None
+        employee = self.gen_add_employees(1, client_id)[0]
+
+        self.assertEqual(self.repo.get(employee.id, client_id), employee)
+        self.assertIsNone(self.repo.get(employee.id, cast(str, self.faker.uuid4())))
+
+    def test_create_duplicate(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee1 = self.gen_add_employees(1, client_id)[0]
+        employee2 = self.gen_employee(client_id, email=employee1.email)
+
+        with self.assertRaises(DuplicateEmailError) as context:
+            self.repo.create(employee2)
+
+        self.assertEqual(str(context.exception), f"A user with the email '{employee2.email}' already exists.")
+        self.assertIsNone(self.repo.get(employee2.id, client_id))
+
+    def test_get_many(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(2, client_id) + self.gen_add_employees(1, None)
+        missing = (client_id, cast(str, self.faker.uuid4()))
+
+        keys = [(e.client_id, e.id) for e in employees]
+        self.assertEqual(self.repo.get_many([*keys, missing]), dict(zip(keys, employees, strict=True)))
+
+    def test_create_many(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = [self.gen_employee(client_id) for _ in range(3)] + [self.gen_employee(None)]
+
+        self.repo.create_many(employees)
+
+        for employee in employees:
+            self.assertEqual(self.repo.get(employee.id, employee.client_id), employee)
+
+        self.assertEqual(self.repo.count(client_id), 3)
+
+    def test_create_many_duplicate(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        existing = self.gen_add_employees(1, client_id)[0]
+        employees = [self.gen_employee(client_id), self.gen_employee(client_id, email=existing.email)]
+
+        with self.assertRaises(DuplicateEmailError) as context:
+            self.repo.create_many(employees)
+
+        self.assertEqual(str(context.exception), f"A user with the email '{existing.email}' already exists.")
+        self.assertIsNone(self.repo.get(employees[0].id, client_id))
+        self.assertEqual(self.repo.count(client_id), 1)
+
+    def test_move(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, None)[0]
+
+        employee.client_id = client_id
+        employee.invitation_status = InvitationStatus.PENDING
+        self.assertTrue(self.repo.move(employee, None))
+
+        self.assertIsNone(self.repo.get(employee.id, None))
+        self.assertEqual(self.repo.get(employee.id, client_id), employee)
+        self.assertEqual(self.repo.find_by_email(employee.email), employee)
+        self.assertEqual(self.repo.count(client_id), 1)
+        self.assertEqual(list(self.repo.get_all(client_id, None, None)), [employee.to_summary()])
+
+    def test_move_missing(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_employee(client_id)
+
+        self.assertFalse(self.repo.move(employee, None))
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+
+    def test_create_stores_copy(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, None)[0]
+
+        employee.client_id = client_id
+
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+        self.assertIsNotNone(self.repo.get(employee.id, None))
+
+    def test_find_by_email(self) -> None:
+        employees = self.gen_add_employees(3, cast(str, self.faker.uuid4()))
+
+        self.assertEqual(self.repo.find_by_email(employees[1].email), employees[1])
+        self.assertIsNone(self.repo.find_by_email(self.faker.unique.email()))
+
+    def test_delete(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employee = self.gen_add_employees(1, client_id)[0]
+
+        self.repo.delete(employee.id, client_id)
+
+        self.assertIsNone(self.repo.get(employee.id, client_id))
+        self.assertIsNone(self.repo.find_by_email(employee.email))
+        self.assertEqual(self.repo.count(client_id), 0)
+        self.assertEqual(list(self.repo.get_all(client_id, offset=None, limit=None)), [])
+
+        # Email can be reused after deletion
+        self.repo.create(employee)
+        self.assertEqual(self.repo.find_by_email(employee.email), employee)
+
+    def test_delete_missing(self) -> None:
+        self.repo.delete(cast(str, self.faker.uuid4()), cast(str, self.faker.uuid4()))
+
+    def test_delete_all(self) -> None:
+        employees: list[Employee] = []
+        for _ in range(3):
+            employees += self.gen_add_employees(3, cast(str, self.faker.uuid4()))
+
+        self.repo.delete_all()
+
+        for employee in employees:
+            self.assertIsNone(self.repo.get(employee.id, employee.client_id))
+            self.assertIsNone(self.repo.find_by_email(employee.email))
+
+    def test_count(self) -> None:
+        number_of_employees = self.faker.random_int(min=5, max=15)
+        client_id = cast(str, self.faker.uuid4())
+        self.gen_add_employees(number_of_employees, client_id)
+        self.gen_add_employees(3, cast(str, self.faker.uuid4()))
+
+        self.assertEqual(self.repo.count(client_id), number_of_employees)
+        self.assertEqual(self.repo.count(cast(str, self.faker.uuid4())), 0)
+
+    @parametrize(
+        ('offset', 'limit'),
+        [
+            (False, False),  # No offset and limit
+            (True, False),  # Offset but no limit
+            (False, True),  # Limit but no offset
+            (True, True),  # Offset and limit
+        ],
+    )
+    def test_get_all(self, *, offset: bool, limit: bool) -> None:
+        number_of_employees = self.faker.random_int(min=10, max=20)
+        random_offset = self.faker.random_int(min=2, max=6)
+        random_limit = self.faker.random_int(min=2, max=6)
+        client_id = cast(str, self.faker.uuid4())
+
+        employees = self.gen_add_employees(number_of_employees, client_id)
+        self.gen_add_employees(3, cast(str, self.faker.uuid4()))
+
+        employees_db = list(
+            self.repo.get_all(
+                client_id,
+                offset=random_offset if offset else None,
+                limit=random_limit if limit else None,
+            )
+        )
+
+        employees.sort(key=lambda x: (x.invitation_date, x.id), reverse=True)
+        if offset:
+            employees = employees[random_offset:]
+        if limit:
+            employees = employees[:random_limit]
+
+        self.assertEqual(employees_db, [e.to_summary() for e in employees])
+
+    def test_get_all_start_after(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(12, client_id)
+        employees.sort(key=lambda x: (x.invitation_date, x.id), reverse=True)
+
+        pages: list[EmployeeSummary] = []
+        start_after = None
+        while True:
+            page = list(self.repo.get_all(client_id, offset=None, limit=5, start_after=start_after))
+            pages += page
+            if len(page) < 5:  # noqa: PLR2004
+                break
+            start_after = (page[-1].invitation_date, page[-1].id)
+
+        self.assertEqual(pages, [e.to_summary() for e in employees])
+
+    def test_get_all_start_after_ties(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        employees = self.gen_add_employees(6, client_id)
+        for employee in employees:
+            self.repo.delete(employee.id, client_id)
+            employee.invitation_date = employees[0].invitation_date
+            self.repo.create(employee)
+        employees.sort(key=lambda x: x.id, reverse=True)
+
+        page = list(
+            self.repo.get_all(client_id, offset=None, limit=None, start_after=(employees[2].invitation_date, employees[2].id))
+        )
+
+        self.assertEqual(page, [e.to_summary() for e in employees[3:]])
+
+    def test_get_random_agent(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+
+        self.assertIsNone(self.repo.get_random_agent(client_id))
+
+        agents = self.gen_add_agents(5, client_id)
+
+        for _ in range(10):
+            self.assertIn(self.repo.get_random_agent(client_id), [a.to_summary() for a in agents])
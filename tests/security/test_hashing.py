@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import cast
+
+from faker import Faker
+from passlib.hash import pbkdf2_sha256
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from security import HashingUnavailableError, PasswordHasher, max_queue_for
+
+
+class TestPasswordHasher(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    @parametrize(
+        'workers',
+        [
+            (0,),  # Inline
+            (1,),  # Process pool
+        ],
+    )
+    def test_hash_verify(self, workers: int) -> None:
+        hasher = PasswordHasher(workers=workers, max_queue=4)
+        self.addCleanup(hasher.shutdown)
+        password = self.faker.password()
+
+        password_hash = hasher.hash(password)
+
+        self.assertTrue(pbkdf2_sha256.verify(password, password_hash))
+        self.assertTrue(hasher.verify(password, password_hash))
+        self.assertFalse(hasher.verify(self.faker.password(), password_hash))
+
+        metrics = hasher.get_metrics()
+        self.assertEqual(metrics.completed, 3)
+        self.assertEqual(metrics.rejected, 0)
+        self.assertGreater(metrics.hash_time_total, 0)
+        self.assertGreaterEqual(metrics.hash_time_total, metrics.hash_time_max)
+        self.assertGreaterEqual(metrics.queue_wait_total, metrics.queue_wait_max)
+
+    @parametrize(
+        'workers',
+        [
+            (0,),
+            (2,),
+        ],
+    )
+    def test_warm_up(self, workers: int) -> None:
+        hasher = PasswordHasher(workers=workers, max_queue=4)
+        self.addCleanup(hasher.shutdown)
+
+        hasher.warm_up()
+
+        # Starting the workers is not a hash
+        self.assertEqual(hasher.get_metrics().completed, 0)
+        self.assertTrue(hasher.verify('secret', pbkdf2_sha256.hash('secret')))
+
+    def test_saturated(self) -> None:
+        hasher = PasswordHasher(workers=0, max_queue=1, retry_after=7)
+
+        # Occupy every slot, as if two requests were already hashing or queued
+        hasher.slots.acquire()
+        hasher.slots.acquire()
+
+        with self.assertRaises(HashingUnavailableError) as context, self.assertLogs() as cm:
+            hasher.hash(self.faker.password())
+
+        self.assertEqual(context.exception.retry_after, 7)
+        self.assertEqual(cm.records[0].levelname, 'WARNING')
+        self.assertEqual(hasher.get_metrics().rejected, 1)
+
+        hasher.slots.release()
+        self.assertTrue(hasher.verify('secret', pbkdf2_sha256.hash('secret')))
+
+    def test_worker_died(self) -> None:
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        self.addCleanup(hasher.shutdown)
+        hasher.warm_up()
+
+        # Kill the worker, as if it ran out of memory
+        executor = cast(ProcessPoolExecutor, hasher.executor)
+        with self.assertRaises(BrokenProcessPool):
+            executor.submit(os._exit, 1).result()
+
+        with self.assertLogs() as cm:
+            self.assertTrue(hasher.verify('secret', pbkdf2_sha256.hash('secret')))
+
+        self.assertEqual(cm.records[0].levelname, 'ERROR')
+        self.assertIsNot(hasher.executor, executor)
+        self.assertEqual(hasher.get_metrics().worker_restarts, 1)
+        self.assertEqual(hasher.get_metrics().completed, 1)
+
+    def test_worker_died_again(self) -> None:
+        hasher = PasswordHasher(workers=1, max_queue=1, retry_after=7)
+        self.addCleanup(hasher.shutdown)
+
+        # A hash that kills every worker it runs on is not retried forever
+        with self.assertRaises(HashingUnavailableError) as context, self.assertLogs():
+            hasher._run(os._exit, 1)  # noqa: SLF001
+
+        self.assertEqual(context.exception.retry_after, 7)
+        self.assertEqual(hasher.get_metrics().worker_restarts, 2)
+        self.assertTrue(hasher.verify('secret', pbkdf2_sha256.hash('secret')))
+
+    @parametrize(
+        ('threads', 'workers', 'max_queue'),
+        [
+            (8, 1, 6),
+            (8, 0, 6),
+            (8, 4, 3),
+            (2, 1, 0),
+            (1, 1, 0),
+        ],
+    )
+    def test_max_queue_for(self, threads: int, workers: int, max_queue: int) -> None:
+        self.assertEqual(max_queue_for(threads, workers), max_queue)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ec import SECP256R1, generate_private_key
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from faker import Faker
+
+from security import TokenSigner
+
+
+class TestTokenSigner(TestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        private_key = Ed25519PrivateKey.generate()
+        self.public_key = private_key.public_key()
+        self.private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+    def test_sign(self) -> None:
+        payload = {'sub': self.faker.uuid4(), 'email': self.faker.email(), 'cid': None, 'iat': 1700000000}
+
+        for key in (self.private_pem, self.private_pem.decode()):
+            token = TokenSigner(key).sign(payload)
+
+            self.assertEqual(jwt.get_unverified_header(token), {'alg': 'EdDSA', 'typ': 'JWT'})
+            self.assertEqual(jwt.decode(token, self.public_key, algorithms=['EdDSA']), payload)
+            self.assertEqual(token, jwt.encode(payload, self.private_pem, algorithm='EdDSA'))
+
+    def test_invalid_key_type(self) -> None:
+        ec_pem = generate_private_key(SECP256R1()).private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
+        with self.assertRaises(TypeError):
+            TokenSigner(ec_pem)
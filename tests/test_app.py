@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from app import create_app, init_worker, warm_up_steps
+
+
+class TestWarmUpSteps(TestCase):
+    def setUp(self) -> None:
+        self.app = create_app()
+
+    def tearDown(self) -> None:
+        self.app.container.unwire()
+
+    def test_memory(self) -> None:
+        self.app.container.config.repository.backend.override('memory')
+
+        steps = dict(warm_up_steps(self.app.container, prime_caches=True))
+        self.assertEqual(list(steps), ['repositories', 'body_schemas', 'password_hasher', 'client_cache'])
+
+        for step in steps.values():
+            step()
+
+    def test_firestore(self) -> None:
+        self.app.container.config.jwt.private_key.override('key')
+
+        steps = [name for name, _ in warm_up_steps(self.app.container, prime_caches=False)]
+        self.assertEqual(steps, ['repositories', 'body_schemas', 'password_hasher', 'firestore', 'jwt_key'])
+
+    def test_enabled(self) -> None:
+        with patch.dict(os.environ, {'ENABLE_WARMUP': '1', 'REPOSITORY_BACKEND': 'memory'}):
+            app = create_app()
+        self.addCleanup(app.container.unwire)
+
+        warmup = app.container.warmup()
+        self.assertTrue(warmup.done.wait(30))
+        self.assertEqual(warmup.report()['errors'], {})
+
+
+class TestConfig(TestCase):
+    def test_email_index_fallback(self) -> None:
+        with patch.dict(os.environ):
+            os.environ.pop('EMAIL_INDEX_FALLBACK', None)
+            app = create_app()
+        self.addCleanup(app.container.unwire)
+
+        # On by default, until it is turned off after the rollout
+        self.assertTrue(app.container.config.firestore.email_index_fallback())
+
+        with patch.dict(os.environ, {'EMAIL_INDEX_FALLBACK': '0'}):
+            app = create_app()
+        self.addCleanup(app.container.unwire)
+
+        self.assertFalse(app.container.config.firestore.email_index_fallback())
+
+
+class TestPreload(TestCase):
+    def test_init_worker(self) -> None:
+        with patch.dict(os.environ, {'REPOSITORY_BACKEND': 'memory'}):
+            app = create_app(preload=True)
+        self.addCleanup(app.container.unwire)
+
+        # Nothing that is bound to a process is created before the workers are forked
+        self.assertFalse(app.container.warmup().is_ready())
+        self.assertFalse(app.container.worker_resources.initialized)
+
+        init_worker(app)
+        self.addCleanup(app.container.shutdown_resources)
+
+        self.assertTrue(app.container.warmup().is_ready())
+        self.assertTrue(app.container.worker_resources.initialized)
+
+
+class TestImports(TestCase):
+    def test_lazy_imports(self) -> None:
+        # Run in a new interpreter, the other tests import all of them
+        code = 'import sys, app; app.create_app(); print(*sorted({"demo", "quart", "hypercorn"} & sys.modules.keys()))'
+        root = Path(__file__).parents[1]
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True, text=True, cwd=root)  # noqa: S603
+
+        self.assertEqual(result.stdout.strip(), '')
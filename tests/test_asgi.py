@@ -0,0 +1,115 @@
+import asyncio
+import json
+from typing import Any, cast
+from unittest import IsolatedAsyncioTestCase
+
+from faker import Faker
+from hypercorn.typing import ASGIReceiveEvent, ASGISendEvent, HTTPScope
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from asgi import create_asgi_app
+from blueprints.client import client_to_dict
+from models import Client
+
+
+class TestASGIRouting(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.asgi = create_asgi_app()
+
+    def tearDown(self) -> None:
+        self.asgi.app.container.unwire()
+
+    @parametrize(
+        ('method', 'path', 'is_async'),
+        [
+            ('GET', '/api/v1/clients/7e8b2bd2-5b7d-4d3c-9d55-4fd4a8b0d1a1', True),
+            ('POST', '/api/v1/clients/detail', True),
+            ('POST', '/api/v1/clients/batch', True),
+            ('GET', '/api/v1/employees/7e8b2bd2-5b7d-4d3c-9d55-4fd4a8b0d1a1/x', True),
+            ('POST', '/api/v1/employees/batch', True),
+            ('GET', '/api/v1/random/7e8b2bd2-5b7d-4d3c-9d55-4fd4a8b0d1a1/agent', True),
+            # Static rules of the Flask app take precedence over the variable ones of the asyncio views
+            ('GET', '/api/v1/clients/me', False),
+            ('POST', '/api/v1/clients', False),
+            ('GET', '/api/v1/employees/me', False),
+            ('POST', '/api/v1/employees/detail', False),
+            ('GET', '/api/v1/health/client', False),
+            ('GET', '/not-found', False),
+            ('DELETE', '/api/v1/clients/batch', False),
+        ],
+    )
+    def test_is_async(self, method: str, path: str, *, is_async: bool) -> None:
+        self.assertEqual(self.asgi.is_async(path, method), is_async)
+
+
+class TestASGIApp(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.asgi = create_asgi_app()
+        self.asgi.app.container.config.repository.backend.override('memory')
+
+    def tearDown(self) -> None:
+        self.asgi.app.container.unwire()
+
+    async def call(self, method: str, path: str) -> tuple[int, Any]:
+        scope = cast(
+            HTTPScope,
+            {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': method,
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [(b'host', b'localhost')],
+                'client': ('127.0.0.1', 1234),
+                'server': ('localhost', 80),
+                'extensions': {},
+            },
+        )
+        sent: list[ASGISendEvent] = []
+        requested = False
+        responded = asyncio.Event()
+
+        # The apps keep receiving after the request, to find out when the client disconnects
+        async def receive() -> ASGIReceiveEvent:
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            await responded.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(event: ASGISendEvent) -> None:
+            sent.append(event)
+            if event['type'] == 'http.response.body' and not event.get('more_body', False):
+                responded.set()
+
+        await self.asgi(scope, receive, send)
+
+        start = cast(dict[str, Any], sent[0])
+        body = b''.join(cast(dict[str, Any], event).get('body', b'') for event in sent[1:])
+        return start['status'], json.loads(body)
+
+    async def test_shared_repositories(self) -> None:
+        client = Client(
+            id=cast(str, self.faker.uuid4()),
+            name=self.faker.company(),
+            plan=None,
+            email_incidents=self.faker.unique.email(),
+        )
+        self.asgi.app.container.client_repo().create(client)
+
+        # Served by the asyncio view, from the client written through the synchronous repository
+        status, data = await self.call('GET', f'/api/v1/clients/{client.id}')
+        self.assertEqual(status, 200)
+        self.assertEqual(data, client_to_dict(client))
+
+    async def test_wsgi_fallback(self) -> None:
+        status, data = await self.call('GET', '/api/v1/health/client')
+        self.assertEqual(status, 200)
+        self.assertEqual(data, {'status': 'Ok'})
@@ -0,0 +1,36 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from containers import Container
+from repositories.firestore import PooledFirestoreClient
+from security import PasswordHasher
+
+
+class TestWorkerResources(TestCase):
+    def setUp(self) -> None:
+        self.container = Container()
+        self.firestore_client = Mock(PooledFirestoreClient)
+        self.password_hasher = Mock(PasswordHasher)
+        self.container.firestore_client.override(self.firestore_client)
+        self.container.password_hasher.override(self.password_hasher)
+
+    def test_firestore(self) -> None:
+        self.container.config.repository.backend.from_value('firestore')
+
+        self.container.init_resources()
+        self.assertTrue(self.container.worker_resources.initialized)
+        self.firestore_client.close.assert_not_called()
+
+        self.container.shutdown_resources()
+        self.assertFalse(self.container.worker_resources.initialized)
+        self.firestore_client.close.assert_called_once_with()
+        self.password_hasher.shutdown.assert_called_once_with()
+
+    def test_memory(self) -> None:
+        self.container.firestore_client.override(Mock(side_effect=AssertionError('Firestore client created')))
+        self.container.config.repository.backend.from_value('memory')
+
+        self.container.init_resources()
+        self.container.shutdown_resources()
+
+        self.password_hasher.shutdown.assert_called_once_with()
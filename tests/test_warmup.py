@@ -0,0 +1,52 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from warmup import WarmUp
+
+
+class TestWarmUp(TestCase):
+    def test_run(self) -> None:
+        warmup = WarmUp()
+        first, second = Mock(), Mock()
+
+        self.assertFalse(warmup.is_ready())
+        self.assertEqual(warmup.report(), {'ready': False, 'timingsMs': {}, 'errors': {}})
+
+        warmup.run([('first', first), ('second', second)])
+
+        first.assert_called_once_with()
+        second.assert_called_once_with()
+        self.assertTrue(warmup.is_ready())
+        report = warmup.report()
+        self.assertTrue(report['ready'])
+        self.assertEqual(list(report['timingsMs']), ['first', 'second', 'total'])
+        self.assertEqual(report['errors'], {})
+
+    def test_failed_step(self) -> None:
+        warmup = WarmUp()
+        after = Mock()
+
+        with self.assertLogs('WarmUp', 'ERROR') as cm:
+            warmup.run([('failing', Mock(side_effect=RuntimeError('unavailable'))), ('after', after)])
+
+        # The steps after the failed one still run
+        after.assert_called_once_with()
+        self.assertTrue(warmup.is_ready())
+        self.assertEqual(warmup.report()['errors'], {'failing': 'unavailable'})
+        self.assertEqual(cm.records[0].message, 'Warm-up step failing failed')
+
+    def test_start(self) -> None:
+        warmup = WarmUp()
+        step = Mock()
+
+        warmup.start([('step', step)]).join()
+
+        step.assert_called_once_with()
+        self.assertTrue(warmup.is_ready())
+
+    def test_skip(self) -> None:
+        warmup = WarmUp()
+
+        warmup.skip()
+
+        self.assertEqual(warmup.report(), {'ready': True, 'timingsMs': {}, 'errors': {}})
@@ -0,0 +1,57 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+WarmUpStep = tuple[str, Callable[[], object]]
+
+
+# Runs the steps that build what the first requests would otherwise build, e.g. the Firestore channels, and
+# records how long each one took. Failed steps are logged and skipped, the requests will retry them.
+class WarmUp:
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.timings: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+
+    def run(self, steps: list[WarmUpStep]) -> None:
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                step()
+            except Exception as err:
+                self.logger.exception('Warm-up step %s failed', name)
+                with self.lock:
+                    self.errors[name] = str(err)
+
+            with self.lock:
+                self.timings[name] = time.perf_counter() - step_started
+
+        with self.lock:
+            self.timings['total'] = time.perf_counter() - started
+
+        self.logger.info('Warm-up done in %.3fs', self.timings['total'])
+        self.done.set()
+
+    def start(self, steps: list[WarmUpStep]) -> threading.Thread:
+        thread = threading.Thread(target=self.run, args=(steps,), name='warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def skip(self) -> None:
+        self.done.set()
+
+    def is_ready(self) -> bool:
+        return self.done.is_set()
+
+    def report(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                'ready': self.done.is_set(),
+                'timingsMs': {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()},
+                'errors': dict(self.errors),
+            }